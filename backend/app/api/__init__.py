@@ -1,7 +1,9 @@
 """API endpoints package."""
 
+from app.api.admin import router as admin_router
 from app.api.auth import router as auth_router
 from app.api.dashboard import router as dashboard_router
+from app.api.players import router as players_router
 from app.api.public import router as public_router
 
-__all__ = ["auth_router", "dashboard_router", "public_router"]
+__all__ = ["admin_router", "auth_router", "dashboard_router", "players_router", "public_router"]
@@ -0,0 +1,64 @@
+"""
+Admin endpoints - require the X-Admin-Token header (see dependencies.py).
+
+Operational tools, not meant for the frontend.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel
+
+from app.cache import RedisUnavailable, estimate_live_keys, invalidate_namespace, namespace_type
+from app.dependencies import require_admin
+from app.responses import FastJSONResponse
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+class NamespaceBumpResponse(BaseModel):
+    """Result of bumping a cache namespace."""
+
+    namespace: str
+    generation: int             # new generation
+    live_keys_estimate: int     # live entries of the old generation (now unreachable)
+    sampled_keys: int           # how many random keys the estimate is based on
+    total_keys: int             # all keys in Redis
+
+
+@router.post(
+    "/admin/cache/{namespace:path}/bump",
+    response_model=NamespaceBumpResponse,
+    summary="Invalidate a cache namespace",
+    description=(
+        "Bumps the generation of a cache namespace (all, fn:<function>, league:<id>, "
+        "league:<id>:user:<identity>). O(1) - old entries expire by TTL. "
+        "The number of live keys is estimated by sampling, not scanning."
+    ),
+)
+async def bump_cache_namespace(namespace: str) -> Response:
+    """
+    Bump a cache namespace and report how many entries it held.
+
+    Args:
+        namespace: Cache namespace (e.g., "fn:get_squad" or "league:123")
+    """
+    try:
+        namespace_type(namespace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Estimate first - after the bump, the old entries don't count as live anymore
+        estimate = await estimate_live_keys(namespace)
+        generation = await invalidate_namespace(namespace)
+    except RedisUnavailable:
+        raise HTTPException(status_code=503, detail="Redis is unavailable")
+
+    return FastJSONResponse(
+        NamespaceBumpResponse(
+            namespace=namespace,
+            generation=generation,
+            live_keys_estimate=estimate["estimate"],
+            sampled_keys=estimate["sampled"],
+            total_keys=estimate["total_keys"],
+        )
+    )
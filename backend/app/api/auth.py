@@ -4,7 +4,7 @@ Authentication API endpoints.
 This module handles user authentication via Kickbase.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 # Kickbase client + models for parsing their API responses
 from app.kickbase import KickbaseClient, KickbaseLoginResponse
@@ -16,6 +16,7 @@ from app.models.auth import (
     User,
     League,
 )
+from app.responses import FastJSONResponse
 
 # Create a router - groups related endpoints together
 # This router is imported in main.py and added to the app
@@ -31,7 +32,7 @@ router = APIRouter()
         502: {"description": "Kickbase API error (network, server down, etc.)"},
     },
 )
-async def login(request: LoginRequest) -> LoginResponse:
+async def login(request: LoginRequest) -> Response:
     """
     Authenticate with Kickbase.
 
@@ -48,8 +49,11 @@ async def login(request: LoginRequest) -> LoginResponse:
     # Call Kickbase login endpoint
     # Kickbase expects: {"em": email, "pass": password, "ext": false}
     # If this fails, global exception handlers in main.py catch it
-    raw_response = await client.post(
+    # The response has weird short field names like {"tkn": "...", "u": {...}}
+    # KickbaseLoginResponse knows how to parse these (via Field aliases)
+    kickbase_response = await client.post_model(
         "/user/login",
+        KickbaseLoginResponse,
         data={
             "em": request.email,
             "pass": request.password,
@@ -57,14 +61,9 @@ async def login(request: LoginRequest) -> LoginResponse:
         },
     )
 
-    # Parse Kickbase's response
-    # raw_response is a dict with weird short field names like {"tkn": "...", "u": {...}}
-    # KickbaseLoginResponse knows how to parse these (via Field aliases)
-    kickbase_response = KickbaseLoginResponse.model_validate(raw_response)
-
     # Transform to our clean response format
     # We convert from Kickbase's format to our own clean format for the frontend
-    return LoginResponse(
+    response = LoginResponse(
         token=kickbase_response.token,
         user=User(
             id=kickbase_response.user.id,
@@ -81,3 +80,6 @@ async def login(request: LoginRequest) -> LoginResponse:
             for league in kickbase_response.leagues
         ],
     )
+
+    # Serialized once, straight to bytes - no response_model revalidation (see app/responses.py)
+    return FastJSONResponse(response)
@@ -2,15 +2,32 @@
 Dashboard API endpoint.
 
 Combines data from multiple Kickbase endpoints into a single dashboard response.
-All calculations (€/point, averages, sorting) happen here.
+All calculations (€/point, averages, sorting) happen here - player metrics
+vectorized via app/players/stats.py.
+
+The finished response is materialized per league and user (see app/snapshots.py):
+it's only rebuilt when one of its inputs changed - the four Kickbase responses
+(by content fingerprint), the player database or the response model - and
+kept already compressed (see app/http_compression.py).
+The same inputs hash is the ETag: an unchanged dashboard is answered with 304
+before the snapshot is even read.
 """
 
-from fastapi import APIRouter, Depends
+import numpy as np
+from fastapi import APIRouter, Depends, Header, Response
 
+from app.cache import ValueType, fetch_many_entries, user_namespace
 from app.dependencies import get_token
+from app.http_cache import PRIVATE, etag_matches, json_response, make_etag, not_modified
+from app.http_compression import negotiate, pick_variant
+from app.kickbase import config
 from app.kickbase.models import (
+    KickbaseLeagueMe,
+    KickbaseLineupResponse,
+    KickbaseRankingResponse,
     KickbaseRankingUser,
     KickbaseSquadPlayer,
+    KickbaseSquadResponse,
 )
 from app.kickbase.services import (
     get_league_me,
@@ -24,32 +41,54 @@ from app.models.dashboard import (
     DashboardResponse,
     PlayerSummary,
 )
+from app.players.history import TREND_PERIODS
+from app.players.stats import (
+    MATCHDAY_KEYS,
+    PlayerStats,
+    get_player_stats,
+    player_stats_version,
+    summary_fields,
+    value_metrics,
+)
+from app.responses import render_json
+from app.snapshots import get_snapshot, inputs_hash, set_snapshot, snapshot_key
+from app.warmer import record_league_activity
 
 router = APIRouter()
 
+# Changes with the response model's fields - old snapshots are never served for a new shape
+_SCHEMA_HASH = ValueType(DashboardResponse).schema_hash
+
 
-def _build_player_summary(player: KickbaseSquadPlayer) -> PlayerSummary:
+def _squad_columns(players: list[KickbaseSquadPlayer], stats: PlayerStats | None) -> dict[str, np.ndarray]:
     """
-    Convert Kickbase squad player to PlayerSummary.
+    Squad players as metric columns (one array per field).
 
-    Calculates euros_per_point from market_value and avg_points.
+    €/point etc. are computed for all players at once (None if no points).
+    Form and trend metrics come from the player database, if it knows the player.
     """
-    # Calculate €/point (None if no points to avoid division by zero)
-    euros_per_point = None
-    if player.avg_points > 0:
-        euros_per_point = player.market_value / player.avg_points
-
-    return PlayerSummary(
-        id=player.id,
-        name=player.name,
-        position=player.position,
-        team_id=player.team_id,
-        profile_image=player.profile_image,
-        market_value=player.market_value,
-        total_points=player.total_points,
-        avg_points=float(player.avg_points),
-        euros_per_point=euros_per_point,
-    )
+    columns = {
+        "id": np.array([p.id for p in players], dtype=object),
+        "name": np.array([p.name for p in players], dtype=object),
+        "position": np.fromiter((p.position for p in players), dtype=np.int64, count=len(players)),
+        "team_id": np.array([p.team_id for p in players], dtype=object),
+        "profile_image": np.array([p.profile_image for p in players], dtype=object),
+        "market_value": np.fromiter((p.market_value for p in players), dtype=np.int64, count=len(players)),
+        "total_points": np.fromiter((p.total_points for p in players), dtype=np.int64, count=len(players)),
+        "avg_points": np.fromiter((p.avg_points for p in players), dtype=np.float64, count=len(players)),
+    }
+    columns.update(value_metrics(columns["market_value"], columns["total_points"], columns["avg_points"]))
+
+    if stats is not None:
+        columns.update(stats.take(columns["id"], ("market_value_change_pct", *TREND_PERIODS, *MATCHDAY_KEYS)))
+    return columns
+
+
+def _value_order(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Rows with a €/point, best value (lowest €/point) first."""
+    euros_per_point = columns["euros_per_point"]
+    rows = np.flatnonzero(~np.isnan(euros_per_point))
+    return rows[np.argsort(euros_per_point[rows], kind="stable")]
 
 
 def _find_user_rank(users: list[KickbaseRankingUser], user_id: str) -> tuple[int, int]:
@@ -85,34 +124,22 @@ def _get_team_value(users: list[KickbaseRankingUser], user_id: str) -> int:
     return 0
 
 
-@router.get(
-    "/leagues/{league_id}/dashboard",
-    response_model=DashboardResponse,
-    summary="Get dashboard data",
-    description="Returns all data needed for the dashboard: overview stats, best/worst value players, and lineup.",
-)
-async def get_dashboard(league_id: str, token: str = Depends(get_token)) -> DashboardResponse:
+def _build_dashboard(
+    league_me: KickbaseLeagueMe,
+    ranking: KickbaseRankingResponse,
+    squad: KickbaseSquadResponse,
+    lineup: KickbaseLineupResponse,
+    stats: PlayerStats | None,
+) -> DashboardResponse:
     """
-    Get complete dashboard data for a league.
-
-    Combines data from multiple Kickbase endpoints:
-    - /leagues/{id}/me - budget
-    - /leagues/{id}/ranking - standings, team value
-    - /leagues/{id}/squad - all players
-    - /leagues/{id}/lineup - starting/bench split
+    Build the dashboard from the Kickbase responses.
 
     Calculates:
     - €/point for each player
     - Best/worst value players (sorted by €/point)
     - Average points per matchday
     """
-    # 1. Fetch all data (each call is cached separately, returns Pydantic models)
-    league_me = await get_league_me(league_id, token)
-    ranking = await get_ranking(league_id, token)
-    squad = await get_squad(league_id, token)
-    lineup = await get_lineup(league_id, token)
-
-    # 2. Find our user ID by matching lineup player IDs
+    # 1. Find our user ID by matching lineup player IDs
     lineup_player_ids = {player.id for player in lineup.players}
 
     user_id = None
@@ -126,7 +153,7 @@ async def get_dashboard(league_id: str, token: str = Depends(get_token)) -> Dash
     if not user_id and ranking.users:
         user_id = ranking.users[0].id
 
-    # 3. Build overview
+    # 2. Build overview
     rank, total_managers = _find_user_rank(ranking.users, user_id)
     avg_points = _calculate_avg_points_per_matchday(ranking.users, user_id, ranking.matchday)
     team_value = _get_team_value(ranking.users, user_id)
@@ -139,18 +166,18 @@ async def get_dashboard(league_id: str, token: str = Depends(get_token)) -> Dash
         budget=int(league_me.budget),
     )
 
-    # 4. Build player summaries from squad
-    players = [_build_player_summary(p) for p in squad.players]
+    # 3. Build player summaries from squad (metrics computed as arrays)
+    columns = _squad_columns(squad.players, stats)
+    players = [PlayerSummary(**summary_fields(columns, row)) for row in range(len(squad.players))]
 
-    # 5. Find best/worst value players (by €/point)
+    # 4. Find best/worst value players (by €/point)
     # Lower €/point = better value (you pay less per point)
-    valid_players = [p for p in players if p.euros_per_point is not None]
-    sorted_by_value = sorted(valid_players, key=lambda p: p.euros_per_point)
+    sorted_by_value = _value_order(columns)
 
-    best_value = sorted_by_value[:3]
-    worst_value = sorted_by_value[-3:][::-1]
+    best_value = [players[row] for row in sorted_by_value[:3]]
+    worst_value = [players[row] for row in sorted_by_value[-3:][::-1]]
 
-    # 6. Build lineup (split into starting and bench)
+    # 5. Build lineup (split into starting and bench)
     # Create a map of player_id -> lineup_order for players in starting lineup
     # lineup_order is None for bench, 0-10 for starting
     lineup_order_map: dict[str, int] = {
@@ -187,10 +214,70 @@ async def get_dashboard(league_id: str, token: str = Depends(get_token)) -> Dash
         bench=bench_players,
     )
 
-    # 7. Return complete dashboard
+    # 6. Return complete dashboard
     return DashboardResponse(
         overview=overview,
         best_value_players=best_value,
         worst_value_players=worst_value,
         lineup=dashboard_lineup,
     )
+
+
+@router.get(
+    "/leagues/{league_id}/dashboard",
+    response_model=DashboardResponse,
+    summary="Get dashboard data",
+    description="Returns all data needed for the dashboard: overview stats, best/worst value players, and lineup.",
+)
+async def get_dashboard(
+    league_id: str,
+    token: str = Depends(get_token),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    """
+    Get complete dashboard data for a league.
+
+    Combines data from multiple Kickbase endpoints:
+    - /leagues/{id}/me - budget
+    - /leagues/{id}/ranking - standings, team value
+    - /leagues/{id}/squad - all players
+    - /leagues/{id}/lineup - starting/bench split
+
+    Returns the materialized JSON (the DashboardResponse is only rebuilt
+    when an input changed, see _build_dashboard for the calculations), or
+    304 if the client's copy (If-None-Match) is still current.
+    """
+    # 1. Fetch all data: one Redis round trip for the cached ones, misses
+    #    concurrently from Kickbase (each call is cached separately, returns
+    #    Pydantic models + a content fingerprint)
+    entries = await fetch_many_entries(
+        get_league_me.defer(league_id, token),
+        get_ranking.defer(league_id, token),
+        get_squad.defer(league_id, token),
+        get_lineup.defer(league_id, token),
+        deadline=config.request_deadline,
+    )
+
+    # Keep this league's data warm for the next visits (see app/warmer/)
+    record_league_activity(league_id, token)
+
+    # 2. Nothing it was built from changed: 304 for the client's copy, or our snapshot
+    stats = get_player_stats()
+    inputs = inputs_hash(
+        _SCHEMA_HASH,
+        player_stats_version() if stats is not None else None,
+        *(entry.fingerprint for entry in entries),
+    )
+    etag = make_etag(inputs)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE)
+
+    key = snapshot_key(user_namespace(league_id, token), "dashboard")
+    variants = await get_snapshot(key, inputs)
+    if variants is None:
+        dashboard = _build_dashboard(*(entry.value for entry in entries), stats)
+        variants = await set_snapshot(key, inputs, render_json(dashboard))
+
+    body, content_encoding = pick_variant(variants, negotiate(accept_encoding))
+    return json_response(body, etag, PRIVATE, content_encoding)
@@ -0,0 +1,144 @@
+"""
+Player database API endpoint (Market > Players).
+
+Filters, sorts and pages through all competition players, and their market
+value history. Served entirely from the local player database (see
+app/players/) - no Kickbase call per request.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.dependencies import get_token
+from app.models.dashboard import PlayerSummary
+from app.models.players import MarketValueHistoryResponse, MarketValuePoint, PlayerListResponse
+from app.players.history import get_market_value_history
+from app.players.query import PlayerQuery, get_player_index
+from app.players.stats import summary_fields
+from app.responses import FastJSONResponse
+
+router = APIRouter()
+
+# Must match players.query.SORT_KEYS (checked in tests)
+SortKey = Literal[
+    "market_value",
+    "total_points",
+    "avg_points",
+    "euros_per_point",
+    "points_per_million",
+    "form",
+    "form_trend",
+    "market_value_change_pct",
+    "market_value_change_1d_pct",
+    "market_value_change_7d_pct",
+    "market_value_change_30d_pct",
+]
+
+
+@router.get(
+    "/players",
+    response_model=PlayerListResponse,
+    summary="Search all players",
+    description="Filter, sort and page through every player of the competition.",
+)
+async def list_players(
+    position: list[int] = Query(default=[], description="1=GK, 2=DEF, 3=MID, 4=FWD (any of)"),
+    team_id: list[str] = Query(default=[], description="Bundesliga team IDs (any of)"),
+    status: list[int] = Query(default=[], description="Kickbase player status (any of, 0 = fit)"),
+    min_market_value: int | None = None,
+    max_market_value: int | None = None,
+    min_points: int | None = None,
+    max_points: int | None = None,
+    min_avg_points: float | None = None,
+    max_avg_points: float | None = None,
+    max_euros_per_point: float | None = None,
+    min_points_per_million: float | None = None,
+    min_form: float | None = None,
+    min_form_trend: float | None = None,
+    sort: SortKey = "market_value",
+    order: Literal["asc", "desc"] = "desc",
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=100),
+    token: str = Depends(get_token),  # logged-in users only (the data isn't per user)
+) -> Response:
+    """
+    Query the player database.
+
+    Range filters are inclusive; players without a value for a metric
+    (e.g., €/point without points) don't match a filter on it.
+    """
+    index = get_player_index()
+    if index is None:
+        # Nothing ingested yet (first start, or no service account configured)
+        raise HTTPException(status_code=503, detail="Player database not available yet")
+
+    query = PlayerQuery(
+        positions=position,
+        team_ids=team_id,
+        statuses=status,
+        ranges={
+            "market_value": (min_market_value, max_market_value),
+            "total_points": (min_points, max_points),
+            "avg_points": (min_avg_points, max_avg_points),
+            "euros_per_point": (None, max_euros_per_point),
+            "points_per_million": (min_points_per_million, None),
+            "form": (min_form, None),
+            "form_trend": (min_form_trend, None),
+        },
+        sort=sort,
+        descending=order == "desc",
+        offset=offset,
+        limit=limit,
+    )
+    page = index.query(query)
+
+    # Serialized once, straight to bytes - no response_model revalidation (see app/responses.py)
+    return FastJSONResponse(
+        PlayerListResponse(
+            total=page.total,
+            offset=offset,
+            limit=limit,
+            players=[PlayerSummary(**summary_fields(index.columns, row)) for row in page.rows],
+        )
+    )
+
+
+@router.get(
+    "/players/{player_id}/market-value",
+    response_model=MarketValueHistoryResponse,
+    summary="Market value history of a player",
+    description="Daily or weekly market values of one player over the last days (from local snapshots).",
+)
+async def get_market_value_history_of_player(
+    player_id: str,
+    days: int = Query(default=92, ge=1, le=3 * 365, description="How many days back from the latest snapshot"),
+    resolution: Literal["daily", "weekly"] = "daily",
+    token: str = Depends(get_token),  # logged-in users only (the data isn't per user)
+) -> Response:
+    """
+    Market value chart data of one player.
+
+    Weekly points hold the last value of each week plus its low and high.
+    """
+    history = get_market_value_history()
+    if history is None or history.latest_day is None:
+        # No snapshot recorded yet (first start, or no service account configured)
+        raise HTTPException(status_code=503, detail="Market value history not available yet")
+
+    series = history.series(player_id, start=history.latest_day - days + 1, resolution=resolution)
+    if series is None:
+        raise HTTPException(status_code=404, detail="No market value history for this player")
+
+    return FastJSONResponse(
+        MarketValueHistoryResponse(
+            player_id=player_id,
+            resolution=resolution,
+            points=[
+                MarketValuePoint(date=day, market_value=value, low=low, high=high)
+                for day, value, low, high in zip(
+                    series.dates().tolist(), series.values.tolist(), series.low.tolist(), series.high.tolist()
+                )
+            ],
+        )
+    )
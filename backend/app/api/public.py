@@ -2,32 +2,33 @@
 Public API endpoints - no authentication required.
 
 These endpoints are accessible to everyone, even without login.
+
+The table is the same for every visitor: it's materialized once per season,
+already compressed (see app/snapshots.py), carries an ETag derived from the cached standings'
+fingerprint, and is marked public so nginx can microcache it for all
+anonymous users (see app/http_cache.py).
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Response
 
+from app.cache import ValueType, fetch_many_entries
+from app.http_cache import etag_matches, json_response, make_etag, not_modified, public_policy
+from app.http_compression import negotiate, pick_variant
 from app.models.public import BundesligaTableResponse, TeamStanding
+from app.openliga.models import OpenLigaTeamStanding
 from app.openliga.services import get_bundesliga_table
+from app.responses import render_json
+from app.snapshots import get_snapshot, inputs_hash, set_snapshot, snapshot_key
+from app.warmer import record_table_activity
 
 router = APIRouter()
 
+# Changes with the response model's fields - old snapshots are never served for a new shape
+_SCHEMA_HASH = ValueType(BundesligaTableResponse).schema_hash
 
-@router.get(
-    "/table",
-    response_model=BundesligaTableResponse,
-    summary="Get Bundesliga table",
-    description="Returns the current Bundesliga standings. No authentication required.",
-)
-async def get_table(season: str = "2024") -> BundesligaTableResponse:
-    """
-    Get current Bundesliga table.
-
-    Args:
-        season: Season year (e.g., "2024" for 2024/25 season)
-    """
-    openliga_standings = await get_bundesliga_table(season)
 
-    # Convert to API response models, adding position
+def _build_table(season: str, openliga_standings: list[OpenLigaTeamStanding]) -> BundesligaTableResponse:
+    """Convert to API response models, adding position."""
     standings = [
         TeamStanding(
             position=i + 1,
@@ -50,3 +51,39 @@ async def get_table(season: str = "2024") -> BundesligaTableResponse:
         season=season,
         standings=standings,
     )
+
+
+@router.get(
+    "/table",
+    response_model=BundesligaTableResponse,
+    summary="Get Bundesliga table",
+    description="Returns the current Bundesliga standings. No authentication required.",
+)
+async def get_table(
+    season: str = "2024",
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    """
+    Get current Bundesliga table.
+
+    Args:
+        season: Season year (e.g., "2024" for 2024/25 season)
+
+    Returns 304 if the client's copy (If-None-Match) is still current.
+    """
+    (entry,) = await fetch_many_entries(get_bundesliga_table.defer(season))
+    record_table_activity(season)
+
+    inputs = inputs_hash(_SCHEMA_HASH, season, entry.fingerprint)
+    etag = make_etag(inputs)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, public_policy())
+
+    key = snapshot_key("global", f"table:{season}")
+    variants = await get_snapshot(key, inputs)
+    if variants is None:
+        variants = await set_snapshot(key, inputs, render_json(_build_table(season, entry.value)))
+
+    body, content_encoding = pick_variant(variants, negotiate(accept_encoding))
+    return json_response(body, etag, public_policy(), content_encoding)
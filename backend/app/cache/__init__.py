@@ -0,0 +1,93 @@
+"""
+Caching package.
+
+Provides:
+- Redis connection pools + circuit breaker (backend.py, breaker.py)
+- @cached decorator for easy function caching (decorator.py)
+- Batched reads of several cached calls, one MGET + one pipelined write (batch.py)
+- Content fingerprints of cached values (entry.py, used by app/snapshots.py)
+- Scoped cache keys (keys.py)
+- O(1) invalidation via namespace generations (namespaces.py)
+- Codecs, compression and entry format for stored values (codecs.py, compression.py, entry.py)
+- In-process L1 tier in front of Redis, kept coherent via pub/sub (local.py)
+
+Usage:
+    from app.cache import cached
+
+    @cached(ttl=300)
+    async def get_squad(league_id: str, token: str) -> KickbaseSquadResponse:
+        ...
+"""
+
+from app.cache.backend import (
+    RedisUnavailable,
+    close_redis,
+    get_redis,
+    get_redis_binary,
+    open_redis,
+    redis_call,
+)
+from app.cache.backend import breaker as redis_breaker
+from app.cache.batch import fetch_many, fetch_many_entries
+from app.cache.breaker import CircuitBreaker
+from app.cache.codecs import CODECS, Codec, ValueType, get_codec
+from app.cache.config import CacheSettings, settings
+from app.cache.decorator import (
+    CachedCall,
+    cached,
+    clear_cache,
+    invalidate_league,
+    invalidate_namespace,
+    invalidate_user,
+)
+from app.cache.keys import CacheKey, check_key_secret, league_namespace, user_identity, user_namespace
+from app.cache.namespaces import bump_generation, estimate_live_keys, namespace_type
+from app.cache.local import (
+    LocalCache,
+    local_cache,
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+
+__all__ = [
+    # Decorator
+    "cached",
+    "clear_cache",
+    "CachedCall",
+    "fetch_many",
+    "fetch_many_entries",
+    # Keys and namespaces
+    "CacheKey",
+    "user_identity",
+    "check_key_secret",
+    "league_namespace",
+    "user_namespace",
+    "invalidate_namespace",
+    "invalidate_league",
+    "invalidate_user",
+    "namespace_type",
+    "bump_generation",
+    "estimate_live_keys",
+    # Redis
+    "get_redis",
+    "get_redis_binary",
+    "open_redis",
+    "close_redis",
+    "redis_call",
+    "redis_breaker",
+    "RedisUnavailable",
+    "CircuitBreaker",
+    # Codecs
+    "Codec",
+    "CODECS",
+    "ValueType",
+    "get_codec",
+    # L1 tier
+    "LocalCache",
+    "local_cache",
+    "start_invalidation_listener",
+    "stop_invalidation_listener",
+    # Config
+    "CacheSettings",
+    "settings",
+]
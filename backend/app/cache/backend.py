@@ -0,0 +1,171 @@
+"""
+Redis connection management.
+
+- Connection pools with explicit size, socket/connect timeouts and health
+  checks (idle connections are PINGed before reuse, broken ones reconnect once)
+- Opened/closed in main.py's lifespan (created on first use as a fallback)
+- A circuit breaker (see breaker.py) skips Redis while it keeps failing, so a
+  slow Redis costs one timeout per cool-down instead of one per request
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.cache.breaker import CircuitBreaker
+from app.cache.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker process in pub/sub messages (to skip our own)
+WORKER_ID = uuid.uuid4().hex[:12]
+
+# Errors that mean "Redis is unreachable or too slow" (trip the breaker).
+# Command errors (e.g., a bad Lua script) don't.
+_AVAILABILITY_ERRORS = (RedisConnectionError, RedisTimeoutError, TimeoutError, OSError)
+
+# Redis connections (created in open_redis() or on first use)
+# - text client: locks, generations, admin commands (decode_responses=True)
+# - binary client: cache values (encoded bytes, see cache/entry.py)
+# - pub/sub client: the invalidation listener (no socket timeout - it waits
+#   for messages indefinitely)
+_redis_client: redis.Redis | None = None
+_redis_binary_client: redis.Redis | None = None
+_redis_pubsub_client: redis.Redis | None = None
+
+breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.redis_failure_threshold,
+    cooldown=settings.redis_cooldown,
+)
+
+
+class RedisUnavailable(Exception):
+    """Redis is skipped because the circuit breaker is open."""
+
+    pass
+
+
+def _redis_url() -> str:
+    return os.getenv("REDIS_URL", "redis://localhost:6379")
+
+
+def _create_client(decode_responses: bool, socket_timeout: float | None) -> redis.Redis:
+    """Create a Redis client with its own pool."""
+    return redis.from_url(
+        _redis_url(),
+        decode_responses=decode_responses,
+        max_connections=settings.redis_max_connections,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=settings.redis_connect_timeout,
+        socket_keepalive=True,
+        health_check_interval=settings.redis_health_check_interval,
+        # A pooled connection may have been closed by Redis (restart, idle
+        # timeout) - reconnect once right away instead of failing the call
+        retry=Retry(NoBackoff(), 1),
+        retry_on_error=[RedisConnectionError],
+    )
+
+
+async def get_redis() -> redis.Redis:
+    """
+    Get Redis connection (creates one if needed).
+
+    Uses REDIS_URL from environment, defaults to localhost.
+    """
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = _create_client(decode_responses=True, socket_timeout=settings.redis_socket_timeout)
+
+    return _redis_client
+
+
+async def get_redis_binary() -> redis.Redis:
+    """
+    Get Redis connection that returns raw bytes (creates one if needed).
+
+    Used for cache values, which are binary (header + encoded payload).
+    """
+    global _redis_binary_client
+
+    if _redis_binary_client is None:
+        _redis_binary_client = _create_client(decode_responses=False, socket_timeout=settings.redis_socket_timeout)
+
+    return _redis_binary_client
+
+
+async def get_redis_pubsub() -> redis.Redis:
+    """Get the Redis connection for pub/sub subscriptions (creates one if needed)."""
+    global _redis_pubsub_client
+
+    if _redis_pubsub_client is None:
+        _redis_pubsub_client = _create_client(decode_responses=True, socket_timeout=None)
+
+    return _redis_pubsub_client
+
+
+@asynccontextmanager
+async def redis_call(binary: bool = False) -> AsyncIterator[redis.Redis]:
+    """
+    Use Redis through the circuit breaker.
+
+    Usage:
+        async with redis_call() as redis_client:
+            await redis_client.get(key)
+
+    Raises:
+        RedisUnavailable: Breaker is open - skip Redis (don't log, it already did)
+    """
+    if not breaker.allow():
+        raise RedisUnavailable("Redis circuit is open")
+
+    try:
+        redis_client = await (get_redis_binary() if binary else get_redis())
+        yield redis_client
+    except _AVAILABILITY_ERRORS:
+        breaker.record_failure()
+        raise
+    except asyncio.CancelledError:
+        breaker.abandon()
+        raise
+    except Exception:
+        # Redis answered, just not with what we wanted (e.g., a script error)
+        breaker.record_success()
+        raise
+    else:
+        breaker.record_success()
+
+
+async def open_redis() -> None:
+    """Create the Redis pools and check the connection (called on startup)."""
+    try:
+        async with redis_call() as redis_client:
+            await redis_client.ping()
+        await get_redis_binary()
+        logger.info(f"Redis connected (max {settings.redis_max_connections} connections per pool)")
+    except Exception as e:
+        # Not fatal - the app works without cache, the breaker retries later
+        logger.warning(f"Redis not reachable on startup (continuing without cache): {e}")
+
+
+async def close_redis() -> None:
+    """Close all Redis pools (called on shutdown)."""
+    global _redis_client, _redis_binary_client, _redis_pubsub_client
+
+    for client in (_redis_client, _redis_binary_client, _redis_pubsub_client):
+        if client is not None:
+            await client.aclose()
+
+    _redis_client = None
+    _redis_binary_client = None
+    _redis_pubsub_client = None
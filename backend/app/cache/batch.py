@@ -0,0 +1,215 @@
+"""
+Batched cache reads for aggregate endpoints.
+
+An aggregate endpoint (like the dashboard) needs several cached service calls.
+Awaiting them one by one - even concurrently - costs one Redis GET per call.
+fetch_many() resolves them together:
+
+1. All keys are checked in L1, the rest with ONE Redis MGET
+2. Only the misses call upstream, concurrently (via fan_out, with a deadline)
+3. The new values (+ L1 invalidation messages + lock releases) go back in ONE pipeline
+
+Usage:
+    from app.cache import fetch_many
+
+    league_me, ranking = await fetch_many(
+        get_league_me.defer(league_id, token),
+        get_ranking.defer(league_id, token),
+        deadline=10.0,
+    )
+
+Everything else works like calling the functions one by one: stale values
+are served while refreshing in the background, misses are coalesced with
+in-flight calls of the same key, and Redis locks keep other workers from
+fetching the same data at the same time.
+
+fetch_many_entries() returns CacheEntry objects instead of plain values - with
+the content fingerprint of each value (see entry.py), e.g. to tell whether an
+aggregate built from them is still current (see app/snapshots.py).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from app import metrics
+from app.cache.backend import RedisUnavailable, redis_call
+from app.cache.config import settings
+from app.cache.decorator import (
+    _MISSING,
+    _RELEASE_LOCK_SCRIPT,
+    CachedCall,
+    _WriteBatch,
+    _decode_cached,
+    _inflight,
+    _load,
+    _serve_entry,
+    _start_inflight,
+)
+from app.cache.entry import CacheEntry, encode_entry, payload_fingerprint
+from app.cache.keys import CacheKey
+from app.cache.local import invalidation_message, local_cache
+from app.fanout import fan_out
+
+logger = logging.getLogger(__name__)
+
+
+async def _get_many(calls: list[CachedCall], keys: list[CacheKey]) -> list[CacheEntry | None]:
+    """Read entries for several calls - L1 first, then one MGET for the rest."""
+    entries = [local_cache.get(key.key) for key in keys]
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    if not missing:
+        return entries
+
+    try:
+        async with redis_call(binary=True) as redis_client:
+            values = await redis_client.mget([keys[i].key for i in missing])
+
+    except RedisUnavailable:
+        return entries
+
+    except Exception as e:
+        # Redis error - just continue without cache
+        logger.warning(f"Redis read error (continuing without cache): {e}")
+        return entries
+
+    for i, cached_value in zip(missing, values):
+        policy = calls[i].policy
+        entries[i] = _decode_cached(keys[i].key, cached_value, policy.value_type, policy.hard_ttl)
+
+    return entries
+
+
+async def _store_many(writes: _WriteBatch) -> dict[str, CacheEntry]:
+    """
+    Store a batch of computed values and release their locks in one pipeline.
+
+    Returns:
+        The stored entries by key (empty if Redis is unavailable)
+    """
+    # Loads still running (shared with other callers, so shielded from our
+    # deadline) must not add to a batch that is already written
+    writes.flushed = True
+
+    if not writes.entries and not writes.locks:
+        return {}
+
+    encoded = []
+    try:
+        for key, policy, result, delta in writes.entries:
+            encoded.append(encode_entry(result, policy.value_type, policy.codec, delta))
+
+        async with redis_call(binary=True) as redis_client:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for (key, policy, _, _), cache_data in zip(writes.entries, encoded):
+                    pipe.setex(key.key, policy.hard_ttl, cache_data)
+                    message = invalidation_message(key.key)
+                    if message is not None:
+                        pipe.publish(settings.invalidation_channel, message)
+                for lock_key, owner in writes.locks:
+                    pipe.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, owner)
+                await pipe.execute()
+
+    except RedisUnavailable:
+        return {}
+
+    except Exception as e:
+        # Redis error - just continue without caching (locks expire on their own)
+        logger.warning(f"Redis batch write error (continuing without caching): {e}")
+        return {}
+
+    # We keep the fresh values in our own L1
+    stored = {}
+    for (key, policy, result, delta), cache_data in zip(writes.entries, encoded):
+        entry = CacheEntry(
+            value=result, created_at=time.time(), delta=delta, fingerprint=payload_fingerprint(cache_data)
+        )
+        local_cache.set(key.key, entry, size=len(cache_data), ttl=policy.hard_ttl)
+        stored[key.key] = entry
+    return stored
+
+
+async def _resolve_miss(call: CachedCall, key: CacheKey, writes: _WriteBatch) -> Any:
+    """Get the value of a missed call - from an in-flight call, or by computing it."""
+    task = _inflight.get(key.key)
+    if task is not None:
+        logger.debug(f"Cache coalesced: {key.key}")
+        metrics.incr("cache.coalesced")
+    else:
+        task = _start_inflight(key.key, _load(call.policy, call.args, call.kwargs, key, writes=writes))
+
+    # shield(): the deadline cancelling us must not cancel a shared task
+    result = await asyncio.shield(task)
+    if result is _MISSING:
+        # Joined a background refresh that found another worker refreshing - load ourselves
+        result = await _load(call.policy, call.args, call.kwargs, key, writes=writes)
+    return result
+
+
+async def fetch_many_entries(*calls: CachedCall, deadline: float | None = None) -> tuple[CacheEntry, ...]:
+    """
+    Like fetch_many(), but returns the entries (value + created_at + fingerprint).
+
+    Entries of misses that were not stored by this batch (joined another
+    caller's load, or Redis unavailable) get their fingerprint by encoding the
+    value - the same bytes a stored entry would have.
+    """
+    started = time.monotonic()
+    metrics.incr("cache.batch")
+    metrics.incr("cache.batch.calls", len(calls))
+
+    keys = list(await asyncio.gather(*(call.policy.keys.build(call.args, call.kwargs) for call in calls)))
+    entries = await _get_many(list(calls), keys)
+
+    missed = []
+    for i, (call, key, entry) in enumerate(zip(calls, keys, entries)):
+        if entry is not None:
+            _serve_entry(call.policy, key, entry, call.args, call.kwargs)
+        else:
+            logger.debug(f"Cache miss: {key.key}")
+            metrics.incr("cache.miss")
+            missed.append(i)
+
+    if not missed:
+        return tuple(entries)
+
+    writes = _WriteBatch()
+    remaining = None if deadline is None else max(deadline - (time.monotonic() - started), 0.0)
+    stored: dict[str, CacheEntry] = {}
+    try:
+        values = await fan_out(
+            *(_resolve_miss(calls[i], keys[i], writes) for i in missed),
+            deadline=remaining,
+        )
+    finally:
+        # Store whatever finished - even if another call failed or timed out
+        stored = await _store_many(writes)
+
+    for i, value in zip(missed, values):
+        entry = stored.get(keys[i].key)
+        if entry is None or entry.value is not value:
+            policy = calls[i].policy
+            encoded = encode_entry(value, policy.value_type, policy.codec, 0.0)
+            entry = CacheEntry(value=value, created_at=time.time(), fingerprint=payload_fingerprint(encoded))
+        entries[i] = entry
+    return tuple(entries)
+
+
+async def fetch_many(*calls: CachedCall, deadline: float | None = None) -> tuple[Any, ...]:
+    """
+    Resolve several cached calls with one Redis read and one Redis write.
+
+    Args:
+        *calls: Deferred calls, e.g. `get_squad.defer(league_id, token)`
+        deadline: Max seconds for the whole batch (None = no limit)
+
+    Returns:
+        Tuple of results, same order as the calls
+
+    Raises:
+        The first exception raised by a missed call (others are cancelled)
+        DeadlineExceeded: If the misses did not finish within the deadline
+    """
+    entries = await fetch_many_entries(*calls, deadline=deadline)
+    return tuple(entry.value for entry in entries)
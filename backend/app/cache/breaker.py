@@ -0,0 +1,88 @@
+"""
+Circuit breaker for Redis.
+
+When Redis is down or overloaded, every cache call would otherwise wait for
+the full socket timeout and log a warning - on every request. After
+`failure_threshold` consecutive failures the breaker opens: Redis is skipped
+entirely (cache calls behave like misses) for `cooldown` seconds. Then one
+trial call is let through - if it works, the breaker closes again.
+
+    closed ──(N failures)──> open ──(cooldown)──> half-open ──(success)──> closed
+                               ^                      │
+                               └──────(failure)───────┘
+"""
+
+import logging
+import time
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Not thread-safe - meant for use from one asyncio event loop.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, cooldown: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None  # time.monotonic(), None while closed
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half-open"."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        """Check if a call may go through (and claim the trial call when half-open)."""
+        state = self.state
+        if state == "closed":
+            return True
+
+        if state == "half-open" and not self._trial_running:
+            self._trial_running = True
+            return True
+
+        metrics.incr(f"{self.name}.circuit.skipped")
+        return False
+
+    def record_success(self) -> None:
+        """A call succeeded - close the breaker."""
+        if self._opened_at is not None:
+            logger.info(f"{self.name} is reachable again, circuit closed")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def abandon(self) -> None:
+        """A call was cancelled before it told us anything - let the next one try."""
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        """A call failed - open the breaker after too many failures in a row."""
+        self._failures += 1
+        self._trial_running = False
+
+        if self._opened_at is not None:
+            # Trial call failed - wait another cooldown
+            self._opened_at = time.monotonic()
+            return
+
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            metrics.incr(f"{self.name}.circuit.opened")
+            logger.warning(
+                f"{self.name} failed {self._failures} times in a row, "
+                f"skipping it for {self.cooldown}s"
+            )
@@ -0,0 +1,256 @@
+"""
+Codecs: how cached values are turned into bytes and back.
+
+Every @cached function gets a ValueType (built once from its return type hint)
+and a Codec. The codec id is stored in each entry's header (see entry.py), so
+entries written with one codec can still be read after switching to another.
+
+| Codec | Encode | Decode |
+|-------|--------|--------|
+| `json` | stdlib json of model_dump() | full model_validate (slowest, always safe) |
+| `pydantic` | adapter.dump_json() | adapter.validate_json() - validation in pydantic-core, no Python dict |
+| `orjson` | orjson of model_dump() | trusted rehydration via model_construct (no validation) |
+| `msgpack` | msgpack of model_dump() | trusted rehydration via model_construct (no validation) |
+
+Trusted rehydration skips validation entirely - we wrote the data ourselves.
+It's only used for types made of plain JSON types (str, int, float, bool, None,
+lists, dicts, nested models). Other types fall back to normal validation.
+The ValueType's schema hash is stored with each entry, so data written for an
+older version of a model is never constructed into the new one.
+
+Compare codecs with: python -m benchmarks.bench_cache_codecs
+"""
+
+import json
+import logging
+import types
+import zlib
+from typing import Any, Callable, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Types that survive a JSON/msgpack round trip unchanged
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _build_constructor(tp: Any) -> Callable[[Any], Any] | None:
+    """
+    Build a function that turns trusted plain data into `tp` without validation.
+
+    Returns None if `tp` contains types that need validation to be rebuilt
+    (e.g., datetime, which comes back from JSON as a string).
+    """
+    if tp is Any or tp in _PLAIN_TYPES:
+        return _identity
+
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        field_constructors: dict[str, Callable[[Any], Any]] = {}
+        for name, field in tp.model_fields.items():
+            constructor = _build_constructor(field.annotation)
+            if constructor is None:
+                return None
+            if constructor is not _identity:
+                field_constructors[name] = constructor
+
+        def construct_model(data: dict) -> BaseModel:
+            for name, constructor in field_constructors.items():
+                if name in data:
+                    data[name] = constructor(data[name])
+            return tp.model_construct(**data)
+
+        return construct_model
+
+    origin = get_origin(tp)
+    args = get_args(tp)
+
+    if tp in (list, dict) or (origin in (list, dict) and not args):
+        return _identity
+
+    if origin is list:
+        item_constructor = _build_constructor(args[0])
+        if item_constructor is None:
+            return None
+        if item_constructor is _identity:
+            return _identity
+        return lambda data: [item_constructor(item) for item in data]
+
+    if origin is dict:
+        if args[0] is not str:
+            return None
+        value_constructor = _build_constructor(args[1])
+        if value_constructor is None:
+            return None
+        if value_constructor is _identity:
+            return _identity
+        return lambda data: {key: value_constructor(value) for key, value in data.items()}
+
+    if origin in (Union, types.UnionType):
+        # Only Optional[X] / X | None is unambiguous without validation
+        non_none = [arg for arg in args if arg is not type(None)]
+        constructors = [_build_constructor(arg) for arg in non_none]
+        if any(constructor is None for constructor in constructors):
+            return None
+        if all(constructor is _identity for constructor in constructors):
+            return _identity
+        if len(non_none) == 1:
+            inner = constructors[0]
+            return lambda data: None if data is None else inner(data)
+        return None
+
+    return None
+
+
+class ValueType:
+    """
+    Everything needed to (de)serialize one return type.
+
+    Built once per @cached function from its return type hint.
+    """
+
+    def __init__(self, tp: Any):
+        self.tp = tp if tp is not None else Any
+        self.adapter = TypeAdapter(self.tp)
+        self.schema_hash = self._compute_schema_hash()
+        self._construct = _build_constructor(self.tp)
+
+    @property
+    def trusted(self) -> bool:
+        """True if rehydrate() can skip validation for this type."""
+        return self._construct is not None
+
+    def dump(self, value: Any) -> Any:
+        """Value -> JSON-compatible data (field names, not aliases)."""
+        return self.adapter.dump_python(value, mode="json")
+
+    def validate(self, data: Any) -> Any:
+        """JSON-compatible data -> value, with full validation."""
+        return self.adapter.validate_python(data)
+
+    def rehydrate(self, data: Any) -> Any:
+        """JSON-compatible data we wrote ourselves -> value (skips validation if possible)."""
+        if self._construct is None:
+            return self.validate(data)
+        return self._construct(data)
+
+    def _compute_schema_hash(self) -> int:
+        """Fingerprint of the type's shape - changes when a model's fields change."""
+        try:
+            schema = json.dumps(self.adapter.json_schema(), sort_keys=True)
+        except Exception:
+            schema = repr(self.tp)
+        return zlib.crc32(schema.encode())
+
+
+# --- Codecs ---
+
+
+class Codec:
+    """Base class: turns values into bytes and back."""
+
+    name: str = ""
+    codec_id: int = 0
+
+    def encode(self, value: Any, value_type: ValueType) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, raw: bytes, value_type: ValueType) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Stdlib json + full validation (what the cache did originally)."""
+
+    name = "json"
+    codec_id = 1
+
+    def encode(self, value: Any, value_type: ValueType) -> bytes:
+        return json.dumps(value_type.dump(value)).encode()
+
+    def decode(self, raw: bytes, value_type: ValueType) -> Any:
+        return value_type.validate(json.loads(raw))
+
+
+class PydanticCodec(Codec):
+    """pydantic-core JSON: serialization and validation without Python dicts in between."""
+
+    name = "pydantic"
+    codec_id = 2
+
+    def encode(self, value: Any, value_type: ValueType) -> bytes:
+        return value_type.adapter.dump_json(value)
+
+    def decode(self, raw: bytes, value_type: ValueType) -> Any:
+        return value_type.adapter.validate_json(raw)
+
+
+class OrjsonCodec(Codec):
+    """orjson + trusted rehydration (no validation on cache hits)."""
+
+    name = "orjson"
+    codec_id = 3
+
+    def encode(self, value: Any, value_type: ValueType) -> bytes:
+        return orjson.dumps(value_type.dump(value))
+
+    def decode(self, raw: bytes, value_type: ValueType) -> Any:
+        return value_type.rehydrate(orjson.loads(raw))
+
+
+class MsgpackCodec(Codec):
+    """msgpack (compact binary) + trusted rehydration."""
+
+    name = "msgpack"
+    codec_id = 4
+
+    def encode(self, value: Any, value_type: ValueType) -> bytes:
+        return msgpack.packb(value_type.dump(value), use_bin_type=True)
+
+    def decode(self, raw: bytes, value_type: ValueType) -> Any:
+        return value_type.rehydrate(msgpack.unpackb(raw, raw=False))
+
+
+# All codecs that can be used in this environment (optional ones need their package)
+_available: list[Codec] = [JsonCodec(), PydanticCodec()]
+if orjson is not None:
+    _available.append(OrjsonCodec())
+if msgpack is not None:
+    _available.append(MsgpackCodec())
+
+CODECS: dict[str, Codec] = {codec.name: codec for codec in _available}
+CODECS_BY_ID: dict[int, Codec] = {codec.codec_id: codec for codec in _available}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Look up a codec by name.
+
+    Falls back to "pydantic" (always available) if an optional codec's
+    package isn't installed.
+
+    Raises:
+        ValueError: Unknown codec name
+    """
+    if name in CODECS:
+        return CODECS[name]
+
+    if name in ("orjson", "msgpack"):
+        logger.warning(f"Cache codec '{name}' is not installed, falling back to 'pydantic'")
+        return CODECS["pydantic"]
+
+    raise ValueError(f"Unknown cache codec: {name} (available: {', '.join(CODECS)})")
@@ -0,0 +1,106 @@
+"""
+Compression for large cache values.
+
+Ranking and squad payloads of big leagues are large - compressing them saves
+Redis memory and network time. Small values aren't worth it (the CPU cost and
+frame overhead outweigh the savings), so only payloads of at least
+settings.compression_threshold bytes are compressed.
+
+Which algorithm was used is recorded in the entry's flags byte (see entry.py),
+so entries written with or without compression (or by older versions) all
+decode correctly.
+
+| Algorithm | Package | Notes |
+|-----------|---------|-------|
+| `zstd` | zstandard | Best ratio, fast (default) |
+| `lz4` | lz4 | Fastest, lower ratio |
+| `none` | - | Store uncompressed |
+"""
+
+import logging
+
+from app import metrics
+from app.cache.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4 = None
+
+logger = logging.getLogger(__name__)
+
+# Flag bits in the entry header
+FLAG_ZSTD = 0b01
+FLAG_LZ4 = 0b10
+
+# zstd (de)compressor objects are reusable - create them once
+_zstd_compressor = zstandard.ZstdCompressor(level=settings.compression_level) if zstandard else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def _algorithm() -> str:
+    """The configured algorithm, or "none" if its package isn't installed."""
+    algorithm = settings.compression
+    if algorithm == "zstd" and zstandard is None:
+        logger.warning("CACHE_COMPRESSION=zstd but 'zstandard' is not installed, storing uncompressed")
+        settings.compression = "none"
+    elif algorithm == "lz4" and lz4 is None:
+        logger.warning("CACHE_COMPRESSION=lz4 but 'lz4' is not installed, storing uncompressed")
+        settings.compression = "none"
+    return settings.compression
+
+
+def compress(payload: bytes) -> tuple[bytes, int]:
+    """
+    Compress a payload if it's big enough and compression actually helps.
+
+    Returns:
+        (stored bytes, flag bits to put in the entry header)
+    """
+    metrics.incr("cache.compression.raw_bytes", len(payload))
+
+    algorithm = _algorithm()
+    if algorithm == "none" or len(payload) < settings.compression_threshold:
+        metrics.incr("cache.compression.stored_bytes", len(payload))
+        return payload, 0
+
+    if algorithm == "zstd":
+        compressed, flag = _zstd_compressor.compress(payload), FLAG_ZSTD
+    elif algorithm == "lz4":
+        compressed, flag = lz4.frame.compress(payload), FLAG_LZ4
+    else:
+        raise ValueError(f"Unknown cache compression: {algorithm}")
+
+    # Incompressible data (already dense) - keep it raw
+    if len(compressed) >= len(payload):
+        metrics.incr("cache.compression.stored_bytes", len(payload))
+        return payload, 0
+
+    metrics.incr("cache.compression.compressed")
+    metrics.incr("cache.compression.stored_bytes", len(compressed))
+    return compressed, flag
+
+
+def decompress(payload: bytes, flags: int) -> bytes:
+    """
+    Undo compress() based on the entry's flag bits.
+
+    Raises:
+        ValueError: Entry was compressed with an algorithm that isn't installed here
+    """
+    if flags & FLAG_ZSTD:
+        if _zstd_decompressor is None:
+            raise ValueError("Cache entry is zstd-compressed but 'zstandard' is not installed")
+        return _zstd_decompressor.decompress(payload)
+
+    if flags & FLAG_LZ4:
+        if lz4 is None:
+            raise ValueError("Cache entry is lz4-compressed but 'lz4' is not installed")
+        return lz4.frame.decompress(payload)
+
+    return payload
@@ -0,0 +1,78 @@
+"""
+Configuration for the cache.
+
+Uses pydantic-settings to load from environment variables.
+"""
+
+from pydantic_settings import BaseSettings
+
+
+class CacheSettings(BaseSettings):
+    """
+    Cache settings.
+
+    Override via environment variables prefixed with CACHE_:
+        CACHE_CODEC=msgpack
+        CACHE_L1_ENABLED=false
+        CACHE_L1_MAX_ENTRIES=500
+    """
+
+    # How values are encoded in Redis: "orjson", "msgpack", "pydantic" or "json"
+    # (see cache/codecs.py - orjson/msgpack skip validation on cache hits)
+    codec: str = "orjson"
+
+    # Compress values of at least compression_threshold bytes: "zstd", "lz4" or "none"
+    # (see cache/compression.py)
+    compression: str = "zstd"
+    compression_threshold: int = 1024  # bytes
+    compression_level: int = 3         # zstd level (1 = fastest, 19 = smallest)
+
+    # Secret for hashing user identities in cache keys (see cache/keys.py).
+    # Required - the app refuses to start without it.
+    key_secret: str = ""
+
+    # Seconds a worker may use its copy of a namespace generation before
+    # re-reading it (bumps are also pushed via pub/sub - see cache/namespaces.py)
+    generation_cache_ttl: float = 2.0
+
+    # --- L1: in-process tier in front of Redis (per worker) ---
+    l1_enabled: bool = True
+    l1_max_entries: int = 1000                # LRU eviction above this many entries
+    l1_max_bytes: int = 64 * 1024 * 1024      # ...or above this many (approximate) bytes
+    l1_ttl: float = 30.0                      # max seconds an entry stays in L1
+
+    # Seconds a materialized response (e.g., the dashboard) is kept in Redis -
+    # it's only served while its inputs are unchanged (see app/snapshots.py)
+    snapshot_ttl: int = 24 * 3600
+
+    # Redis pub/sub channel used to invalidate L1 entries and push
+    # namespace generation bumps to all workers
+    invalidation_channel: str = "cache:invalidate"
+
+    # --- HTTP responses (see app/http_cache.py, app/http_compression.py) ---
+    # Seconds browsers and nginx may reuse responses that are the same for
+    # everyone (e.g., the table) without asking again
+    public_max_age: int = 60
+
+    # gzip/brotli-compress responses of at least http_compression_threshold bytes
+    # (snapshots are stored compressed, so their hits never compress again)
+    http_compression_threshold: int = 1024  # bytes
+    http_gzip_level: int = 6                # 1 = fastest, 9 = smallest
+    http_brotli_quality: int = 5            # 0 = fastest, 11 = smallest
+
+    # --- Redis connection pools (see cache/backend.py) ---
+    redis_max_connections: int = 50           # per pool (text + binary client)
+    redis_socket_timeout: float = 0.5         # seconds per command - cache calls must be fast
+    redis_connect_timeout: float = 0.5        # seconds to open a connection
+    redis_health_check_interval: int = 30     # PING connections idle longer than this
+
+    # Circuit breaker: skip Redis for redis_cooldown seconds after
+    # redis_failure_threshold consecutive failures (see cache/breaker.py)
+    redis_failure_threshold: int = 5
+    redis_cooldown: float = 10.0
+
+    model_config = {"env_prefix": "CACHE_"}
+
+
+# Singleton instance
+settings = CacheSettings()
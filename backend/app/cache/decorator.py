@@ -0,0 +1,554 @@
+"""
+@cached decorator and cache entry handling.
+
+Provides:
+- @cached decorator for easy function caching
+- Two tiers: in-process L1 (see local.py) in front of Redis
+- Single-flight request coalescing (in-process + Redis lock across workers)
+- Stale-while-revalidate and probabilistic early refresh (XFetch)
+- Pluggable codecs (see codecs.py) and a binary entry format (see entry.py)
+- O(1) invalidation via namespace generations (see namespaces.py)
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, get_type_hints
+
+from app import metrics
+from app.cache.backend import RedisUnavailable, redis_call
+from app.cache.codecs import Codec, ValueType, get_codec
+from app.cache.config import settings
+from app.cache.entry import CacheEntry, SchemaMismatch, decode_entry, encode_entry, payload_fingerprint
+from app.cache.keys import CacheKey, KeyBuilder, league_namespace, user_namespace
+from app.cache.local import invalidation_message, local_cache
+from app.cache.namespaces import bump_generation
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for "not in cache" (None is a valid cached value)
+_MISSING = object()
+
+# Refresh lock settings (see "Single-flight" below)
+DEFAULT_LOCK_TTL = 10.0      # seconds before a refresh lock expires on its own
+LOCK_POLL_INTERVAL = 0.05    # seconds between cache checks while waiting for another worker
+
+
+async def _cache_get(cache_key: str, value_type: ValueType, ttl: int) -> CacheEntry | None:
+    """
+    Read a cache entry - from L1 if possible, otherwise from Redis.
+
+    Args:
+        ttl: Hard TTL of the entry (limits how long it may stay in L1)
+
+    Returns None on cache miss or if Redis is unavailable.
+    """
+    entry = local_cache.get(cache_key)
+    if entry is not None:
+        return entry
+
+    try:
+        async with redis_call(binary=True) as redis_client:
+            cached_value = await redis_client.get(cache_key)
+
+    except RedisUnavailable:
+        return None
+
+    except Exception as e:
+        # Redis error - just continue without cache
+        logger.warning(f"Redis read error (continuing without cache): {e}")
+        return None
+
+    return _decode_cached(cache_key, cached_value, value_type, ttl)
+
+
+def _decode_cached(cache_key: str, cached_value: bytes | None, value_type: ValueType, ttl: int) -> CacheEntry | None:
+    """Decode a value read from Redis and keep it in L1 (None on miss or if unreadable)."""
+    if cached_value is None:
+        metrics.incr("cache.redis.miss")
+        return None
+
+    metrics.incr("cache.redis.hit")
+
+    try:
+        entry = decode_entry(cached_value, value_type)
+
+    except SchemaMismatch:
+        # Written for an older/newer version of the model - treat as miss
+        logger.debug(f"Cache schema mismatch: {cache_key}")
+        metrics.incr("cache.schema_mismatch")
+        return None
+
+    except Exception as e:
+        # Unreadable entry (e.g., written by an incompatible version) - treat as miss
+        logger.warning(f"Unreadable cache entry {cache_key} (treating as miss): {e}")
+        return None
+
+    # Keep the validated objects in L1, but never past the entry's hard expiry
+    local_cache.set(cache_key, entry, size=len(cached_value), ttl=ttl - entry.age())
+    return entry
+
+
+async def _cache_set(
+    key: CacheKey, ttl: int, result: Any, value_type: ValueType, codec: Codec, delta: float
+) -> None:
+    """Encode and store a result (errors are logged, never raised)."""
+    try:
+        cache_data = encode_entry(result, value_type, codec, delta)
+
+        # One round trip: the value + telling other workers to drop their
+        # (now outdated) L1 copy
+        message = invalidation_message(key.key)
+        async with redis_call(binary=True) as redis_client:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key.key, ttl, cache_data)
+                if message is not None:
+                    pipe.publish(settings.invalidation_channel, message)
+                await pipe.execute()
+    except RedisUnavailable:
+        return
+    except Exception as e:
+        # Redis error - just continue without caching
+        logger.warning(f"Redis write error (continuing without caching): {e}")
+        return
+
+    # We keep the fresh value in our own L1
+    entry = CacheEntry(
+        value=result, created_at=time.time(), delta=delta, fingerprint=payload_fingerprint(cache_data)
+    )
+    local_cache.set(key.key, entry, size=len(cache_data), ttl=ttl)
+
+
+# --- Freshness: stale-while-revalidate + early refresh ---
+#
+# ttl        = soft TTL: after this, the value is "stale"
+# stale_ttl  = extra time a stale value may still be served (hard TTL = ttl + stale_ttl)
+#              while ONE background refresh fetches a new one
+# early_refresh = XFetch beta: refresh a still-fresh value a bit early, with a
+#              probability that rises towards expiry and with how slow the value is
+#              to compute. Spreads refreshes out instead of all keys expiring together.
+#              0 = off, 1.0 = recommended default, >1 = refresh earlier
+
+
+def _needs_refresh(entry: CacheEntry, ttl: int, early_refresh: float) -> bool:
+    """Check if an entry is stale, or randomly chosen for early refresh (XFetch)."""
+    if entry.created_at is None:
+        return False
+
+    age = entry.age()
+    if age >= ttl:
+        return True
+
+    if early_refresh > 0 and entry.delta > 0:
+        # XFetch: -log(rand) is exponentially distributed, so most requests
+        # don't refresh, but the closer to expiry the likelier one does
+        gap = -entry.delta * early_refresh * math.log(random.random() or 1e-12)
+        return age + gap >= ttl
+
+    return False
+
+
+# --- Single-flight (request coalescing) ---
+#
+# When a popular entry expires, many requests miss at the same time.
+# Without coalescing, every one of them calls Kickbase (thundering herd -> 429s).
+#
+# 1. Inside one process: concurrent callers with the same key share ONE task
+# 2. Across workers: a short Redis lock lets one worker refresh, the others
+#    poll the cache until the fresh value shows up (or the lock times out)
+
+# cache_key -> task currently computing that value (this process only)
+_inflight: dict[str, asyncio.Task] = {}
+
+# Lua script: delete the lock only if we still own it (don't release someone else's lock)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def _acquire_lock(lock_key: str, owner: str, lock_ttl: float) -> bool:
+    """
+    Try to take the refresh lock for a key.
+
+    Returns True if we got it - or if Redis is down (then there's nothing
+    to coordinate and we just compute the value ourselves).
+    """
+    try:
+        async with redis_call() as redis_client:
+            acquired = await redis_client.set(lock_key, owner, nx=True, px=int(lock_ttl * 1000))
+        return bool(acquired)
+    except RedisUnavailable:
+        return True
+    except Exception as e:
+        logger.warning(f"Redis lock error (continuing without lock): {e}")
+        return True
+
+
+async def _release_lock(lock_key: str, owner: str) -> None:
+    """Release the refresh lock if we still own it."""
+    try:
+        async with redis_call() as redis_client:
+            await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, owner)
+    except RedisUnavailable:
+        pass
+    except Exception as e:
+        logger.warning(f"Redis unlock error (lock expires on its own): {e}")
+
+
+@dataclass
+class _CachePolicy:
+    """Everything the cache needs to know about one @cached function."""
+
+    func: Callable
+    ttl: int               # soft TTL
+    hard_ttl: int          # Redis expiry (ttl + stale_ttl)
+    early_refresh: float   # XFetch beta (0 = off)
+    lock_ttl: float
+    value_type: ValueType
+    codec: Codec
+    keys: KeyBuilder
+
+
+async def _wait_for_value(policy: _CachePolicy, cache_key: str, lock_key: str) -> Any:
+    """
+    Wait for another worker to fill the cache.
+
+    Polls until the value appears, the lock disappears, or lock_ttl passes.
+    Returns _MISSING if we should compute the value ourselves.
+    """
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + policy.lock_ttl
+
+    while loop.time() < give_up_at:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+
+        entry = await _cache_get(cache_key, policy.value_type, policy.hard_ttl)
+        if entry is not None:
+            return entry.value
+
+        try:
+            async with redis_call() as redis_client:
+                lock_held = await redis_client.exists(lock_key)
+            if not lock_held:
+                # Lock holder finished without caching (e.g., it failed) - try ourselves
+                return _MISSING
+        except Exception:
+            return _MISSING
+
+    return _MISSING
+
+
+@dataclass
+class _WriteBatch:
+    """Computed values (and their refresh locks) to store together in one pipeline."""
+
+    entries: list[tuple[CacheKey, _CachePolicy, Any, float]] = field(default_factory=list)
+    locks: list[tuple[str, str]] = field(default_factory=list)  # (lock key, owner)
+    # Set once the batch is being stored - loads that finish later (shielded,
+    # shared via _inflight, outliving a deadline) store and unlock themselves
+    flushed: bool = False
+
+
+async def _load(
+    policy: _CachePolicy,
+    args: tuple,
+    kwargs: dict,
+    key: CacheKey,
+    wait: bool = True,
+    writes: _WriteBatch | None = None,
+) -> Any:
+    """
+    Compute a value and store it, coordinating with other workers via a Redis lock.
+
+    Args:
+        wait: If another worker holds the lock, wait for its result (True)
+            or give up and return _MISSING (False - used by background refreshes)
+        writes: Don't store the value (and keep the lock) - add both to this
+            batch instead, which the caller stores in one go (see batch.py).
+            Once the batch is flushed, the value is stored as usual.
+    """
+    cache_key = key.key
+    lock_key = f"lock:{cache_key}"
+    owner = uuid.uuid4().hex
+
+    acquired = await _acquire_lock(lock_key, owner, policy.lock_ttl)
+
+    if not acquired:
+        if not wait:
+            # Another worker is already refreshing - nothing to do
+            return _MISSING
+
+        # Another worker is already refreshing this key - wait for its result
+        metrics.incr("cache.lock_wait")
+        value = await _wait_for_value(policy, cache_key, lock_key)
+        if value is not _MISSING:
+            logger.debug(f"Cache filled by other worker: {cache_key}")
+            metrics.incr("cache.lock_wait_hit")
+            return value
+        metrics.incr("cache.lock_wait_timeout")
+
+    try:
+        started = time.monotonic()
+        result = await policy.func(*args, **kwargs)
+        delta = time.monotonic() - started
+
+        if writes is not None and not writes.flushed:
+            # Stored and unlocked later, together with the rest of the batch
+            writes.entries.append((key, policy, result, delta))
+            if acquired:
+                writes.locks.append((lock_key, owner))
+                acquired = False
+            return result
+
+        await _cache_set(
+            key,
+            policy.hard_ttl,
+            result,
+            policy.value_type,
+            policy.codec,
+            delta=delta,
+        )
+        return result
+    finally:
+        if acquired:
+            await _release_lock(lock_key, owner)
+
+
+def _forget_inflight(cache_key: str, task: asyncio.Task, background: bool) -> None:
+    """Done-callback: remove finished task from the in-flight map."""
+    if _inflight.get(cache_key) is task:
+        del _inflight[cache_key]
+
+    # Mark the exception as retrieved (callers may all have been cancelled,
+    # and nobody awaits background refreshes)
+    if not task.cancelled() and task.exception() is not None and background:
+        logger.warning(f"Background cache refresh failed for {cache_key}: {task.exception()}")
+
+
+def _start_inflight(cache_key: str, coro: Any, background: bool = False) -> asyncio.Task:
+    """Run a load as a shared task, registered in the in-flight map."""
+    task = asyncio.ensure_future(coro)
+    _inflight[cache_key] = task
+    task.add_done_callback(lambda t: _forget_inflight(cache_key, t, background))
+    return task
+
+
+def _refresh_in_background(policy: _CachePolicy, key: CacheKey, args: tuple, kwargs: dict) -> None:
+    """Start a background refresh unless one is already running."""
+    if key.key in _inflight:
+        return
+    metrics.incr("cache.background_refresh")
+    _start_inflight(key.key, _load(policy, args, kwargs, key, wait=False), background=True)
+
+
+def _serve_entry(policy: _CachePolicy, key: CacheKey, entry: CacheEntry, args: tuple, kwargs: dict) -> Any:
+    """Return a cached value, starting a background refresh if it's stale (or picked early)."""
+    if _needs_refresh(entry, policy.ttl, policy.early_refresh):
+        # Stale (or picked for early refresh) - serve it now, refresh behind the scenes
+        if entry.age() >= policy.ttl:
+            logger.debug(f"Cache stale: {key.key}")
+            metrics.incr("cache.stale")
+        else:
+            metrics.incr("cache.early_refresh")
+        _refresh_in_background(policy, key, args, kwargs)
+    else:
+        # Cache hit - return cached data
+        logger.debug(f"Cache hit: {key.key}")
+        metrics.incr("cache.hit")
+    return entry.value
+
+
+@dataclass
+class CachedCall:
+    """
+    A call of a @cached function that hasn't run yet - see fetch_many() in batch.py.
+
+    Created with `get_squad.defer(league_id, token)`.
+    """
+
+    policy: _CachePolicy
+    args: tuple
+    kwargs: dict
+
+
+def cached(
+    ttl: int = 300,
+    stale_ttl: int = 0,
+    early_refresh: float = 0.0,
+    lock_ttl: float = DEFAULT_LOCK_TTL,
+    codec: str | None = None,
+    scope: str = "global",
+):
+    """
+    Decorator to cache function results in Redis.
+
+    Args:
+        ttl: Time to live in seconds (default 5 minutes). With stale_ttl this
+            is the soft TTL - after it, the value is refreshed in the background.
+        stale_ttl: Extra seconds a stale value may still be served while it is
+            refreshed in the background (default 0 = expire hard at ttl)
+        early_refresh: XFetch beta for probabilistic early refresh (default 0 = off,
+            1.0 is a good start). Refreshes run in the background.
+        lock_ttl: Max seconds other workers wait for one worker's refresh
+            before computing the value themselves (default 10 seconds)
+        codec: How values are stored - "orjson", "msgpack", "pydantic" or "json"
+            (default: CACHE_CODEC setting, see codecs.py)
+        scope: Who shares the cached data (see keys.py):
+            "global" - everyone (default)
+            "league" - all members of a league (needs a league_id argument)
+            "user"   - one user in one league (needs league_id and token arguments)
+
+    Usage:
+        @cached(ttl=300, scope="user")
+        async def get_squad(league_id: str, token: str) -> KickbaseSquadResponse:
+            ...
+
+        # Serve up to 10 min stale data while refreshing, refresh slightly early
+        @cached(ttl=300, stale_ttl=600, early_refresh=1.0, scope="league")
+        async def get_ranking(league_id: str, token: str) -> KickbaseRankingResponse:
+            ...
+
+    The cache key is generated from the scope, function name and arguments.
+    The 'token' argument is never part of the key - user-scoped entries use
+    a hashed user identity instead.
+
+    Supports Pydantic models: the return type hint is used to store and
+    rebuild the result (models, list[Model], plain JSON data, ...).
+
+    Concurrent misses for the same key are coalesced: only one call per key
+    runs at a time in this process, and a Redis lock limits refreshes to
+    one worker at a time (see "Single-flight" above).
+
+    `func.defer(*args, **kwargs)` returns a CachedCall, so several cached
+    calls can be resolved with one Redis round trip (see batch.py).
+
+    For cache warming (see app/warmer/):
+        entry = await func.cached_entry(*args, **kwargs)  # CacheEntry or None, never calls upstream
+        entry = await func.refresh(*args, **kwargs)       # recompute + store now
+    """
+    def decorator(func: Callable) -> Callable:
+        # Get return type hint to reconstruct Pydantic models on cache hit
+        hints = get_type_hints(func)
+
+        policy = _CachePolicy(
+            func=func,
+            ttl=ttl,
+            hard_ttl=ttl + stale_ttl,
+            early_refresh=early_refresh,
+            lock_ttl=lock_ttl,
+            value_type=ValueType(hints.get("return")),
+            codec=get_codec(codec or settings.codec),
+            keys=KeyBuilder(func, scope),
+        )
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            # Generate cache key
+            key = await policy.keys.build(args, kwargs)
+            cache_key = key.key
+
+            # Try to get from cache
+            entry = await _cache_get(cache_key, policy.value_type, policy.hard_ttl)
+            if entry is not None:
+                return _serve_entry(policy, key, entry, args, kwargs)
+
+            logger.debug(f"Cache miss: {cache_key}")
+            metrics.incr("cache.miss")
+
+            # Join an in-flight computation of the same key, or start one
+            task = _inflight.get(cache_key)
+            if task is not None:
+                logger.debug(f"Cache coalesced: {cache_key}")
+                metrics.incr("cache.coalesced")
+            else:
+                task = _start_inflight(cache_key, _load(policy, args, kwargs, key))
+
+            # shield(): one caller disconnecting must not cancel the shared task
+            result = await asyncio.shield(task)
+            if result is _MISSING:
+                # Joined a background refresh that found another worker refreshing - load ourselves
+                result = await _load(policy, args, kwargs, key)
+            return result
+
+        def defer(*args, **kwargs) -> CachedCall:
+            return CachedCall(policy, args, kwargs)
+
+        async def cached_entry(*args, **kwargs) -> CacheEntry | None:
+            """The cached entry for these arguments (None if not cached) - never calls upstream."""
+            key = await policy.keys.build(args, kwargs)
+            return await _cache_get(key.key, policy.value_type, policy.hard_ttl)
+
+        async def refresh(*args, **kwargs) -> CacheEntry | None:
+            """
+            Recompute and store the value now (joins a refresh already running here).
+
+            Returns None if another worker is already refreshing it.
+            """
+            key = await policy.keys.build(args, kwargs)
+            task = _inflight.get(key.key)
+            if task is None:
+                task = _start_inflight(key.key, _load(policy, args, kwargs, key, wait=False))
+
+            result = await asyncio.shield(task)
+            if result is _MISSING:
+                return None
+            return CacheEntry(value=result, created_at=time.time())
+
+        wrapper.cache_policy = policy
+        wrapper.defer = defer
+        wrapper.cached_entry = cached_entry
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+
+async def invalidate_namespace(namespace: str) -> int:
+    """
+    Invalidate every entry of a namespace by bumping its generation (O(1)).
+
+    Nothing is deleted: new requests build keys with the new generation and
+    miss, the old entries expire by their TTL. All workers (and their L1)
+    switch to the new generation via pub/sub.
+
+    Args:
+        namespace: "all", "fn:<function>", "league:<id>" or
+            "league:<id>:user:<identity>" (see namespaces.py)
+
+    Returns:
+        The namespace's new generation
+
+    Raises:
+        ValueError: Not a valid namespace
+    """
+    return await bump_generation(namespace)
+
+
+async def clear_cache(function: str | None = None) -> int:
+    """
+    Invalidate all cached entries, or all entries of one cached function.
+
+    Args:
+        function: Name of a @cached function (e.g., "get_squad"), None for everything
+
+    Returns:
+        The namespace's new generation
+    """
+    return await invalidate_namespace(f"fn:{function}" if function else "all")
+
+
+async def invalidate_league(league_id: str) -> int:
+    """Invalidate everything cached for a league (league data + all its users' data)."""
+    return await invalidate_namespace(league_namespace(league_id))
+
+
+async def invalidate_user(league_id: str, token: str) -> int:
+    """Invalidate everything cached for the user behind `token` in one league."""
+    return await invalidate_namespace(user_namespace(league_id, token))
@@ -0,0 +1,116 @@
+"""
+Cache entry format.
+
+Every entry is stored as bytes: a fixed header followed by the encoded value.
+
+    version (1 byte) | codec id (1) | flags (1) | schema hash (4) | created_at (8) | delta (4) | payload
+
+- version: entry format (2). Legacy entries (plain JSON text, written by older
+  versions) start with "{" or "[" and are still readable.
+- codec id: which codec encoded the payload (see codecs.py)
+- flags: how the payload was compressed (0 = not compressed, see compression.py)
+- schema hash: fingerprint of the return type - entries for a different
+  model shape are treated as a miss instead of being constructed wrongly
+- created_at: unix timestamp when the value was computed (stale checks)
+- delta: seconds the computation took (drives early refresh / XFetch)
+
+Each entry also gets a fingerprint: a hash of its stored payload. Same value ->
+same fingerprint (codecs and compression are deterministic), so aggregates built
+from cached values (see app/snapshots.py) can tell whether an input changed
+without comparing the values themselves.
+"""
+
+import hashlib
+import json
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app.cache.codecs import CODECS_BY_ID, Codec, ValueType
+from app.cache.compression import compress, decompress
+
+FORMAT_VERSION = 2
+LEGACY_FORMAT = 1
+
+_HEADER = struct.Struct("!BBBIdf")
+
+
+@dataclass
+class CacheEntry:
+    """A value read from the cache plus the metadata stored with it."""
+
+    value: Any
+    created_at: float | None = None  # unix timestamp, None for legacy entries
+    delta: float = 0.0               # seconds the original computation took
+    fingerprint: str | None = None   # hash of the stored payload (see payload_fingerprint)
+
+    def age(self) -> float:
+        """Seconds since the value was computed (0 if unknown)."""
+        if self.created_at is None:
+            return 0.0
+        return time.time() - self.created_at
+
+
+class SchemaMismatch(Exception):
+    """Entry was written for a different shape of the return type."""
+
+    pass
+
+
+def payload_fingerprint(data: bytes) -> str:
+    """Content hash of an encoded entry (the header, with its timestamp, is skipped)."""
+    if data[:1] in (b"{", b"["):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    return hashlib.blake2b(memoryview(data)[_HEADER.size:], digest_size=16).hexdigest()
+
+
+def encode_entry(value: Any, value_type: ValueType, codec: Codec, delta: float) -> bytes:
+    """Encode (and maybe compress) a value with header for storage in Redis."""
+    payload, flags = compress(codec.encode(value, value_type))
+    header = _HEADER.pack(FORMAT_VERSION, codec.codec_id, flags, value_type.schema_hash, time.time(), delta)
+    return header + payload
+
+
+def decode_entry(raw: bytes, value_type: ValueType) -> CacheEntry:
+    """
+    Decode bytes from Redis into a CacheEntry.
+
+    Raises:
+        SchemaMismatch: Entry was written for a different model shape
+        ValueError: Unknown format or codec
+    """
+    if raw[:1] in (b"{", b"["):
+        return _decode_legacy(raw, value_type)
+
+    version, codec_id, flags, schema_hash, created_at, delta = _HEADER.unpack_from(raw)
+
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unknown cache entry format: {version}")
+
+    if schema_hash != value_type.schema_hash:
+        raise SchemaMismatch()
+
+    codec = CODECS_BY_ID.get(codec_id)
+    if codec is None:
+        raise ValueError(f"Unknown cache codec id: {codec_id}")
+
+    payload = decompress(raw[_HEADER.size:], flags)
+    value = codec.decode(payload, value_type)
+    return CacheEntry(value=value, created_at=created_at, delta=delta, fingerprint=payload_fingerprint(raw))
+
+
+def _decode_legacy(raw: bytes, value_type: ValueType) -> CacheEntry:
+    """Decode JSON entries from older versions (envelope or plain value), with validation."""
+    data = json.loads(raw)
+    fingerprint = payload_fingerprint(raw)
+
+    if isinstance(data, dict) and data.get("_c") == LEGACY_FORMAT:
+        return CacheEntry(
+            value=value_type.validate(data["v"]),
+            created_at=data["t"],
+            delta=data["d"],
+            fingerprint=fingerprint,
+        )
+
+    return CacheEntry(value=value_type.validate(data), fingerprint=fingerprint)
@@ -0,0 +1,144 @@
+"""
+Cache keys and namespaces.
+
+Every @cached function has a scope that decides who shares its entries:
+
+| Scope | Shared by | Key example |
+|-------|-----------|-------------|
+| `global` | everyone | `cache:get_bundesliga_table:2024@0.0` |
+| `league` | all members of a league | `league:123:get_ranking@0.0.1` |
+| `user` | one manager in one league | `league:123:user:9f2c...:get_squad@0.0.1.0` |
+
+The token is never part of a key. User-scoped keys use a non-reversible user
+identity instead: an HMAC of the token (keyed with CACHE_KEY_SECRET). Claims
+inside the token are never trusted - we can't verify Kickbase's signature, so a
+forged token naming another user must not land in that user's entries. A new
+login means a new token and a fresh scope; old entries expire by TTL.
+
+The `@...` suffix holds the generations of the namespaces the key belongs to
+(all, function, league, user - see namespaces.py). Bumping one of them changes
+the key, so invalidation never has to find or delete anything.
+"""
+
+import hashlib
+import hmac
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import Callable
+
+from app.cache.config import settings
+from app.cache.namespaces import get_generations
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("global", "league", "user")
+
+# Arguments that never become part of the key
+_EXCLUDED_ARGS = {"token"}
+
+MAX_KEY_LENGTH = 200
+
+
+@dataclass
+class CacheKey:
+    """A cache key plus the namespaces it belongs to (broadest first)."""
+
+    key: str
+    namespaces: tuple[str, ...] = field(default_factory=tuple)
+
+
+def _digest(value: str) -> str:
+    """Short keyed hash - stable across workers, not reversible without the secret."""
+    secret = settings.key_secret.encode()
+    return hmac.new(secret, value.encode(), hashlib.sha256).hexdigest()[:20]
+
+
+def check_key_secret() -> None:
+    """
+    Refuse to run without CACHE_KEY_SECRET (called on startup).
+
+    Raises:
+        RuntimeError: The secret is empty - user identities would be plain hashes
+    """
+    if not settings.key_secret.strip():
+        raise RuntimeError("CACHE_KEY_SECRET is not set - it's required to key per-user cache entries")
+
+
+def user_identity(token: str) -> str:
+    """
+    Non-reversible identity for the holder of a token.
+
+    Derived from the whole token, never from its (unverified) claims - only
+    whoever holds this exact token gets this identity. The raw token never
+    ends up in Redis.
+    """
+    return _digest(f"token:{token}")
+
+
+def league_namespace(league_id: str) -> str:
+    """Namespace of everything cached for one league (including its users)."""
+    return f"league:{league_id}"
+
+
+def user_namespace(league_id: str, token: str) -> str:
+    """Namespace of everything cached for one user in one league."""
+    return f"{league_namespace(league_id)}:user:{user_identity(token)}"
+
+
+class KeyBuilder:
+    """
+    Builds cache keys for one @cached function.
+
+    Created once per function: checks that the scope's required arguments
+    exist and binds call arguments to parameter names, so it doesn't matter
+    whether `token` or `league_id` are passed positionally or by keyword.
+    """
+
+    def __init__(self, func: Callable, scope: str):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown cache scope '{scope}' (expected one of {SCOPES})")
+
+        self.func_name = func.__name__
+        self.scope = scope
+        self.signature = inspect.signature(func)
+
+        required = {"league": ["league_id"], "user": ["league_id", "token"]}.get(scope, [])
+        missing = [name for name in required if name not in self.signature.parameters]
+        if missing:
+            raise TypeError(f"@cached(scope='{scope}') on {self.func_name} needs argument(s): {missing}")
+
+    async def build(self, args: tuple, kwargs: dict) -> CacheKey:
+        """Build the key for one call (includes the current namespace generations)."""
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+
+        namespaces = ["all", f"fn:{self.func_name}"]
+        if self.scope == "user":
+            namespace = user_namespace(arguments["league_id"], arguments["token"])
+            namespaces += [league_namespace(arguments["league_id"]), namespace]
+        elif self.scope == "league":
+            namespace = league_namespace(arguments["league_id"])
+            namespaces.append(namespace)
+        else:
+            namespace = "cache"
+
+        # Remaining arguments, in parameter order
+        key_parts = [namespace, self.func_name]
+        for name, value in arguments.items():
+            if name in _EXCLUDED_ARGS or (name == "league_id" and self.scope != "global"):
+                continue
+            key_parts.append(str(value))
+
+        key = ":".join(key_parts)
+
+        # If key is too long, hash the argument part
+        if len(key) > MAX_KEY_LENGTH:
+            key_hash = hashlib.md5(key.encode()).hexdigest()
+            key = f"{namespace}:{self.func_name}:{key_hash}"
+
+        generations = await get_generations(namespaces)
+        key = f"{key}@{'.'.join(str(generation) for generation in generations)}"
+
+        return CacheKey(key=key, namespaces=tuple(namespaces))
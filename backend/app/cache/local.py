@@ -0,0 +1,256 @@
+"""
+L1 cache: in-process tier in front of Redis.
+
+Every Redis hit costs a round trip, JSON decoding and Pydantic validation.
+The L1 tier keeps the already-validated objects in memory, so repeated hits
+in the same worker cost only a dict lookup.
+
+- Bounded by entry count AND approximate bytes (size of the Redis value)
+- TTL per entry (never longer than settings.l1_ttl) + LRU eviction
+- Kept coherent across workers via Redis pub/sub: every cache write publishes
+  an invalidation message, all workers drop matching entries. Namespace bumps
+  (see namespaces.py) change the keys themselves, so old L1 entries are simply
+  never looked up again. L1 is only used while the subscription is active -
+  if the listener is down, every read goes to Redis as before.
+"""
+
+import asyncio
+import fnmatch
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from app import metrics
+from app.cache.backend import WORKER_ID, RedisUnavailable, get_redis_pubsub, redis_call
+from app.cache.config import settings
+from app.cache.namespaces import apply_remote_generation
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _LocalItem:
+    """One L1 entry."""
+
+    value: Any
+    size: int
+    expires_at: float  # time.monotonic()
+
+
+class LocalCache:
+    """
+    Bounded in-memory LRU cache with per-entry TTL.
+
+    Not thread-safe - meant for use from one asyncio event loop.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.active = False  # True while the invalidation listener is subscribed
+        self._items: OrderedDict[str, _LocalItem] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory held by all entries."""
+        return self._bytes
+
+    def get(self, key: str) -> Any | None:
+        """Get a value (None on miss or if expired)."""
+        if not self.active:
+            return None
+
+        item = self._items.get(key)
+        if item is None:
+            metrics.incr("cache.l1.miss")
+            return None
+
+        if item.expires_at <= time.monotonic():
+            self._remove(key)
+            metrics.incr("cache.l1.expired")
+            metrics.incr("cache.l1.miss")
+            return None
+
+        # Mark as most recently used
+        self._items.move_to_end(key)
+        metrics.incr("cache.l1.hit")
+        return item.value
+
+    def set(self, key: str, value: Any, size: int, ttl: float | None = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            size: Approximate size in bytes (e.g., length of the encoded Redis value)
+            ttl: Seconds to keep it (capped at self.ttl)
+        """
+        if not self.active or size > self.max_bytes:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        if key in self._items:
+            self._remove(key)
+
+        self._items[key] = _LocalItem(value, size, time.monotonic() + ttl)
+        self._bytes += size
+
+        # Evict least recently used entries until we're within bounds
+        while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._items))
+            self._remove(oldest_key)
+            metrics.incr("cache.l1.eviction")
+
+    def invalidate(self, pattern: str) -> int:
+        """
+        Drop entries matching a key or glob pattern (e.g., "get_squad:*").
+
+        Returns:
+            Number of entries dropped
+        """
+        if not any(char in pattern for char in "*?["):
+            if pattern in self._items:
+                self._remove(pattern)
+                return 1
+            return 0
+
+        matching = [key for key in self._items if fnmatch.fnmatchcase(key, pattern)]
+        for key in matching:
+            self._remove(key)
+        return len(matching)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._items.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        item = self._items.pop(key)
+        self._bytes -= item.size
+
+
+# Global L1 instance - one per worker process
+local_cache = LocalCache(
+    max_entries=settings.l1_max_entries,
+    max_bytes=settings.l1_max_bytes,
+    ttl=settings.l1_ttl,
+)
+
+
+# --- Cross-worker invalidation (Redis pub/sub) ---
+#
+# Message formats:
+#   "<worker_id> key <key or glob pattern>"     - drop matching L1 entries
+#   "<worker_id> gen <namespace> <generation>"  - namespace was bumped
+
+_listener_task: asyncio.Task | None = None
+
+
+def invalidation_message(pattern: str) -> str | None:
+    """Message telling other workers to drop L1 entries matching a pattern (None if L1 is off)."""
+    if not settings.l1_enabled:
+        return None
+    return f"{WORKER_ID} key {pattern}"
+
+
+async def publish_invalidation(pattern: str) -> None:
+    """Tell all workers to drop L1 entries matching a key or pattern."""
+    message = invalidation_message(pattern)
+    if message is None:
+        return
+
+    try:
+        async with redis_call() as redis_client:
+            await redis_client.publish(settings.invalidation_channel, message)
+    except RedisUnavailable:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not publish cache invalidation (L1 entries expire on their own): {e}")
+
+
+def _handle_invalidation(data: str) -> None:
+    """Apply one invalidation message to this worker."""
+    sender, kind, payload = (data.split(" ", 2) + ["", ""])[:3]
+    if sender == WORKER_ID or not payload:
+        return
+
+    if kind == "key":
+        dropped = local_cache.invalidate(payload)
+        if dropped:
+            metrics.incr("cache.l1.invalidation", dropped)
+
+    elif kind == "gen":
+        namespace, _, generation = payload.rpartition(" ")
+        if generation.isdigit():
+            apply_remote_generation(namespace, int(generation))
+
+
+async def _listen() -> None:
+    """Subscribe to the invalidation channel, reconnecting on errors."""
+    while True:
+        pubsub = None
+        try:
+            redis_client = await get_redis_pubsub()
+            pubsub = redis_client.pubsub()
+            await pubsub.subscribe(settings.invalidation_channel)
+
+            # Anything cached before we subscribed may have missed invalidations
+            local_cache.clear()
+            local_cache.active = settings.l1_enabled
+            logger.info("L1 cache invalidation listener subscribed")
+
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _handle_invalidation(message["data"])
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            logger.warning(f"L1 cache invalidation listener error (L1 disabled, retrying): {e}")
+
+        finally:
+            # Without invalidations, L1 could serve outdated data - turn it off
+            local_cache.active = False
+            local_cache.clear()
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+        await asyncio.sleep(5)
+
+
+async def start_invalidation_listener() -> None:
+    """Start listening for invalidations and generation bumps (called on startup). Enables L1."""
+    global _listener_task
+
+    if _listener_task is not None:
+        return
+
+    _listener_task = asyncio.create_task(_listen())
+
+
+async def stop_invalidation_listener() -> None:
+    """Stop the listener (called on shutdown). Disables L1."""
+    global _listener_task
+
+    if _listener_task is None:
+        return
+
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
@@ -0,0 +1,206 @@
+"""
+Versioned cache namespaces.
+
+Instead of finding and deleting keys (SCAN + DELETE is O(keyspace) and blocks
+Redis), every namespace has a generation counter that is part of each key:
+
+    league:123:user:3f9a...:get_squad@0.2.5.1
+                                      │ │ │ └─ generation of league:123:user:3f9a...
+                                      │ │ └─── generation of league:123
+                                      │ └───── generation of fn:get_squad
+                                      └─────── generation of all
+
+Invalidating a namespace is one INCR (O(1)): new requests build keys with the
+new generation and miss, old entries are never read again and expire by TTL.
+
+| Namespace | Covers |
+|-----------|--------|
+| `all` | every cache entry |
+| `fn:<function>` | one cached function (e.g., `fn:get_squad`) |
+| `league:<id>` | one league, including all its users' entries |
+| `league:<id>:user:<identity>` | one user in one league (identity: see keys.py) |
+
+Generations are cached in-process for a moment (settings.generation_cache_ttl)
+and pushed to all workers via pub/sub on every bump, so most lookups cost no
+Redis round trip.
+"""
+
+import logging
+import time
+
+from app import metrics
+from app.cache.backend import WORKER_ID, RedisUnavailable, redis_call
+from app.cache.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Generation counters outlive any cache entry by far - when one expires and
+# restarts at 0, all entries of the old generation 0 are long gone
+GENERATION_KEY_TTL = 30 * 24 * 3600  # 30 days
+
+# Position of each namespace type in a key's generation suffix
+_POSITIONS = {"all": 0, "fn": 1, "league": 2, "user": 3}
+
+# Above this many locally cached generations, start over (user namespaces add up)
+_MAX_LOCAL_GENERATIONS = 10_000
+
+# namespace -> (generation, time.monotonic() when fetched)
+_local_generations: dict[str, tuple[int, float]] = {}
+
+
+def _generation_key(namespace: str) -> str:
+    return f"gen:{namespace}"
+
+
+def namespace_type(namespace: str) -> str:
+    """
+    Type of a namespace: "all", "fn", "league" or "user".
+
+    Raises:
+        ValueError: Not a valid namespace
+    """
+    parts = namespace.split(":")
+    if namespace == "all":
+        return "all"
+    if len(parts) == 2 and parts[0] == "fn" and parts[1]:
+        return "fn"
+    if len(parts) == 2 and parts[0] == "league" and parts[1]:
+        return "league"
+    if len(parts) == 4 and parts[0] == "league" and parts[2] == "user" and parts[1] and parts[3]:
+        return "user"
+    raise ValueError(f"Invalid cache namespace: {namespace}")
+
+
+async def get_generations(namespaces: list[str]) -> list[int]:
+    """
+    Current generation of each namespace (0 if never bumped).
+
+    Uses the in-process copy if it's recent, otherwise one MGET for all
+    missing ones. If Redis is unavailable, the last known (or 0) is used.
+    """
+    now = time.monotonic()
+    stale = [
+        namespace
+        for namespace in namespaces
+        if namespace not in _local_generations
+        or now - _local_generations[namespace][1] > settings.generation_cache_ttl
+    ]
+
+    if stale:
+        try:
+            async with redis_call() as redis_client:
+                values = await redis_client.mget([_generation_key(namespace) for namespace in stale])
+            metrics.incr("cache.generation.fetch")
+
+            if len(_local_generations) > _MAX_LOCAL_GENERATIONS:
+                _local_generations.clear()
+
+            for namespace, value in zip(stale, values):
+                _local_generations[namespace] = (int(value or 0), now)
+
+        except RedisUnavailable:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read cache generations (using last known): {e}")
+
+    return [_local_generations.get(namespace, (0, now))[0] for namespace in namespaces]
+
+
+async def bump_generation(namespace: str) -> int:
+    """
+    Invalidate a namespace by bumping its generation (O(1)).
+
+    All workers pick up the new generation via pub/sub.
+
+    Returns:
+        The new generation
+
+    Raises:
+        ValueError: Not a valid namespace
+        RedisUnavailable: Redis circuit breaker is open
+    """
+    namespace_type(namespace)  # validate
+
+    async with redis_call() as redis_client:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(_generation_key(namespace))
+            pipe.expire(_generation_key(namespace), GENERATION_KEY_TTL)
+            generation, _ = await pipe.execute()
+
+    _local_generations[namespace] = (generation, time.monotonic())
+    metrics.incr("cache.generation.bump")
+    logger.info(f"Cache namespace bumped: {namespace} -> generation {generation}")
+
+    try:
+        async with redis_call() as redis_client:
+            await redis_client.publish(
+                settings.invalidation_channel, f"{WORKER_ID} gen {namespace} {generation}"
+            )
+    except Exception as e:
+        logger.warning(f"Could not publish generation bump (workers pick it up within "
+                       f"{settings.generation_cache_ttl}s): {e}")
+
+    return generation
+
+
+def apply_remote_generation(namespace: str, generation: int) -> None:
+    """Another worker bumped a namespace - use the new generation right away."""
+    current = _local_generations.get(namespace)
+    if current is None or current[0] < generation:
+        _local_generations[namespace] = (generation, time.monotonic())
+
+
+def _key_generation(key: str, position: int) -> int | None:
+    """Generation at `position` in a cache key's suffix (None if not a cache key)."""
+    _, separator, suffix = key.rpartition("@")
+    if not separator:
+        return None
+    generations = suffix.split(".")
+    if position >= len(generations) or not generations[position].isdigit():
+        return None
+    return int(generations[position])
+
+
+def _key_in_namespace(key: str, namespace: str, kind: str) -> bool:
+    """Check if a cache key belongs to a namespace (ignoring generations)."""
+    if key.startswith(("lock:", "gen:")):
+        return False
+    if kind == "all":
+        return True
+    path = key.rpartition("@")[0]
+    if kind == "fn":
+        function = namespace.split(":", 1)[1]
+        return f":{function}:" in f"{path}:"
+    return path.startswith(f"{namespace}:")
+
+
+async def estimate_live_keys(namespace: str, sample_size: int = 200) -> dict:
+    """
+    Estimate how many live entries a namespace holds - by sampling, not scanning.
+
+    Picks `sample_size` random keys (RANDOMKEY), counts the ones that belong to
+    the namespace's current generation and scales by DBSIZE.
+
+    Returns:
+        {"estimate": int, "sampled": int, "matched": int, "total_keys": int}
+    """
+    kind = namespace_type(namespace)
+    position = _POSITIONS[kind]
+    (generation,) = await get_generations([namespace])
+
+    async with redis_call() as redis_client:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.dbsize()
+            for _ in range(sample_size):
+                pipe.randomkey()
+            total_keys, *sample = await pipe.execute()
+
+    sample = [key for key in sample if key is not None]
+    matched = sum(
+        1
+        for key in sample
+        if _key_generation(key, position) == generation and _key_in_namespace(key, namespace, kind)
+    )
+
+    estimate = round(total_keys * matched / len(sample)) if sample else 0
+    return {"estimate": estimate, "sampled": len(sample), "matched": matched, "total_keys": total_keys}
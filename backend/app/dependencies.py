@@ -5,6 +5,9 @@ Dependencies are reusable functions that run before endpoints.
 Use them with: token: str = Depends(get_token)
 """
 
+import hmac
+import os
+
 from fastapi import Header, HTTPException
 
 
@@ -45,3 +48,32 @@ async def get_token(authorization: str = Header(...)) -> str:
         )
 
     return token
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """
+    Allow only requests with the admin token (X-Admin-Token header).
+
+    The token comes from the ADMIN_TOKEN env var - if it's not set, admin
+    endpoints are disabled.
+
+    Usage:
+        @router.post("/admin/something", dependencies=[Depends(require_admin)])
+
+    Raises:
+        HTTPException 403 if admin endpoints are disabled or the token is wrong
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+
+    if not admin_token:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled"
+        )
+
+    # Constant-time comparison, so the token can't be guessed by timing
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(
+            status_code=403,
+            detail="Invalid admin token"
+        )
@@ -0,0 +1,81 @@
+"""
+Concurrent fan-out for aggregate endpoints.
+
+Aggregate endpoints (like the dashboard) need data from several upstream calls.
+Awaiting them one after another costs the SUM of all round trips - running them
+concurrently costs only the SLOWEST one.
+
+Usage:
+    from app.fanout import fan_out
+
+    league_me, ranking = await fan_out(
+        get_league_me(league_id, token),
+        get_ranking(league_id, token),
+        deadline=10.0,
+    )
+
+Behavior:
+- Results are returned in the same order as the awaitables
+- If one call raises, the others are cancelled and the original exception
+  is re-raised (so global handlers like KickbaseError -> 502 still apply)
+- If the deadline passes, everything still running is cancelled and
+  DeadlineExceeded is raised (-> 504 via main.py)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Upstream calls did not finish within the request deadline."""
+
+    def __init__(self, deadline: float, pending: int):
+        self.deadline = deadline
+        self.pending = pending
+        self.message = f"{pending} upstream call(s) still running after {deadline:.1f}s"
+        super().__init__(self.message)
+
+
+async def fan_out(*aws: Awaitable[Any], deadline: float | None = None) -> tuple[Any, ...]:
+    """
+    Run awaitables concurrently and return their results in order.
+
+    Args:
+        *aws: Coroutines/awaitables to run (e.g., service calls)
+        deadline: Max seconds to wait for ALL of them (None = no limit)
+
+    Returns:
+        Tuple of results, same order as the arguments
+
+    Raises:
+        The first exception raised by any awaitable (others are cancelled)
+        DeadlineExceeded: If not all awaitables finished within the deadline
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+
+    try:
+        done, pending = await asyncio.wait(
+            tasks, timeout=deadline, return_when=asyncio.FIRST_EXCEPTION
+        )
+
+        # Re-raise the first failure (in argument order for determinism)
+        for task in tasks:
+            if task in done and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+        if pending:
+            logger.warning(f"Fan-out deadline exceeded: {len(pending)}/{len(tasks)} call(s) pending")
+            raise DeadlineExceeded(deadline, len(pending))
+
+        return tuple(task.result() for task in tasks)
+
+    finally:
+        # Cancel whatever is still running and wait until it's actually gone,
+        # so no orphaned upstream requests keep running after we respond
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
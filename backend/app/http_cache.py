@@ -0,0 +1,88 @@
+"""
+HTTP caching: ETags, 304 Not Modified and Cache-Control.
+
+The frontend polls the dashboard and the table. Most polls find nothing
+changed - with an ETag, the browser sends `If-None-Match` and gets an empty
+304 instead of the full body. The ETag is derived from what the response is
+built from (content fingerprints of the cached inputs, see app/snapshots.py),
+so a 304 is decided before the response is built or even loaded.
+
+Usage:
+    etag = make_etag(inputs)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE)
+    ...
+    return json_response(body, etag, PRIVATE, content_encoding)
+
+| Policy | Cache-Control | Used for |
+|--------|---------------|----------|
+| `PRIVATE` | `private, no-cache` | per-user data (dashboard): only the browser may store it, always revalidated |
+| `public_policy()` | `public, max-age=N` | the same for everyone (table): nginx may microcache it |
+
+All responses carry `Vary: Authorization, Accept-Encoding` - a shared cache
+keeps anonymous and authenticated, compressed and uncompressed variants apart.
+"""
+
+from fastapi import Response
+
+from app.cache.config import settings
+from app.http_compression import weak_etag
+from app.responses import FastJSONResponse
+
+PRIVATE = "private, no-cache"
+
+VARY = "Authorization, Accept-Encoding"
+
+
+def public_policy() -> str:
+    """Cache-Control for responses that are the same for everyone."""
+    return f"public, max-age={settings.public_max_age}"
+
+
+def make_etag(version: str) -> str:
+    """Strong ETag from a content hash or version string."""
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    True if an If-None-Match header matches the ETag.
+
+    Uses the weak comparison (RFC 9110): nginx marks ETags weak (W/"...")
+    when it gzips a response, and the browser sends them back like that.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _headers(etag: str, cache_control: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control, "Vary": VARY}
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 response (same caching headers as the full one)."""
+    return Response(status_code=304, headers=_headers(etag, cache_control))
+
+
+def json_response(body: bytes, etag: str, cache_control: str, content_encoding: str | None = None) -> Response:
+    """
+    Response with already serialized JSON + caching headers.
+
+    Args:
+        content_encoding: Encoding the body is already compressed with (None = uncompressed)
+    """
+    headers = _headers(etag, cache_control)
+    if content_encoding is not None:
+        headers["Content-Encoding"] = content_encoding
+        headers["ETag"] = weak_etag(etag)
+    return FastJSONResponse(body, headers=headers)
@@ -0,0 +1,180 @@
+"""
+HTTP response compression (gzip / brotli).
+
+Responses are compressed here, in the backend, for clients that accept it
+(Accept-Encoding) - brotli preferred, gzip otherwise. Small responses aren't
+worth it (settings.http_compression_threshold).
+
+Two paths:
+- CompressionMiddleware (main.py) compresses any JSON/text response that
+  isn't compressed yet, per request
+- Snapshots (see snapshots.py) are stored with all variants already
+  compressed (compress_variants) - the dashboard and table routes pick the
+  client's variant (pick_variant), so repeat hits never compress again. The
+  middleware leaves responses with a Content-Encoding alone.
+
+| Encoding | Package | Notes |
+|----------|---------|-------|
+| `br` | brotli (optional) | ~15-20% smaller than gzip for JSON |
+| `gzip` | stdlib | every client supports it |
+
+A compressed representation is not byte-identical to the uncompressed one,
+so its ETag is marked weak (W/"...") - like nginx does when it gzips. Our
+If-None-Match check uses the weak comparison (see http_cache.py), so the
+304s still work.
+"""
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import metrics
+from app.cache.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+IDENTITY = "identity"
+
+# Preferred first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Best encoding the client accepts (None = send uncompressed)."""
+    if not accept_encoding:
+        return None
+
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+
+    for encoding in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a body with one of ENCODINGS."""
+    if encoding == "br":
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=settings.http_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.http_gzip_level, mtime=0)
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    """
+    The body in every encoding worth sending.
+
+    Always contains IDENTITY; compressed variants only above the threshold
+    and if they're actually smaller.
+    """
+    variants = {IDENTITY: body}
+    if len(body) < settings.http_compression_threshold:
+        return variants
+
+    for encoding in ENCODINGS:
+        compressed = compress_body(body, encoding)
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+def pick_variant(variants: dict[str, bytes], encoding: str | None) -> tuple[bytes, str | None]:
+    """
+    The variant to send for a negotiated encoding.
+
+    Returns:
+        (body, Content-Encoding - None if uncompressed)
+    """
+    if encoding is not None and encoding in variants:
+        metrics.incr(f"http.precompressed.{encoding}")
+        return variants[encoding], encoding
+    return variants[IDENTITY], None
+
+
+def weak_etag(etag: str) -> str:
+    """ETag of a compressed representation."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete (non-streaming) JSON/text responses above the threshold.
+
+    Streaming responses, responses that already have a Content-Encoding
+    (precompressed snapshots) and small ones pass through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int | None = None):
+        self.app = app
+        self.minimum_size = settings.http_compression_threshold if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+
+            if message["type"] == "http.response.start":
+                # Hold it back - the headers depend on the body
+                start = message
+                return
+
+            if start is None:
+                # Later chunks of a streamed response (already passed through)
+                await send(message)
+                return
+
+            initial, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=initial["headers"])
+
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+            ):
+                await send(initial)
+                await send(message)
+                return
+
+            compressed = compress_body(body, encoding)
+            metrics.incr(f"http.compressed.{encoding}")
+            metrics.incr("http.compression.raw_bytes", len(body))
+            metrics.incr("http.compression.sent_bytes", len(compressed))
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = weak_etag(headers["etag"])
+
+            await send(initial)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
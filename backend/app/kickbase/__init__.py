@@ -1,10 +1,11 @@
 """Kickbase API client package."""
 
-from app.kickbase.client import KickbaseClient
+from app.kickbase.client import KickbaseClient, close_http_client, open_http_client
 from app.kickbase.config import KickbaseConfig, config
 from app.kickbase.exceptions import (
     AuthenticationError,
     AuthorizationError,
+    ClientRateLimitError,
     KickbaseError,
     NetworkError,
     NotFoundError,
@@ -22,6 +23,8 @@ from app.kickbase.models import (
 __all__ = [
     # Client
     "KickbaseClient",
+    "open_http_client",
+    "close_http_client",
     "KickbaseConfig",
     "config",
     # Exceptions
@@ -31,6 +34,7 @@ __all__ = [
     "ValidationError",
     "NotFoundError",
     "RateLimitError",
+    "ClientRateLimitError",
     "ServerError",
     "NetworkError",
     "TimeoutError",
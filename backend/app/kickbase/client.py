@@ -2,16 +2,20 @@
 
 import asyncio
 import logging
-from typing import Any
+import random
+from typing import Any, Awaitable, Callable, TypeVar, get_args
 
 import httpx
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+from app import metrics
 from app.kickbase.config import config
 from app.kickbase.exceptions import (
     AuthenticationError,
     AuthorizationError,
+    ClientRateLimitError,
     KickbaseError,
     NetworkError,
     NotFoundError,
@@ -20,6 +24,112 @@ from app.kickbase.exceptions import (
     TimeoutError,
     ValidationError,
 )
+from app.kickbase.ratelimit import rate_limiter
+from app.kickbase.retry import parse_retry_after, retry_budget
+from app.streaming import StreamParseError, StreamParser, streaming_available
+
+M = TypeVar("M", bound=BaseModel)
+
+# Reads the body of a successful response (see KickbaseClient._request)
+BodyReader = Callable[[httpx.Response], Awaitable[Any]]
+
+
+async def _read_json(response: httpx.Response) -> Any:
+    """Default body reader: buffer the whole body, then decode it."""
+    await response.aread()
+    return response.json()
+
+
+def _read_model(model: type[M]) -> BodyReader:
+    """Body reader that validates the raw bytes straight into `model` (no dict tree)."""
+
+    async def read(response: httpx.Response) -> M:
+        return model.model_validate_json(await response.aread())
+
+    return read
+
+
+def _list_item_type(model: type[BaseModel], alias: str) -> type[BaseModel]:
+    """Item model of a list[Model] field, looked up by its JSON name (e.g., "us")."""
+    for name, field in model.model_fields.items():
+        if alias in (field.alias, name):
+            args = get_args(field.annotation)
+            if len(args) == 1 and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+                return args[0]
+    raise TypeError(f"{model.__name__} has no list[Model] field '{alias}'")
+
+
+# Shared connection pool (opened in main.py lifespan, reused by every KickbaseClient)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    """Check if the optional h2 package is installed (required for HTTP/2)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Build the pooled httpx client from KickbaseConfig."""
+    http2 = config.http2
+    if http2 and not _http2_available():
+        logger.warning("KICKBASE_HTTP2 is enabled but 'h2' is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            timeout=config.timeout,
+            connect=config.connect_timeout,
+        ),
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        http2=http2,
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """
+    Open the shared connection pool.
+
+    Called once on startup (main.py lifespan). Safe to call multiple times.
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+        logger.info(f"Kickbase connection pool opened (max_connections={config.max_connections})")
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared connection pool (called on shutdown)."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Kickbase connection pool closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared connection pool.
+
+    Creates it lazily if the app lifespan didn't (e.g., in scripts or notebooks).
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+
+    return _http_client
 
 
 class KickbaseClient:
@@ -28,9 +138,13 @@ class KickbaseClient:
 
     Handles:
     - Authentication token management
-    - Automatic retries with exponential backoff
+    - Client-side rate limiting + adaptive concurrency (see ratelimit.py)
+    - Automatic retries with jittered exponential backoff + a retry budget
     - Error handling with custom exceptions
 
+    All instances share one pooled httpx client (see open_http_client), so
+    creating a KickbaseClient per request is cheap - connections are reused.
+
     Usage:
         client = KickbaseClient()
 
@@ -108,6 +222,76 @@ class KickbaseClient:
         """
         return await self._request_with_retry("DELETE", path)
 
+    async def get_model(self, path: str, model: type[M], params: dict | None = None) -> M:
+        """
+        Make a GET request and validate the response into a model.
+
+        The raw body goes straight to `model.model_validate_json` - pydantic
+        parses the JSON itself, so the intermediate dict of `get()` is never built.
+        Field aliases (e.g., "mv" -> market_value) work the same as with dicts.
+
+        Args:
+            path: API path (e.g., "/leagues/123/lineup")
+            model: Response model (e.g., KickbaseLineupResponse)
+            params: Optional query parameters
+
+        Returns:
+            The validated response model
+        """
+        return await self._request_with_retry("GET", path, params=params, reader=_read_model(model))
+
+    async def post_model(self, path: str, model: type[M], data: dict | None = None) -> M:
+        """
+        Make a POST request and validate the response into a model (see get_model).
+
+        Args:
+            path: API path (e.g., "/user/login")
+            model: Response model (e.g., KickbaseLoginResponse)
+            data: Request body as dict
+
+        Returns:
+            The validated response model
+        """
+        return await self._request_with_retry("POST", path, data=data, reader=_read_model(model))
+
+    async def get_streamed(
+        self, path: str, model: type[M], items_field: str, params: dict | None = None
+    ) -> M:
+        """
+        GET a response with one large array and validate it while it downloads.
+
+        Each element of `items_field` is validated into its model as soon as
+        its bytes arrived (see app/streaming.py) - the full dict tree is never
+        built. Top-level scalar fields next to the array are kept as well.
+
+        Args:
+            path: API path (e.g., "/leagues/123/ranking")
+            model: Response model (e.g., KickbaseRankingResponse)
+            items_field: JSON name of the array (e.g., "us")
+
+        Returns:
+            The validated response model
+        """
+        if not streaming_available():
+            return await self.get_model(path, model, params)
+
+        item_type = _list_item_type(model, items_field)
+
+        async def read(response: httpx.Response) -> M:
+            parser = StreamParser(f"{items_field}.item", item_type.model_validate)
+            items = []
+            try:
+                async for chunk in response.aiter_bytes():
+                    items.extend(parser.feed(chunk))
+                items.extend(parser.close())
+            except StreamParseError as e:
+                raise KickbaseError(f"Invalid JSON from Kickbase: {e}")
+
+            # Items are already models - pydantic keeps instances as they are
+            return model.model_validate({**parser.fields, items_field: items})
+
+        return await self._request_with_retry("GET", path, params=params, reader=read)
+
     # --- Internal Methods ---
 
     def _build_headers(self) -> dict[str, str]:
@@ -128,39 +312,45 @@ class KickbaseClient:
         path: str,
         params: dict | None = None,
         data: dict | None = None,
-    ) -> dict:
+        reader: BodyReader | None = None,
+    ) -> Any:
         """
         Make a single HTTP request (no retry).
 
         This is the core method that actually talks to Kickbase.
+
+        Args:
+            reader: Reads the body of a 2xx response (default: buffered JSON).
+                The body is streamed, so a reader can parse it while it downloads.
         """
         url = f"{config.base_url}{path}"
         headers = self._build_headers()
 
-        # Set up timeouts
-        timeout = httpx.Timeout(
-            timeout=config.timeout,
-            connect=config.connect_timeout,
-        )
-
         try:
             logger.debug(f"Request: {method} {path}")
 
-            # Create a client and make the request
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=data,  # httpx automatically converts dict to JSON
-                )
-
-            # Check for errors
-            self._handle_response_errors(response)
-
-            # Return the JSON body
-            return response.json()
+            # Reuse the shared pool (keep-alive connections, no new TLS handshake).
+            # The rate limiter may wait for a token first (see ratelimit.py)
+            client = get_http_client()
+            request = client.build_request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=data,  # httpx automatically converts dict to JSON
+            )
+            async with rate_limiter.limit(path) as permit:
+                response = await client.send(request, stream=True)
+                permit.status = response.status_code
+                try:
+                    # Check for errors (error bodies are small - read them whole)
+                    if not 200 <= response.status_code < 300:
+                        await response.aread()
+                        self._handle_response_errors(response)
+
+                    return await (reader or _read_json)(response)
+                finally:
+                    await response.aclose()
 
         except httpx.ConnectError as e:
             raise NetworkError(f"Failed to connect to Kickbase API: {e}")
@@ -191,28 +381,27 @@ class KickbaseClient:
 
         # Map status codes to exceptions
         if status == 400:
-            raise ValidationError("Bad request", detail)
+            raise ValidationError("Bad request", detail, status)
 
         elif status == 401:
-            raise AuthenticationError("Invalid credentials or token expired", detail)
+            raise AuthenticationError("Invalid credentials or token expired", detail, status)
 
         elif status == 403:
-            raise AuthorizationError("Access denied", detail)
+            raise AuthorizationError("Access denied", detail, status)
 
         elif status == 404:
-            raise NotFoundError("Resource not found", detail)
+            raise NotFoundError("Resource not found", detail, status)
 
         elif status == 429:
-            # Try to get retry-after header
-            retry_after = response.headers.get("Retry-After")
-            retry_seconds = int(retry_after) if retry_after else None
+            # Retry-After may be seconds or an HTTP-date
+            retry_seconds = parse_retry_after(response.headers.get("Retry-After"))
             raise RateLimitError("Rate limit exceeded", retry_seconds, detail)
 
         elif status >= 500:
-            raise ServerError(f"Server error ({status})", detail)
+            raise ServerError(f"Server error ({status})", detail, status)
 
         else:
-            raise KickbaseError(f"Unexpected error ({status})", detail)
+            raise KickbaseError(f"Unexpected error ({status})", detail, status)
 
     async def _request_with_retry(
         self,
@@ -220,69 +409,95 @@ class KickbaseClient:
         path: str,
         params: dict | None = None,
         data: dict | None = None,
-    ) -> dict:
+        reader: BodyReader | None = None,
+    ) -> Any:
         """
         Make a request with automatic retry on failure.
 
-        Uses exponential backoff: waits longer between each retry.
-        Only retries on specific error codes (429, 500, 502, 503, 504).
+        Retries network errors and the status codes in config.retry_codes,
+        with jittered exponential backoff (or Retry-After on 429). Retries
+        are skipped when the worker's retry budget is used up (see retry.py).
         """
-        last_exception: Exception | None = None
+        last_exception: KickbaseError | None = None
+        delay = config.retry_base_delay
+        retry_budget.record_request()
 
         for attempt in range(config.max_retries + 1):
             try:
-                return await self._request(method, path, params, data)
+                return await self._request(method, path, params, data, reader)
 
-            except RateLimitError as e:
-                last_exception = e
-
-                # Use retry-after header if provided, otherwise calculate backoff
-                if e.retry_after:
-                    delay = min(e.retry_after, config.retry_max_delay)
-                else:
-                    delay = self._calculate_backoff(attempt)
-
-                # Don't retry if this was the last attempt
-                if attempt < config.max_retries:
-                    logger.warning(f"Rate limited, retry {attempt + 1}/{config.max_retries} in {delay:.1f}s: {path}")
-                    await asyncio.sleep(delay)
+            except ClientRateLimitError:
+                # Our own limiter already waited as long as it may - retrying would only queue more
+                raise
 
-            except ServerError as e:
+            except KickbaseError as e:
+                if not self._is_retryable(e):
+                    # Client errors (400, 401, 403, 404) won't succeed on retry
+                    raise
                 last_exception = e
 
-                # Don't retry if this was the last attempt
-                if attempt < config.max_retries:
-                    delay = self._calculate_backoff(attempt)
-                    logger.warning(f"Server error, retry {attempt + 1}/{config.max_retries} in {delay:.1f}s: {path}")
-                    await asyncio.sleep(delay)
+            # Don't retry if this was the last attempt
+            if attempt == config.max_retries:
+                break
 
-            except (NetworkError, TimeoutError) as e:
-                last_exception = e
+            if not retry_budget.try_spend():
+                logger.warning(f"Retry budget exhausted, not retrying: {method} {path}")
+                raise last_exception
 
-                # Don't retry if this was the last attempt
-                if attempt < config.max_retries:
-                    delay = self._calculate_backoff(attempt)
-                    logger.warning(f"Network error, retry {attempt + 1}/{config.max_retries} in {delay:.1f}s: {path}")
-                    await asyncio.sleep(delay)
+            # Use Retry-After if Kickbase sent one, otherwise jittered backoff
+            retry_after = getattr(last_exception, "retry_after", None)
+            if retry_after is not None:
+                delay = min(retry_after, config.retry_max_delay)
+            else:
+                delay = self._calculate_backoff(attempt, delay)
 
-            except KickbaseError:
-                # Don't retry client errors (400, 401, 403, 404)
-                # These won't succeed on retry
-                raise
+            metrics.incr("kickbase.retry")
+            logger.warning(
+                f"{self._describe(last_exception)}, retry {attempt + 1}/{config.max_retries} "
+                f"in {delay:.1f}s: {path}"
+            )
+            await asyncio.sleep(delay)
 
         # All retries failed
         logger.error(f"Request failed after {config.max_retries} retries: {method} {path}")
         raise last_exception
 
-    def _calculate_backoff(self, attempt: int) -> float:
+    @staticmethod
+    def _is_retryable(error: KickbaseError) -> bool:
+        """Network errors and the status codes in config.retry_codes are retried."""
+        if isinstance(error, (NetworkError, TimeoutError)):
+            return True
+        return error.status_code in config.retry_codes
+
+    @staticmethod
+    def _describe(error: KickbaseError) -> str:
+        """Short reason for retry log messages."""
+        if isinstance(error, RateLimitError):
+            return "Rate limited"
+        if isinstance(error, (NetworkError, TimeoutError)):
+            return "Network error"
+        return f"Error {error.status_code}"
+
+    def _calculate_backoff(self, attempt: int, previous_delay: float) -> float:
         """
-        Calculate wait time using exponential backoff.
+        Calculate wait time using exponential backoff with jitter.
 
-        attempt 0: 1 second
-        attempt 1: 2 seconds
-        attempt 2: 4 seconds
-        attempt 3: 8 seconds
-        ... capped at retry_max_delay
+        Without jitter every worker retries at the same moments (1, 2, 4 s...)
+        and hits Kickbase in waves. config.retry_jitter:
+
+        - "full": random between 0 and base * 2^attempt
+        - "decorrelated": random between base and 3x the previous delay
+        - "none": base * 2^attempt (1, 2, 4, 8 seconds...)
+
+        Always capped at retry_max_delay.
         """
-        delay = config.retry_base_delay * (2 ** attempt)
+        base = config.retry_base_delay
+
+        if config.retry_jitter == "decorrelated":
+            delay = random.uniform(base, max(base, previous_delay * 3))
+        elif config.retry_jitter == "full":
+            delay = random.uniform(0, base * (2 ** attempt))
+        else:
+            delay = base * (2 ** attempt)
+
         return min(delay, config.retry_max_delay)
@@ -17,19 +17,61 @@ class KickbaseConfig(BaseSettings):
     # API base URL
     base_url: str = "https://api.kickbase.com/v4"
 
+    # Service account for background jobs that aren't tied to a user request
+    # (e.g., the competition player ingestion in app/players/).
+    # KICKBASE_EMAIL / KICKBASE_PASSWORD - jobs stay off if not set
+    email: str | None = None
+    password: str | None = None
+
     # Request timeout in seconds
     timeout: float = 30.0
 
     # Connection timeout (time to establish connection)
     connect_timeout: float = 10.0
 
+    # Connection pool settings (one pool shared by every KickbaseClient)
+    max_connections: int = 100           # Total open connections to Kickbase
+    max_keepalive_connections: int = 20  # Idle connections kept for reuse
+    keepalive_expiry: float = 30.0       # Close idle connections after N seconds
+    http2: bool = False                  # Multiplex requests over one connection (needs h2)
+
+    # Deadline for aggregate endpoints that fan out to several Kickbase calls
+    # (e.g., the dashboard) - slow calls are cancelled after this many seconds
+    request_deadline: float = 20.0
+
+    # Client-side rate limits per endpoint class, shared by all workers via
+    # Redis (see ratelimit.py): requests per second + burst size
+    rate_limit_enabled: bool = True
+    rate_limit_auth: float = 0.5
+    rate_limit_auth_burst: int = 5
+    rate_limit_league: float = 10.0
+    rate_limit_league_burst: int = 20
+    rate_limit_competition: float = 5.0
+    rate_limit_competition_burst: int = 10
+    rate_limit_max_wait: float = 5.0  # Wait at most this long for a token + concurrency slot, then 429
+
+    # Adaptive concurrency per endpoint class and worker (AIMD, see ratelimit.py)
+    concurrency_initial: int = 10
+    concurrency_min: int = 2
+    concurrency_max: int = 50
+
     # Retry settings
     max_retries: int = 3
-    retry_codes: list[int] = [429, 500, 502, 503, 504]  # HTTP codes that trigger retry
+    retry_codes: list[int] = [429, 500, 502, 503, 504]  # HTTP codes that trigger retry (+ network errors)
 
     # Backoff settings (wait time between retries)
     retry_base_delay: float = 1.0   # Start with 1 second
     retry_max_delay: float = 30.0   # Never wait more than 30 seconds
+    # Randomize delays so workers don't retry in lockstep:
+    # "full" (random 0..exponential), "decorrelated" (based on the previous delay) or "none"
+    retry_jitter: str = "full"
+
+    # Retry budget per worker (see retry.py): retries may add at most
+    # retry_budget_ratio of the requests of the last retry_budget_window
+    # seconds, plus retry_budget_min retries that are always allowed
+    retry_budget_ratio: float = 0.2
+    retry_budget_min: int = 10
+    retry_budget_window: float = 10.0
 
     class Config:
         # Prefix for environment variables
@@ -4,9 +4,10 @@
 class KickbaseError(Exception):
     """Base exception for all Kickbase errors."""
 
-    def __init__(self, message: str, detail: dict | None = None):
+    def __init__(self, message: str, detail: dict | None = None, status_code: int | None = None):
         self.message = message
         self.detail = detail or {}
+        self.status_code = status_code  # HTTP status from Kickbase (None for network errors)
         super().__init__(self.message)
 
 
@@ -40,11 +41,17 @@ class NotFoundError(KickbaseError):
 class RateLimitError(KickbaseError):
     """429 - Too many requests, slow down."""
 
-    def __init__(self, message: str, retry_after: int | None = None, detail: dict | None = None):
-        super().__init__(message, detail)
+    def __init__(self, message: str, retry_after: float | None = None, detail: dict | None = None):
+        super().__init__(message, detail, status_code=429)
         self.retry_after = retry_after  # Seconds to wait before retrying
 
 
+class ClientRateLimitError(RateLimitError):
+    """Our own rate limiter refused to send the request (see ratelimit.py) - not retried."""
+
+    pass
+
+
 class ServerError(KickbaseError):
     """500+ - Kickbase server error."""
 
@@ -10,6 +10,14 @@ from app.kickbase.models.auth import (
     KickbaseLoginResponse,
     KickbaseUser,
 )
+from app.kickbase.models.competition import (
+    KickbaseCompetitionPlayer,
+    KickbaseCompetitionPlayerDetails,
+    KickbaseCompetitionPlayersResponse,
+    KickbasePerformanceMatchday,
+    KickbasePerformanceSeason,
+    KickbasePlayerPerformanceResponse,
+)
 from app.kickbase.models.league import (
     KickbaseLeagueMe,
     KickbaseRankingResponse,
@@ -40,6 +48,13 @@ __all__ = [
     # Squad models
     "KickbaseSquadPlayer",
     "KickbaseSquadResponse",
+    # Competition models (all Bundesliga players)
+    "KickbaseCompetitionPlayer",
+    "KickbaseCompetitionPlayersResponse",
+    "KickbaseCompetitionPlayerDetails",
+    "KickbasePerformanceMatchday",
+    "KickbasePerformanceSeason",
+    "KickbasePlayerPerformanceResponse",
     # Lineup models
     "KickbaseLineupPlayer",
     "KickbaseLineupResponse",
@@ -0,0 +1,85 @@
+"""
+Pydantic models for parsing Kickbase competition (Bundesliga-wide) responses.
+
+These are independent of any league - every player of the competition,
+not just the ones in someone's squad.
+
+For API response models (what we return to frontend), see app/models/
+"""
+
+from pydantic import BaseModel, Field
+
+
+class KickbaseCompetitionPlayer(BaseModel):
+    """Single player from /competitions/{id}/players"""
+    id: str = Field(alias="i")
+    name: str = Field(alias="n")
+    position: int = Field(alias="pos")  # 1=GK, 2=DEF, 3=MID, 4=FWD
+    team_id: str = Field(alias="tid")
+    market_value: int = Field(default=0, alias="mv")
+    market_value_trend: int = Field(default=0, alias="mvt")  # 0=same, 1=up, 2=down
+    total_points: int = Field(default=0, alias="p")
+    avg_points: int = Field(default=0, alias="ap")
+    status: int = Field(default=0, alias="st")  # injury/suspension status
+    profile_image: str = Field(default="", alias="pim")
+
+    model_config = {"populate_by_name": True}
+
+
+class KickbaseCompetitionPlayersResponse(BaseModel):
+    """Response from /competitions/{id}/players"""
+    players: list[KickbaseCompetitionPlayer] = Field(alias="it")
+
+    model_config = {"populate_by_name": True}
+
+
+class KickbaseCompetitionPlayerDetails(BaseModel):
+    """Response from /competitions/{id}/players/{playerId} (one player, more stats)"""
+    id: str = Field(alias="i")
+    first_name: str = Field(default="", alias="fn")
+    last_name: str = Field(default="", alias="ln")
+    shirt_number: int = Field(default=0, alias="shn")
+    team_id: str = Field(alias="tid")
+    team_name: str = Field(default="", alias="tn")
+    position: int = Field(alias="pos")
+    status: int = Field(default=0, alias="st")
+    status_text: str = Field(default="", alias="stxt")  # e.g., injury description
+    market_value: int = Field(default=0, alias="mv")
+    market_value_trend: int = Field(default=0, alias="mvt")
+    market_value_change_24h: int = Field(default=0, alias="tfhmvt")
+    total_points: int = Field(default=0, alias="tp")
+    avg_points: int = Field(default=0, alias="ap")
+
+    # Season stats
+    goals: int = Field(default=0, alias="g")
+    assists: int = Field(default=0, alias="a")
+    yellow_cards: int = Field(default=0, alias="y")
+    red_cards: int = Field(default=0, alias="r")
+    seconds_played: int = Field(default=0, alias="sec")
+    starts: int = Field(default=0, alias="smc")  # starting eleven appearances
+    appearances: int = Field(default=0, alias="mc")
+
+    model_config = {"populate_by_name": True}
+
+
+class KickbasePerformanceMatchday(BaseModel):
+    """One matchday a player played (in /competitions/{id}/players/{playerId}/performance)"""
+    matchday: int = Field(alias="day")
+    points: int = Field(default=0, alias="p")
+
+    model_config = {"populate_by_name": True}
+
+
+class KickbasePerformanceSeason(BaseModel):
+    """Points of one season (matchdays without an appearance are missing)"""
+    season: str = Field(alias="ti")  # e.g., "2025/2026"
+    matchdays: list[KickbasePerformanceMatchday] = Field(default_factory=list, alias="ph")
+
+    model_config = {"populate_by_name": True}
+
+
+class KickbasePlayerPerformanceResponse(BaseModel):
+    """Response from /competitions/{id}/players/{playerId}/performance (oldest season first)"""
+    seasons: list[KickbasePerformanceSeason] = Field(default_factory=list, alias="it")
+
+    model_config = {"populate_by_name": True}
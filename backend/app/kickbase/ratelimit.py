@@ -0,0 +1,294 @@
+"""
+Client-side rate limiting for Kickbase requests.
+
+Retries only react to 429s after Kickbase sent them - under burst load every
+worker hits the limit at once and all of them back off. Two layers keep us
+below the limit instead:
+
+1. Token bucket per endpoint class, shared by all workers via Redis
+   (a Lua script refills and takes tokens atomically, using Redis' clock).
+   Requests wait for a token first.
+
+2. Adaptive concurrency cap per endpoint class (AIMD, per worker):
+   the number of requests in flight grows by ~1 per round of successes and
+   halves on 429/5xx/timeouts - it finds what Kickbase can take right now.
+   With a token, requests wait for a free slot.
+
+Both waits share one deadline: rate_limit_max_wait seconds in total, then
+ClientRateLimitError (-> 429, not retried) is raised without calling Kickbase.
+The token comes first, so no slot sits idle while its holder waits for one.
+
+| Class | Paths | Why separate |
+|-------|-------|--------------|
+| `auth` | `/user/...` | Logins must not be starved by (or starve) data traffic |
+| `competition` | `/competitions/...` | Bulk player data, shared by all users |
+| `league` | everything else | Per-league user data |
+
+If Redis is unavailable, each worker falls back to an in-process bucket with
+the same settings.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from app import metrics
+from app.cache.backend import RedisUnavailable, redis_call
+from app.kickbase.config import config
+from app.kickbase.exceptions import ClientRateLimitError
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_CLASSES = ("auth", "competition", "league")
+
+
+def endpoint_class(path: str) -> str:
+    """Endpoint class of a Kickbase API path."""
+    if path.startswith("/user/"):
+        return "auth"
+    if path.startswith("/competitions/"):
+        return "competition"
+    return "league"
+
+
+def _bucket_settings(name: str) -> tuple[float, int]:
+    """(tokens per second, burst size) of an endpoint class."""
+    return (
+        getattr(config, f"rate_limit_{name}"),
+        getattr(config, f"rate_limit_{name}_burst"),
+    )
+
+
+# --- Token bucket (shared via Redis) ---
+
+# Lua script: refill the bucket for the time passed, then take one token.
+# Returns 0 if a token was taken, otherwise the milliseconds until one is available.
+_TAKE_TOKEN_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class _LocalBucket:
+    """In-process token bucket (fallback while Redis is unavailable)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = float(burst)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token. Returns 0 on success, otherwise seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+# --- Adaptive concurrency (AIMD, per worker) ---
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit that adapts to how Kickbase is doing.
+
+    Additive increase: +1/limit per success (so +1 per "round" of requests).
+    Multiplicative decrease: halved on overload (at most once per round, so a
+    burst of failures from the same round doesn't collapse it to the minimum).
+    """
+
+    def __init__(self, name: str, minimum: int, maximum: int, initial: int):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._last_decrease = 0.0  # time.monotonic()
+
+    async def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Wait until fewer than `limit` requests are in flight, then take a slot.
+
+        Returns:
+            False if no slot became free within `timeout` seconds (None = no limit)
+        """
+        async with self._condition:
+            # Only wait if needed - wait_for() with a ~0 timeout would give up
+            # even when a slot is free
+            if self.in_flight >= int(self.limit):
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self.in_flight < int(self.limit)), timeout
+                    )
+                except asyncio.TimeoutError:
+                    return False
+            self.in_flight += 1
+            return True
+
+    async def release(self) -> None:
+        """Give back a slot."""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_overload(self, round_trip: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < round_trip:
+            return
+        self._last_decrease = now
+
+        previous = int(self.limit)
+        self.limit = max(self.minimum, self.limit / 2)
+        metrics.incr(f"kickbase.concurrency.decrease.{self.name}")
+        logger.info(f"Kickbase {self.name} concurrency limit {previous} -> {int(self.limit)}")
+
+
+class _Permit:
+    """Outcome of a rate-limited request (set .status after the response)."""
+
+    status: int = 0
+
+
+class KickbaseRateLimiter:
+    """Token bucket + adaptive concurrency per endpoint class."""
+
+    def __init__(self):
+        self._local_buckets = {name: _LocalBucket(*_bucket_settings(name)) for name in ENDPOINT_CLASSES}
+        self.concurrency = {
+            name: AdaptiveLimit(
+                name,
+                minimum=config.concurrency_min,
+                maximum=config.concurrency_max,
+                initial=config.concurrency_initial,
+            )
+            for name in ENDPOINT_CLASSES
+        }
+
+    async def _take_token(self, name: str) -> float:
+        """Take a token from the shared bucket. Returns seconds to wait (0 = go)."""
+        rate, burst = _bucket_settings(name)
+        try:
+            async with redis_call() as redis_client:
+                wait_ms = await redis_client.eval(
+                    _TAKE_TOKEN_SCRIPT, 1, f"ratelimit:kickbase:{name}", rate, burst
+                )
+            return wait_ms / 1000
+        except RedisUnavailable:
+            pass
+        except Exception as e:
+            logger.warning(f"Rate limiter Redis error (using per-worker limit): {e}")
+        return self._local_buckets[name].take()
+
+    async def _wait_for_token(self, name: str, give_up_at: float) -> None:
+        """
+        Wait until the endpoint class has a token.
+
+        Args:
+            give_up_at: Event loop time after which waiting is pointless
+
+        Raises:
+            ClientRateLimitError: No token before give_up_at
+        """
+        loop = asyncio.get_running_loop()
+        waited = False
+
+        while True:
+            wait = await self._take_token(name)
+            if wait <= 0:
+                return
+
+            if not waited:
+                waited = True
+                metrics.incr(f"kickbase.ratelimit.waited.{name}")
+
+            if loop.time() + wait > give_up_at:
+                metrics.incr(f"kickbase.ratelimit.rejected.{name}")
+                raise ClientRateLimitError(
+                    f"Client-side rate limit for {name} requests exceeded",
+                    retry_after=max(1, round(wait)),
+                )
+
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def limit(self, path: str) -> AsyncIterator[_Permit]:
+        """
+        Take a token, then hold a concurrency slot for one request.
+
+        Usage:
+            async with rate_limiter.limit(path) as permit:
+                response = await http_client.request(...)
+                permit.status = response.status_code
+
+        Raises:
+            ClientRateLimitError: No token and slot within rate_limit_max_wait seconds
+        """
+        name = endpoint_class(path)
+        if not config.rate_limit_enabled:
+            yield _Permit()
+            return
+
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + config.rate_limit_max_wait
+        await self._wait_for_token(name, give_up_at)
+
+        concurrency = self.concurrency[name]
+        if not await concurrency.acquire(timeout=max(0.0, give_up_at - loop.time())):
+            metrics.incr(f"kickbase.concurrency.rejected.{name}")
+            raise ClientRateLimitError(
+                f"No free concurrency slot for {name} requests (limit {int(concurrency.limit)})",
+                retry_after=1,
+            )
+        try:
+            permit = _Permit()
+            started = time.monotonic()
+            timed_out = False
+            try:
+                yield permit
+            except httpx.TimeoutException:
+                timed_out = True
+                raise
+            finally:
+                # Also when the caller raised for the status (e.g., 429 -> RateLimitError)
+                if timed_out or permit.status == 429 or permit.status >= 500:
+                    concurrency.on_overload(time.monotonic() - started)
+                elif permit.status:
+                    concurrency.on_success()
+        finally:
+            await concurrency.release()
+
+
+# Global instance - one per worker process
+rate_limiter = KickbaseRateLimiter()
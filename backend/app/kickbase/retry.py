@@ -0,0 +1,93 @@
+"""
+Retry helpers for the Kickbase client.
+
+- Retry-After parsing (both forms from RFC 9110: seconds and HTTP-date)
+- Process-wide retry budget: retries may only add a fraction of the recent
+  request volume. When Kickbase is down, every request would otherwise be
+  sent max_retries + 1 times - a retry storm that keeps it down longer.
+"""
+
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from app import metrics
+from app.kickbase.config import config
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header into seconds to wait.
+
+    Accepts delay-seconds ("120") and HTTP-dates ("Wed, 21 Oct 2015 07:28:00 GMT").
+
+    Returns:
+        Seconds (>= 0), or None if missing or unparseable
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent requests (sliding window).
+
+    Allows `min_retries` retries per window no matter what (so a quiet worker
+    can still retry), plus `ratio` retries per request sent in the window.
+
+    Not thread-safe - meant for use from one asyncio event loop.
+    """
+
+    def __init__(self, ratio: float, min_retries: int, window: float):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque[float] = deque()  # time.monotonic() of each request
+        self._retries: deque[float] = deque()   # ...and of each retry
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self) -> None:
+        """Count a new (first-attempt) request."""
+        now = time.monotonic()
+        self._prune(now)
+        self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget. Returns False if it's used up."""
+        now = time.monotonic()
+        self._prune(now)
+
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+            metrics.incr("kickbase.retry.budget_exhausted")
+            return False
+
+        self._retries.append(now)
+        return True
+
+
+# Global budget - one per worker process
+retry_budget = RetryBudget(
+    ratio=config.retry_budget_ratio,
+    min_retries=config.retry_budget_min,
+    window=config.retry_budget_window,
+)
@@ -4,9 +4,17 @@ Cached data fetching services for Kickbase API.
 This module provides cached wrappers around KickbaseClient methods.
 Each function fetches data from a single Kickbase endpoint and caches the result.
 
+Responses are validated straight from the raw bytes (client.get_model) or,
+for bodies with one long array, item by item while they download
+(client.get_streamed) - no intermediate dict of the whole response.
+
 The @cached decorator handles caching automatically:
-- Cache key is generated from function name + arguments (excluding 'token')
+- Cache key is generated from function name + arguments (never the 'token')
+- scope="league": shared by all members of a league (e.g., ranking)
+- scope="user": per user - keyed by a hashed user identity, not the raw token
 - If Redis is unavailable, functions still work (just without caching)
+- stale_ttl: after ttl, stale data is served instantly while a background refresh runs
+- early_refresh: refreshes are randomly started a bit before expiry (spreads load)
 
 Usage:
     from app.kickbase.services import get_squad
@@ -26,7 +34,7 @@ from app.kickbase.models import (
 )
 
 
-@cached(ttl=300)  # 5 minutes
+@cached(ttl=300, scope="user")  # 5 minutes
 async def get_league_me(league_id: str, token: str) -> KickbaseLeagueMe:
     """
     Get user's league info (budget, team composition).
@@ -34,11 +42,10 @@ async def get_league_me(league_id: str, token: str) -> KickbaseLeagueMe:
     Kickbase endpoint: GET /leagues/{league_id}/me
     """
     client = KickbaseClient(token=token)
-    data = await client.get(f"/leagues/{league_id}/me")
-    return KickbaseLeagueMe.model_validate(data)
+    return await client.get_model(f"/leagues/{league_id}/me", KickbaseLeagueMe)
 
 
-@cached(ttl=300)  # 5 minutes
+@cached(ttl=300, stale_ttl=600, early_refresh=1.0, scope="league")  # 5 minutes (+10 min stale)
 async def get_ranking(league_id: str, token: str) -> KickbaseRankingResponse:
     """
     Get league standings/rankings.
@@ -47,11 +54,11 @@ async def get_ranking(league_id: str, token: str) -> KickbaseRankingResponse:
     Returns: All managers with their points, team value, placement.
     """
     client = KickbaseClient(token=token)
-    data = await client.get(f"/leagues/{league_id}/ranking")
-    return KickbaseRankingResponse.model_validate(data)
+    # Big leagues have long rankings - validate users while they download
+    return await client.get_streamed(f"/leagues/{league_id}/ranking", KickbaseRankingResponse, "us")
 
 
-@cached(ttl=300)  # 5 minutes
+@cached(ttl=300, stale_ttl=600, early_refresh=1.0, scope="user")  # 5 minutes (+10 min stale)
 async def get_squad(league_id: str, token: str) -> KickbaseSquadResponse:
     """
     Get user's squad (all owned players).
@@ -60,11 +67,10 @@ async def get_squad(league_id: str, token: str) -> KickbaseSquadResponse:
     Returns: All players with market value, points, position, etc.
     """
     client = KickbaseClient(token=token)
-    data = await client.get(f"/leagues/{league_id}/squad")
-    return KickbaseSquadResponse.model_validate(data)
+    return await client.get_streamed(f"/leagues/{league_id}/squad", KickbaseSquadResponse, "it")
 
 
-@cached(ttl=60)  # 1 minute (lineup changes more often)
+@cached(ttl=60, stale_ttl=120, early_refresh=1.0, scope="user")  # 1 minute (lineup changes more often, +2 min stale)
 async def get_lineup(league_id: str, token: str) -> KickbaseLineupResponse:
     """
     Get user's current lineup.
@@ -73,5 +79,4 @@ async def get_lineup(league_id: str, token: str) -> KickbaseLineupResponse:
     Returns: All players with lineup_order (None = bench, 0-10 = starting).
     """
     client = KickbaseClient(token=token)
-    data = await client.get(f"/leagues/{league_id}/lineup")
-    return KickbaseLineupResponse.model_validate(data)
+    return await client.get_model(f"/leagues/{league_id}/lineup", KickbaseLineupResponse)
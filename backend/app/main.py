@@ -18,7 +18,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from app.api import auth_router, dashboard_router, public_router
+from app.api import admin_router, auth_router, dashboard_router, players_router, public_router
 
 # --- Logging Configuration ---
 # LOG_LEVEL env var controls verbosity: DEBUG (dev) or INFO (prod)
@@ -36,7 +36,25 @@ from app.kickbase import (
     KickbaseError,
     NotFoundError,
     RateLimitError,
+    close_http_client,
+    open_http_client,
 )
+from app import metrics
+from app.cache import (
+    check_key_secret,
+    close_redis,
+    open_redis,
+    redis_breaker,
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+from app.fanout import DeadlineExceeded
+from app.http_compression import CompressionMiddleware
+from app.responses import FastJSONResponse
+from app.warmer import start_warmer, stop_warmer
+from app.players import start_ingestion, stop_ingestion
+from app.openliga import close_http_client as close_openliga_client
+from app.openliga import open_http_client as open_openliga_client
 from app.openliga.exceptions import OpenLigaError
 
 # --- Lifespan (startup/shutdown) ---
@@ -44,8 +62,21 @@ from app.openliga.exceptions import OpenLigaError
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     logger.info(f"Backend starting up (log_level={log_level})")
+    check_key_secret()
+    await open_http_client()
+    await open_openliga_client()
+    await open_redis()
+    await start_invalidation_listener()
+    await start_warmer()
+    await start_ingestion()
     yield
     logger.info("Backend shutting down")
+    await stop_ingestion()
+    await stop_warmer()
+    await stop_invalidation_listener()
+    await close_redis()
+    await close_http_client()
+    await close_openliga_client()
 
 
 # Create the FastAPI application
@@ -55,8 +86,14 @@ app = FastAPI(
     description="Backend for Kickbase fantasy football analytics",
     version="0.1.0",
     lifespan=lifespan,
+    # JSON via pydantic-core instead of json.dumps (see app/responses.py)
+    default_response_class=FastJSONResponse,
 )
 
+# gzip/brotli for responses above the size threshold (precompressed snapshots
+# pass through untouched - see app/http_compression.py)
+app.add_middleware(CompressionMiddleware)
+
 # --- Global Exception Handlers ---
 # These catch exceptions from ANY endpoint, so we don't repeat try/except everywhere
 
@@ -121,13 +158,25 @@ async def openliga_error_handler(request: Request, exc: OpenLigaError):
     )
 
 
+@app.exception_handler(DeadlineExceeded)
+async def deadline_handler(request: Request, exc: DeadlineExceeded):
+    """Handle 504 - upstream calls took longer than the request deadline."""
+    logger.error(f"Deadline exceeded on {request.method} {request.url.path}: {exc.message}")
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "Upstream request took too long. Try again later."}
+    )
+
+
 # --- Routers ---
 # Include routers from api/ folder
 # tags=[] groups endpoints in Swagger UI
 # prefix="" adds URL prefix (e.g., /api/dashboard)
 app.include_router(auth_router, tags=["auth"])
 app.include_router(dashboard_router, prefix="/api", tags=["dashboard"])
+app.include_router(players_router, prefix="/api", tags=["players"])
 app.include_router(public_router, prefix="/api", tags=["public"])
+app.include_router(admin_router, prefix="/api", tags=["admin"])
 
 
 # --- Health Check ---
@@ -135,3 +184,9 @@ app.include_router(public_router, prefix="/api", tags=["public"])
 async def health_check():
     """Check if the API is running."""
     return {"status": "ok"}
+
+
+@app.get("/health/metrics")
+async def metrics_snapshot():
+    """In-process counters of this worker (cache hits, 304s, etc.)."""
+    return {**metrics.snapshot(), "redis.circuit": redis_breaker.state}
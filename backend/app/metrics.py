@@ -0,0 +1,47 @@
+"""
+In-process metrics counters.
+
+Simple named counters for things we want to observe (cache hits, 304s, etc.).
+Counters are per worker process - each uvicorn worker keeps its own numbers.
+
+Usage:
+    from app import metrics
+
+    metrics.incr("openliga.responses.304")
+    metrics.incr("openliga.bytes_saved", len(body))
+
+    metrics.snapshot()  # {"openliga.responses.304": 12, ...}
+"""
+
+from collections import defaultdict
+
+_counters: dict[str, int] = defaultdict(int)
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """Increase a counter (created on first use)."""
+    _counters[name] += amount
+
+
+def get(name: str) -> int:
+    """Get the current value of a counter (0 if never used)."""
+    return _counters.get(name, 0)
+
+
+def snapshot(prefix: str = "") -> dict[str, int]:
+    """
+    Get a copy of all counters, sorted by name.
+
+    Args:
+        prefix: Only include counters starting with this (e.g., "cache.")
+    """
+    return {
+        name: value
+        for name, value in sorted(_counters.items())
+        if name.startswith(prefix)
+    }
+
+
+def reset() -> None:
+    """Reset all counters (useful in notebooks)."""
+    _counters.clear()
@@ -17,6 +17,7 @@ from app.models.dashboard import (
     DashboardResponse,
     PlayerSummary,
 )
+from app.models.players import PlayerListResponse
 from app.models.public import (
     BundesligaTableResponse,
     TeamStanding,
@@ -33,6 +34,8 @@ __all__ = [
     "DashboardOverview",
     "DashboardLineup",
     "PlayerSummary",
+    # Players
+    "PlayerListResponse",
     # Public
     "BundesligaTableResponse",
     "TeamStanding",
@@ -23,6 +23,16 @@ class PlayerSummary(BaseModel):
     total_points: int
     avg_points: float
     euros_per_point: float | None  # None if avg_points is 0
+    points_per_million: float | None = None  # total points per 1M market value (None if no market value)
+
+    # From the player database (app/players/stats.py) - None if unknown
+    market_value_change_pct: float | None = None  # market value change in the last 24h, in %
+    market_value_change_1d_pct: float | None = None  # from the market value history (app/players/history.py)
+    market_value_change_7d_pct: float | None = None
+    market_value_change_30d_pct: float | None = None
+    form: float | None = None  # avg points of the last 5 appearances
+    form_trend: float | None = None  # form - season average (> 0 = in form)
+    points_std: float | None = None  # standard deviation of matchday points (lower = steadier)
 
 
 class DashboardOverview(BaseModel):
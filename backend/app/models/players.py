@@ -0,0 +1,38 @@
+"""
+API response models for the player database endpoints (Market > Players).
+
+These are the clean models returned to the frontend.
+"""
+
+from datetime import date
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.models.dashboard import PlayerSummary
+
+
+class PlayerListResponse(BaseModel):
+    """Response for GET /api/players"""
+
+    total: int  # players matching the filters (all pages)
+    offset: int
+    limit: int
+    players: list[PlayerSummary]
+
+
+class MarketValuePoint(BaseModel):
+    """Market value of one day (daily) or week (weekly, dated by its Monday)."""
+
+    date: date
+    market_value: int  # value of the day / last value of the week
+    low: int  # lowest value of the period (daily: = market_value)
+    high: int  # highest value of the period (daily: = market_value)
+
+
+class MarketValueHistoryResponse(BaseModel):
+    """Response for GET /api/players/{player_id}/market-value"""
+
+    player_id: str
+    resolution: Literal["daily", "weekly"]
+    points: list[MarketValuePoint]  # oldest first
@@ -11,6 +11,6 @@ Usage:
         print(f"{team.short_name}: {team.points} pts")
 """
 
-from app.openliga.client import OpenLigaClient
+from app.openliga.client import OpenLigaClient, close_http_client, open_http_client
 
-__all__ = ["OpenLigaClient"]
+__all__ = ["OpenLigaClient", "open_http_client", "close_http_client"]
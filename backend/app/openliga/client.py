@@ -3,13 +3,19 @@ Async HTTP client for OpenLigaDB API.
 
 Simpler than Kickbase client - no authentication required.
 Includes retry logic with exponential backoff.
+
+All clients share one pooled httpx client, and each endpoint remembers its
+ETag / Last-Modified validators so unchanged data is answered with a cheap 304.
 """
 
 import logging
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
 
 import httpx
 
+from app import metrics
 from app.openliga.config import settings
 from app.openliga.exceptions import (
     NetworkError,
@@ -21,6 +27,76 @@ from app.openliga.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Shared connection pool (opened in main.py lifespan, reused by every OpenLigaClient)
+_http_client: httpx.AsyncClient | None = None
+
+
+@dataclass
+class _Revalidation:
+    """Validators + parsed body of the last 200 response for one endpoint."""
+
+    etag: str | None
+    last_modified: str | None
+    value: Any
+
+
+# endpoint -> last known validators and parsed data, least recently used first.
+# Endpoints contain request input (e.g. the season), so the number kept is capped.
+_revalidation: OrderedDict[str, _Revalidation] = OrderedDict()
+
+
+def _remember(endpoint: str, revalidation: _Revalidation) -> None:
+    """Store an endpoint's validators, evicting the least recently used beyond the cap."""
+    _revalidation[endpoint] = revalidation
+    _revalidation.move_to_end(endpoint)
+    while len(_revalidation) > settings.max_revalidation_entries:
+        _revalidation.popitem(last=False)
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Build the pooled httpx client from OpenLigaSettings."""
+    return httpx.AsyncClient(
+        timeout=settings.timeout,
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the shared connection pool (called on startup)."""
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+        logger.info("OpenLigaDB connection pool opened")
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared connection pool (called on shutdown)."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("OpenLigaDB connection pool closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared connection pool (created lazily outside the app lifespan)."""
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+
+    return _http_client
+
 
 class OpenLigaClient:
     """
@@ -31,6 +107,9 @@ class OpenLigaClient:
     Usage:
         client = OpenLigaClient()
         table = await client.get("/getbltable/bl1/2024")
+
+        # With revalidation: parse() only runs when the data actually changed
+        table = await client.get_parsed("/getbltable/bl1/2024", parse=parse_table)
     """
 
     def __init__(self):
@@ -54,14 +133,70 @@ class OpenLigaClient:
             NetworkError: Connection failed
             TimeoutError: Request timed out
         """
+        response = await self._request_with_retry(endpoint)
+        return response.json()
+
+    async def get_parsed(self, endpoint: str, parse: Callable[[Any], T]) -> T:
+        """
+        Make a conditional GET request and parse the JSON body.
+
+        Sends If-None-Match / If-Modified-Since from the last successful response.
+        On 304 Not Modified, the previously parsed value is returned as-is
+        (no download, no JSON decoding, no model validation).
+
+        Args:
+            endpoint: API endpoint (e.g., "/getbltable/bl1/2024")
+            parse: Turns the JSON body into the value to return (e.g., a list of models)
+
+        Returns:
+            Result of parse() - either fresh or reused from the last 200 response
+        """
+        previous = _revalidation.get(endpoint) if settings.conditional_requests else None
+
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        response = await self._request_with_retry(endpoint, headers=headers)
+
+        if response.status_code == 304 and previous is not None:
+            logger.debug(f"OpenLigaDB not modified: {endpoint}")
+            if endpoint in _revalidation:
+                _revalidation.move_to_end(endpoint)
+            metrics.incr("openliga.responses.304")
+            return previous.value
+
+        metrics.incr("openliga.responses.200")
+        metrics.incr("openliga.bytes_downloaded", len(response.content))
+
+        value = parse(response.json())
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if settings.conditional_requests and (etag or last_modified):
+            _remember(endpoint, _Revalidation(etag, last_modified, value))
+
+        return value
+
+    async def _request_with_retry(
+        self, endpoint: str, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        """
+        Make GET request with retry on timeouts and network errors.
+
+        Returns the raw response (2xx or 304), raises for error statuses.
+        """
         url = f"{self.base_url}{endpoint}"
 
         for attempt in range(self.max_retries):
             try:
                 logger.debug(f"OpenLigaDB request: GET {endpoint} (attempt {attempt + 1})")
 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url)
+                client = get_http_client()
+                response = await client.get(url, headers=headers)
 
                 # Handle HTTP errors
                 if response.status_code == 404:
@@ -71,7 +206,7 @@ class OpenLigaClient:
                 elif response.status_code >= 400:
                     raise OpenLigaError(f"HTTP {response.status_code}: {response.text}")
 
-                return response.json()
+                return response
 
             except httpx.TimeoutException:
                 logger.warning(f"OpenLigaDB timeout (attempt {attempt + 1}/{self.max_retries})")
@@ -15,12 +15,23 @@ class OpenLigaSettings(BaseSettings):
     Override via environment variables prefixed with OPENLIGA_:
         OPENLIGA_BASE_URL=https://api.openligadb.de
         OPENLIGA_TIMEOUT=30
+        OPENLIGA_CONDITIONAL_REQUESTS=false
     """
 
     base_url: str = "https://api.openligadb.de"
     timeout: int = 30  # seconds
     max_retries: int = 3
 
+    # Connection pool (shared by every OpenLigaClient)
+    max_connections: int = 20
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0  # seconds
+
+    # Send If-None-Match / If-Modified-Since and reuse parsed data on 304
+    conditional_requests: bool = True
+    # Endpoints whose validators are kept (least recently used are dropped)
+    max_revalidation_entries: int = 256
+
     model_config = {"env_prefix": "OPENLIGA_"}
 
 
@@ -9,6 +9,11 @@ from app.openliga.client import OpenLigaClient
 from app.openliga.models import OpenLigaTeamStanding
 
 
+def _parse_table(data: list[dict]) -> list[OpenLigaTeamStanding]:
+    """Parse each team into Pydantic model."""
+    return [OpenLigaTeamStanding.model_validate(team) for team in data]
+
+
 @cached(ttl=1200)  # 20 minutes - table doesn't change often
 async def get_bundesliga_table(season: str = "2024") -> list[OpenLigaTeamStanding]:
     """
@@ -21,7 +26,7 @@ async def get_bundesliga_table(season: str = "2024") -> list[OpenLigaTeamStandin
         List of team standings, ordered by position
     """
     client = OpenLigaClient()
-    data = await client.get(f"/getbltable/bl1/{season}")
 
-    # Parse each team into Pydantic model
-    return [OpenLigaTeamStanding.model_validate(team) for team in data]
+    # Conditional GET: if the table hasn't changed (304), the previously
+    # parsed standings are reused without downloading or re-parsing
+    return await client.get_parsed(f"/getbltable/bl1/{season}", parse=_parse_table)
@@ -0,0 +1,42 @@
+"""
+Competition player database.
+
+All players of the competition (not just one league's squads), ingested
+periodically from Kickbase into a local Parquet file, so filter/sort
+queries for the Market > Players page run locally instead of per request.
+
+Usage:
+    from app.players import PlayerQuery, get_player_index, get_player_table
+
+    players = get_player_table()  # pandas DataFrame, None until first ingestion
+    page = get_player_index().query(PlayerQuery(positions=[3], sort="euros_per_point"))
+    chart = get_market_value_history().series(player_id, start=to_day("2026-09-01"), resolution="weekly")
+"""
+
+from app.players.config import PlayersSettings, settings
+from app.players.history import MarketValueHistory, MarketValueStore, get_market_value_history, to_day
+from app.players.ingest import ingest_once, start_ingestion, stop_ingestion
+from app.players.query import PlayerIndex, PlayerPage, PlayerQuery, get_player_index
+from app.players.stats import PlayerStats, compute_player_stats, get_player_stats
+from app.players.store import PlayerStore, get_player_table
+
+__all__ = [
+    "get_player_table",
+    "get_player_index",
+    "get_player_stats",
+    "get_market_value_history",
+    "MarketValueHistory",
+    "MarketValueStore",
+    "to_day",
+    "compute_player_stats",
+    "PlayerStats",
+    "PlayerIndex",
+    "PlayerQuery",
+    "PlayerPage",
+    "ingest_once",
+    "start_ingestion",
+    "stop_ingestion",
+    "PlayerStore",
+    "PlayersSettings",
+    "settings",
+]
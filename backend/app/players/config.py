@@ -0,0 +1,48 @@
+"""
+Configuration for the competition player database.
+
+Uses pydantic-settings to load from environment variables.
+"""
+
+from pydantic_settings import BaseSettings
+
+
+class PlayersSettings(BaseSettings):
+    """
+    Player database settings.
+
+    Override via environment variables prefixed with PLAYERS_:
+        PLAYERS_ENABLED=true
+        PLAYERS_DATA_DIR=/var/lib/kickbase
+    """
+
+    # Opt-in: ingestion runs a background job with many upstream calls. It
+    # also needs the Kickbase service account (KICKBASE_EMAIL/PASSWORD)
+    enabled: bool = False
+
+    # Kickbase competition to ingest (1 = Bundesliga)
+    competition_id: str = "1"
+
+    # Folder of the Parquet files (shared by all workers of a container)
+    data_dir: str = "data"
+
+    # Seconds between ingestion runs. Market values change once a day,
+    # points during matchdays - hourly keeps both reasonably fresh
+    ingest_interval: float = 60 * 60.0
+
+    # Workers check this often whether a run is due - also the retry delay
+    # after a failed run
+    check_interval: float = 5 * 60.0
+
+    # Per-player details (goals, minutes, ...) are refetched after this many
+    # seconds, at most details_per_run players per run (oldest first), so one
+    # run never floods the competition rate limit
+    details_max_age: float = 24 * 60 * 60.0
+    details_per_run: int = 200
+    details_concurrency: int = 4
+
+    model_config = {"env_prefix": "PLAYERS_"}
+
+
+# Singleton instance
+settings = PlayersSettings()
@@ -0,0 +1,326 @@
+"""
+Market value history of all competition players.
+
+Kickbase only tells us today's market value (and a coarse trend arrow). Every
+ingestion run records the value of every player for the current day, so
+trends and price charts come from local data instead of one upstream call
+per player.
+
+Storage is append-only: one Parquet file per day in market_values/
+(`2026-10-18.parquet`: `player_id`, `market_value`). Runs during the day
+replace that day's file (last value of the day wins); earlier days are never
+touched. Readers reload only files that changed since their last load.
+
+In memory (MarketValueHistory), all snapshots are one array per column,
+sorted by (player, day) - each player's history is a contiguous slice:
+
+    player_ids  [p1, p2, ...]                       sorted, for binary search
+    offsets     [0, 210, 415, ...]                  slice of player i: offsets[i]:offsets[i+1]
+    days        [20100, 20101, ..., 20100, ...]     days since 1970-01-01
+    values      [5_200_000, 5_310_000, ...]
+
+| Query | Cost |
+|-------|------|
+| `series(player, start, end)` - one player's range, daily or weekly | O(log n) (binary searches) |
+| `values_at(players, day)` - value of many players on one day | one searchsorted for all |
+| `changes(players)` - % change over 1/7/30 days (trend badges) | two values_at() |
+
+Weekly rollups (last/low/high value per Monday-based week) are built
+once per load with the same layout.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.players.store import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+MARKET_VALUES_DIR = "market_values"
+
+RESOLUTIONS = ("daily", "weekly")
+
+# Periods of the trend badges (days back from the latest snapshot)
+TREND_PERIODS = {
+    "market_value_change_1d_pct": 1,
+    "market_value_change_7d_pct": 7,
+    "market_value_change_30d_pct": 30,
+}
+
+# 1970-01-01 (day 0) was a Thursday - shift so weeks start on Monday
+_WEEK_SHIFT = 3
+
+
+def to_day(value: str | np.datetime64 | float) -> int:
+    """A date ("2026-10-18", datetime64) or Unix timestamp -> days since 1970-01-01."""
+    if isinstance(value, (int, float)):
+        return int(value // 86400)
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+
+@dataclass
+class MarketValueSeries:
+    """One player's values in a date range (weekly: one row per week, dated by its Monday)."""
+
+    days: np.ndarray    # days since 1970-01-01
+    values: np.ndarray  # value of the day / last value of the week
+    low: np.ndarray     # lowest value of the period (daily: = values)
+    high: np.ndarray    # highest value of the period (daily: = values)
+
+    def dates(self) -> np.ndarray:
+        """days as datetime64[D]."""
+        return self.days.astype("datetime64[D]")
+
+
+@dataclass
+class _Rollup:
+    """Per-player slices of one resolution (see the module docstring)."""
+
+    offsets: np.ndarray
+    days: np.ndarray
+    values: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+
+def _weekly(rows: np.ndarray, days: np.ndarray, values: np.ndarray, players: int) -> _Rollup:
+    """Roll daily snapshots (sorted by row, day) up into weeks."""
+    weeks = (days + _WEEK_SHIFT) // 7
+    new_group = np.ones(len(days), dtype=bool)
+    new_group[1:] = (rows[1:] != rows[:-1]) | (weeks[1:] != weeks[:-1])
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], len(days)) - 1
+
+    if len(starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return _Rollup(np.zeros(players + 1, dtype=np.int64), empty, empty, empty, empty)
+
+    group_rows = rows[starts]
+    return _Rollup(
+        offsets=np.searchsorted(group_rows, np.arange(players + 1)),
+        days=weeks[starts] * 7 - _WEEK_SHIFT,
+        values=values[ends],
+        low=np.minimum.reduceat(values, starts),
+        high=np.maximum.reduceat(values, starts),
+    )
+
+
+class MarketValueHistory:
+    """All snapshots, array-backed per player (see the module docstring)."""
+
+    def __init__(self, player_ids: np.ndarray, days: np.ndarray, values: np.ndarray):
+        """
+        Args:
+            player_ids, days, values: One entry per snapshot, any order
+                (one value per player and day)
+        """
+        self.player_ids, rows = np.unique(np.asarray(player_ids, dtype=object), return_inverse=True)
+        days = np.asarray(days, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+
+        order = np.lexsort((days, rows))
+        rows, days, values = rows[order], days[order], values[order]
+
+        players = len(self.player_ids)
+        self._daily = _Rollup(
+            offsets=np.searchsorted(rows, np.arange(players + 1)),
+            days=days,
+            values=values,
+            low=values,
+            high=values,
+        )
+        self._weekly = _weekly(rows, days, values, players)
+
+        # (row, day) as one sortable key: finds "last snapshot <= day" of many players at once
+        self._keys = (rows.astype(np.int64) << 32) | days
+        self.latest_day = int(days.max()) if len(days) else None
+
+    def __len__(self) -> int:
+        return len(self._daily.days)
+
+    def _rows(self, player_ids: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Rows of the given players + mask of the known ones."""
+        player_ids = np.asarray(list(player_ids), dtype=object)
+        rows = np.searchsorted(self.player_ids, player_ids)
+
+        known = np.zeros(len(rows), dtype=bool)
+        inside = rows < len(self.player_ids)
+        known[inside] = self.player_ids[rows[inside]] == player_ids[inside]
+        return np.where(known, rows, 0), known
+
+    def series(
+        self,
+        player_id: str,
+        start: int | None = None,
+        end: int | None = None,
+        resolution: str = "daily",
+    ) -> MarketValueSeries | None:
+        """
+        One player's values between two days (inclusive, None = open end).
+
+        Returns:
+            The series (maybe empty), or None if the player has no history
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution '{resolution}' (expected one of {RESOLUTIONS})")
+
+        rows, known = self._rows([player_id])
+        if not known[0]:
+            return None
+
+        rollup = self._daily if resolution == "daily" else self._weekly
+        begin, stop = rollup.offsets[rows[0]], rollup.offsets[rows[0] + 1]
+        days = rollup.days[begin:stop]
+
+        if resolution == "weekly" and start is not None:
+            # The week containing `start` is included
+            start -= (start + _WEEK_SHIFT) % 7
+        first = begin + (0 if start is None else int(np.searchsorted(days, start, side="left")))
+        last = begin + (len(days) if end is None else int(np.searchsorted(days, end, side="right")))
+
+        return MarketValueSeries(
+            days=rollup.days[first:last],
+            values=rollup.values[first:last],
+            low=rollup.low[first:last],
+            high=rollup.high[first:last],
+        )
+
+    def values_at(self, player_ids: Iterable[str], day: int) -> np.ndarray:
+        """
+        Value of each player on a day (its latest snapshot up to that day).
+
+        Returns:
+            float array, NaN for unknown players or no snapshot that early
+        """
+        rows, known = self._rows(player_ids)
+        positions = np.searchsorted(self._keys, (rows.astype(np.int64) << 32) | day, side="right") - 1
+
+        # The found snapshot must belong to the same player
+        valid = known & (positions >= self._daily.offsets[rows])
+        result = np.full(len(rows), np.nan)
+        result[valid] = self._daily.values[positions[valid]]
+        return result
+
+    def changes(self, player_ids: Iterable[str], day: int | None = None) -> dict[str, np.ndarray]:
+        """
+        % change of each player's value over TREND_PERIODS, up to a day.
+
+        Args:
+            day: Reference day (None = latest snapshot)
+
+        Returns:
+            One float array per TREND_PERIODS key (NaN without enough history)
+        """
+        player_ids = list(player_ids)
+        if day is None:
+            day = self.latest_day
+        if day is None:
+            return {key: np.full(len(player_ids), np.nan) for key in TREND_PERIODS}
+
+        current = self.values_at(player_ids, day)
+        result = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for key, period in TREND_PERIODS.items():
+                before = self.values_at(player_ids, day - period)
+                result[key] = np.where(before > 0, (current - before) / before * 100, np.nan)
+        return result
+
+
+class MarketValueStore:
+    """Day files of market value snapshots (see the module docstring)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._history: MarketValueHistory | None = None
+        self._mtime_ns = 0
+        # Day file -> (mtime_ns, player_ids, values), so a reload only reads changed files
+        self._files: dict[str, tuple[int, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def version(self) -> int:
+        """Changes whenever new snapshots are loaded (0 = nothing loaded)."""
+        return self._mtime_ns
+
+    def append(self, market_values: pd.DataFrame, day: int) -> None:
+        """
+        Store the snapshot of a day (replaces an earlier one of the same day, atomically).
+
+        Args:
+            market_values: Columns `id` (player ID) and `market_value`
+        """
+        table = pa.table(
+            {
+                "player_id": pa.array(market_values["id"].to_numpy(), type=pa.string()),
+                "market_value": pa.array(market_values["market_value"].to_numpy(), type=pa.int64()),
+            }
+        )
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        file_path = self.path / f"{np.datetime64(day, 'D')}.parquet"
+        tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, file_path)
+
+    def load(self) -> MarketValueHistory | None:
+        """
+        All snapshots.
+
+        Returns:
+            The history, or None if nothing was recorded yet
+        """
+        try:
+            # Writing a day file (os.replace) updates the folder's mtime
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        if self._history is not None and mtime_ns == self._mtime_ns:
+            return self._history
+
+        files = {}
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith(".parquet"):
+                continue
+            file_mtime = entry.stat().st_mtime_ns
+            cached = self._files.get(entry.name)
+            if cached is None or cached[0] != file_mtime:
+                table = pq.read_table(entry.path, memory_map=True)
+                cached = (
+                    file_mtime,
+                    table.column("player_id").to_numpy(zero_copy_only=False),
+                    table.column("market_value").to_numpy(),
+                )
+            files[entry.name] = cached
+        self._files = files
+
+        if not files:
+            return None
+
+        days = [to_day(name.removesuffix(".parquet")) for name in files]
+        ids = [player_ids for _, player_ids, _ in files.values()]
+        values = [file_values for _, _, file_values in files.values()]
+        self._history = MarketValueHistory(
+            np.concatenate(ids),
+            np.repeat(days, [len(file_ids) for file_ids in ids]),
+            np.concatenate(values),
+        )
+        self._mtime_ns = mtime_ns
+        logger.info(f"Loaded market value history: {len(files)} days, {len(self._history)} snapshots")
+        return self._history
+
+
+# Global store of the configured competition
+history_store = MarketValueStore(DATA_DIR / MARKET_VALUES_DIR)
+
+
+def get_market_value_history() -> MarketValueHistory | None:
+    """Market value history of the configured competition (None until the first snapshot)."""
+    return history_store.load()
@@ -0,0 +1,263 @@
+"""
+Periodic ingestion of all competition players into the local store.
+
+Each run:
+1. Logs in with the service account (KICKBASE_EMAIL / KICKBASE_PASSWORD)
+2. Fetches /competitions/{id}/players (every player, streamed)
+3. Fetches /competitions/{id}/players/{playerId} (details) and .../performance
+   (points per matchday) for the players whose details are oldest - at most
+   details_per_run, details_concurrency at a time
+4. Merges everything (keeping older details/points of players not refetched
+   this run) and replaces the Parquet files (see store.py). The points file
+   is only rewritten if it changed, so it stays the same between matchdays
+   (and so do the form metrics cached on it, see stats.py)
+5. Records today's market value of every player (see history.py)
+
+Only one worker ingests per interval: every check_interval, each worker
+tries to claim a Redis key (lock:players:ingest, TTL = ingest_interval)
+with SET NX. The others just pick up the new file. A failed run deletes
+the key again, so it's retried at the next check. If Redis is down, every
+worker ingests on its own.
+"""
+
+import asyncio
+import logging
+import time
+
+import pandas as pd
+
+from app import metrics
+from app.cache import RedisUnavailable, redis_call
+from app.fanout import fan_out
+from app.kickbase import AuthenticationError, KickbaseClient, KickbaseError
+from app.kickbase import config as kickbase_config
+from app.kickbase.models import (
+    KickbaseCompetitionPlayerDetails,
+    KickbaseCompetitionPlayersResponse,
+    KickbaseLoginResponse,
+    KickbasePlayerPerformanceResponse,
+)
+from app.players.config import settings
+from app.players.history import history_store, to_day
+from app.players.store import DETAIL_COLUMNS, LIST_COLUMNS, POINTS_COLUMNS, points_store, store
+
+logger = logging.getLogger(__name__)
+
+INGEST_LOCK_KEY = "lock:players:ingest"
+
+_service_token: str | None = None
+_ingest_task: asyncio.Task | None = None
+
+
+def ingestion_configured() -> bool:
+    """Check if ingestion is enabled and the service account is set."""
+    return settings.enabled and bool(kickbase_config.email and kickbase_config.password)
+
+
+async def _get_client(refresh: bool = False) -> KickbaseClient:
+    """Kickbase client logged in as the service account (token kept in memory)."""
+    global _service_token
+
+    if _service_token is None or refresh:
+        login = await KickbaseClient().post_model(
+            "/user/login",
+            KickbaseLoginResponse,
+            data={"em": kickbase_config.email, "pass": kickbase_config.password, "ext": False},
+        )
+        _service_token = login.token
+
+    return KickbaseClient(token=_service_token)
+
+
+async def _claim_run() -> bool:
+    """Claim this interval's ingestion run (True = this worker ingests)."""
+    try:
+        async with redis_call() as redis_client:
+            claimed = await redis_client.set(
+                INGEST_LOCK_KEY, "1", nx=True, px=int(settings.ingest_interval * 1000)
+            )
+        return bool(claimed)
+    except RedisUnavailable:
+        return True
+    except Exception as e:
+        logger.warning(f"Redis error claiming player ingestion (ingesting anyway): {e}")
+        return True
+
+
+async def _release_run() -> None:
+    """Give the run back after a failure, so another worker can retry soon."""
+    try:
+        async with redis_call() as redis_client:
+            await redis_client.delete(INGEST_LOCK_KEY)
+    except Exception:
+        pass
+
+
+def _details_due(previous: pd.DataFrame | None, player_ids: list[str], now: float) -> list[str]:
+    """Players whose details are missing or older than details_max_age, oldest first."""
+    if previous is None:
+        return player_ids[: settings.details_per_run]
+
+    updated_at = previous["details_updated_at"].reindex(player_ids).fillna(0.0)
+    due = updated_at[updated_at < now - settings.details_max_age].sort_values(kind="stable")
+    return list(due.index[: settings.details_per_run])
+
+
+async def _fetch_details(
+    client: KickbaseClient, player_ids: list[str]
+) -> list[tuple[KickbaseCompetitionPlayerDetails, KickbasePlayerPerformanceResponse]]:
+    """
+    Fetch details + performance of several players (bounded concurrency, failures skipped).
+
+    An AuthenticationError cancels the fetches still running or queued (via
+    fan_out) - the service token is bad, so they would only burn rate-limit tokens.
+    """
+    semaphore = asyncio.Semaphore(settings.details_concurrency)
+    path = f"/competitions/{settings.competition_id}/players"
+
+    async def fetch(
+        player_id: str,
+    ) -> tuple[KickbaseCompetitionPlayerDetails, KickbasePlayerPerformanceResponse] | None:
+        async with semaphore:
+            try:
+                return await fan_out(
+                    client.get_model(f"{path}/{player_id}", KickbaseCompetitionPlayerDetails),
+                    client.get_model(f"{path}/{player_id}/performance", KickbasePlayerPerformanceResponse),
+                )
+            except AuthenticationError:
+                raise
+            except KickbaseError as e:
+                # One broken player must not cost the whole run
+                logger.warning(f"Player details {player_id} failed: {e.message}")
+                metrics.incr("players.details.failed")
+                return None
+
+    results = await fan_out(*(fetch(player_id) for player_id in player_ids))
+    return [result for result in results if result is not None]
+
+
+def _merge_points(
+    previous: pd.DataFrame | None,
+    fetched: list[tuple[str, KickbasePlayerPerformanceResponse]],
+    player_ids: list[str],
+) -> pd.DataFrame:
+    """Points table with the refetched players replaced (current season only)."""
+    rows = [
+        (player_id, day.matchday, day.points)
+        for player_id, performance in fetched
+        if performance.seasons
+        for day in performance.seasons[-1].matchdays
+    ]
+    points = pd.DataFrame(rows, columns=list(POINTS_COLUMNS))
+
+    if previous is not None:
+        refetched = {player_id for player_id, _ in fetched}
+        kept = previous[previous["player_id"].isin(player_ids) & ~previous["player_id"].isin(refetched)]
+        points = pd.concat([kept, points], ignore_index=True)
+
+    return points.astype(POINTS_COLUMNS).sort_values(["player_id", "matchday"], ignore_index=True)
+
+
+async def ingest_once() -> int:
+    """
+    Run one ingestion and replace the stored player table.
+
+    Returns:
+        Number of players stored
+    """
+    started = time.monotonic()
+    now = time.time()
+
+    path = f"/competitions/{settings.competition_id}/players"
+    try:
+        client = await _get_client()
+        response = await client.get_streamed(path, KickbaseCompetitionPlayersResponse, "it")
+    except AuthenticationError:
+        # Service token expired - log in again once
+        client = await _get_client(refresh=True)
+        response = await client.get_streamed(path, KickbaseCompetitionPlayersResponse, "it")
+
+    players = pd.DataFrame(
+        [player.model_dump(include=set(LIST_COLUMNS)) for player in response.players],
+        columns=list(LIST_COLUMNS),
+    )
+    players = players.drop_duplicates("id").set_index("id", drop=False)
+    player_ids = list(players.index)
+
+    # Details: keep the previous ones, overwrite those refetched now
+    previous = store.load()
+    if previous is not None:
+        players = players.join(previous[list(DETAIL_COLUMNS)].reindex(player_ids))
+
+    results = await _fetch_details(client, _details_due(previous, player_ids, now))
+    details = [item for item, _ in results]
+    if details:
+        fetched = pd.DataFrame(
+            [{**item.model_dump(include=set(DETAIL_COLUMNS)), "details_updated_at": now} for item in details],
+            index=[item.id for item in details],
+        )
+        players = players.reindex(columns=list(players.columns.union(fetched.columns, sort=False)))
+        players.update(fetched)
+
+    await asyncio.to_thread(store.write, players)
+
+    previous_points = points_store.load()
+    points = _merge_points(previous_points, [(item.id, performance) for item, performance in results], player_ids)
+    if previous_points is None or not points.equals(previous_points.reset_index(drop=True)):
+        await asyncio.to_thread(points_store.write, points)
+
+    await asyncio.to_thread(history_store.append, players[["id", "market_value"]], to_day(now))
+
+    metrics.incr("players.ingest")
+    metrics.incr("players.details.fetched", len(details))
+    logger.info(
+        f"Player ingestion: {len(players)} players, {len(details)} details "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+    return len(players)
+
+
+async def _run() -> None:
+    """Ingestion loop (runs until cancelled)."""
+    while True:
+        if await _claim_run():
+            try:
+                await ingest_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Kickbase or disk trouble - keep serving the previous table
+                logger.warning(f"Player ingestion failed: {e}")
+                metrics.incr("players.ingest.failed")
+                await _release_run()
+
+        await asyncio.sleep(settings.check_interval)
+
+
+async def start_ingestion() -> None:
+    """Start the background ingestion (called on startup)."""
+    global _ingest_task
+
+    if _ingest_task is not None:
+        return
+    if not ingestion_configured():
+        logger.info("Player ingestion disabled (PLAYERS_ENABLED or service account not set)")
+        return
+
+    _ingest_task = asyncio.create_task(_run())
+    logger.info(f"Player ingestion started (every {settings.ingest_interval:.0f}s)")
+
+
+async def stop_ingestion() -> None:
+    """Stop the background ingestion (called on shutdown)."""
+    global _ingest_task
+
+    if _ingest_task is None:
+        return
+
+    _ingest_task.cancel()
+    try:
+        await _ingest_task
+    except asyncio.CancelledError:
+        pass
+    _ingest_task = None
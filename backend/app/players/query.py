@@ -0,0 +1,199 @@
+"""
+In-memory query engine for the player table (filter, sort, paginate).
+
+The Players page sends many small queries ("midfielders of team 7 under 10M,
+sorted by €/point, page 2") over the same ~600 rows. Instead of filtering and
+sorting the DataFrame per request, PlayerIndex prepares everything once per
+ingestion:
+
+| Structure | Built for | Query cost |
+|-----------|-----------|------------|
+| Sorted index per sort key | `SORT_KEYS` (asc + desc) | none - reused as is |
+| Sorted values per sort key | range filters (`min_*` / `max_*`) | 2 binary searches |
+| Boolean mask per category value | `position`, `team_id`, `status` | one AND/OR per filter |
+
+A query combines the masks, then walks the precomputed order of its sort key
+in chunks and stops as soon as the requested page is complete - no sort and,
+for early pages, no pass over the whole order. The total is a popcount.
+
+Players without a value for a key (e.g., €/point without points) are never
+matched by a range filter on it and always come last, in both directions.
+
+The columns (incl. €/point, form, ...) come from stats.py.
+"""
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+import numpy as np
+
+from app.players.history import TREND_PERIODS
+from app.players.stats import PlayerStats, get_player_stats
+
+# Keys a query can sort by / filter a range on (incl. every trend badge period)
+SORT_KEYS = (
+    "market_value",
+    "total_points",
+    "avg_points",
+    "euros_per_point",
+    "points_per_million",
+    "form",
+    "form_trend",
+    "market_value_change_pct",
+    *TREND_PERIODS,
+)
+
+# Keys with a mask per value (filters match any of the given values)
+CATEGORY_KEYS = ("position", "team_id", "status")
+
+# Rows checked per step while collecting a page
+_CHUNK = 256
+
+
+@dataclass
+class PlayerQuery:
+    """Filters, sort and page of one query (empty filter = no restriction)."""
+
+    positions: list[int] = field(default_factory=list)
+    team_ids: list[str] = field(default_factory=list)
+    statuses: list[int] = field(default_factory=list)
+    # Sort key -> (min, max), both inclusive, None = open
+    ranges: dict[str, tuple[float | None, float | None]] = field(default_factory=dict)
+    sort: str = "market_value"
+    descending: bool = True
+    offset: int = 0
+    limit: int = 50
+
+
+@dataclass
+class PlayerPage:
+    """Result of a query: matching row numbers of the page, in sort order."""
+
+    total: int
+    rows: np.ndarray
+
+
+class PlayerIndex:
+    """
+    Column arrays + precomputed indexes of one player table.
+
+    Build once per table (see get_player_index), then query many times.
+    `columns` needs every sort and category key; all other columns (name,
+    ...) are kept as well, so the rows of a page can be read straight from it.
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        self.columns = dict(columns)
+        self.size = len(self.columns["id"])
+
+        # Sorted order of every sort key: rows with a value first, then the NaN rows
+        self._sorted_values: dict[str, np.ndarray] = {}
+        self._valid_order: dict[str, np.ndarray] = {}
+        self._orders: dict[tuple[str, bool], np.ndarray] = {}
+        for key in SORT_KEYS:
+            values = self.columns[key].astype(np.float64)
+            valid = ~np.isnan(values)
+            valid_rows = np.flatnonzero(valid)
+            # Stable, so ties always end up in the same order (pages don't shuffle between requests)
+            order = valid_rows[np.argsort(values[valid_rows], kind="stable")]
+            missing = np.flatnonzero(~valid)
+
+            self._sorted_values[key] = values[order]
+            self._valid_order[key] = order
+            self._orders[(key, False)] = np.concatenate([order, missing])
+            self._orders[(key, True)] = np.concatenate([order[::-1], missing])
+
+        # One boolean mask per value of every category key
+        self._masks: dict[str, dict] = {}
+        for key in CATEGORY_KEYS:
+            values, inverse = np.unique(self.columns[key], return_inverse=True)
+            self._masks[key] = {value: inverse == i for i, value in enumerate(values.tolist())}
+
+    def _category_mask(self, key: str, values: list) -> np.ndarray | None:
+        """Rows matching any of the values (None = no filter)."""
+        if not values:
+            return None
+
+        masks = self._masks[key]
+        mask = np.zeros(self.size, dtype=bool)
+        for value in values:
+            value_mask = masks.get(value)
+            if value_mask is not None:
+                mask |= value_mask
+        return mask
+
+    def _range_mask(self, key: str, low: float | None, high: float | None) -> np.ndarray:
+        """Rows with low <= value <= high, found by binary search on the sorted values."""
+        sorted_values = self._sorted_values[key]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        end = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side="right")
+
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self._valid_order[key][start:end]] = True
+        return mask
+
+    def query(self, query: PlayerQuery) -> PlayerPage:
+        """
+        Run a query.
+
+        Raises:
+            ValueError: Unknown sort or range key
+        """
+        for key in (query.sort, *query.ranges):
+            if key not in SORT_KEYS:
+                raise ValueError(f"Unknown player sort/filter key: {key}")
+
+        masks = [
+            self._category_mask("position", query.positions),
+            self._category_mask("team_id", query.team_ids),
+            self._category_mask("status", query.statuses),
+            *(
+                self._range_mask(key, low, high)
+                for key, (low, high) in query.ranges.items()
+                if low is not None or high is not None
+            ),
+        ]
+        masks = [mask for mask in masks if mask is not None]
+
+        order = self._orders[(query.sort, query.descending)]
+        wanted = query.offset + query.limit
+
+        if not masks:
+            # Nothing to filter - the page is a plain slice of the order
+            return PlayerPage(total=self.size, rows=order[query.offset:wanted])
+
+        mask = masks[0] if len(masks) == 1 else np.logical_and.reduce(masks)
+
+        # Walk the sorted order until the page is complete
+        found: list[np.ndarray] = []
+        count = 0
+        step = max(_CHUNK, wanted)
+        for start in range(0, self.size, step):
+            chunk = order[start:start + step]
+            hits = chunk[mask[chunk]]
+            found.append(hits)
+            count += len(hits)
+            if count >= wanted:
+                break
+
+        rows = np.concatenate(found) if found else order[:0]
+        return PlayerPage(total=int(np.count_nonzero(mask)), rows=rows[query.offset:wanted])
+
+
+# Index of the current player stats (rebuilt when a new ingestion is loaded)
+_index: PlayerIndex | None = None
+_index_stats: PlayerStats | None = None
+
+
+def get_player_index() -> PlayerIndex | None:
+    """Index of the current player table (None until the first ingestion)."""
+    global _index, _index_stats
+
+    stats = get_player_stats()
+    if stats is None:
+        return None
+
+    if stats is not _index_stats:
+        _index = PlayerIndex(stats.columns)
+        _index_stats = stats
+    return _index
@@ -0,0 +1,264 @@
+"""
+Vectorized player metrics.
+
+Every metric is computed for all players at once on NumPy arrays - one pass
+over ~600 players (or a 15-player squad) instead of Python code per player:
+
+| Metric | Calculation | Input |
+|--------|-------------|-------|
+| `euros_per_point` | market value / avg points (like the dashboard) | player table |
+| `points_per_million` | total points / (market value / 1M) | player table |
+| `market_value_change_pct` | 24h market value change in % | player table (details) |
+| `season_avg_points` | mean points of all appearances this season | points per matchday |
+| `form` | mean points of the last FORM_WINDOW appearances | points per matchday |
+| `form_trend` | form - season average (> 0 = in form) | points per matchday |
+| `points_std` | standard deviation of the points (stability) | points per matchday |
+| `market_value_change_{1d,7d,30d}_pct` | market value change over 1/7/30 days in % | market value history |
+
+Undefined values (no points, no appearances, ...) are NaN - None in PlayerSummary.
+
+The matchday metrics only change when a new matchday is played, so they are
+cached per (points table, matchday); the cheap value metrics and trends are
+redone for every newly loaded player table or market value snapshot.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+from app.players.history import TREND_PERIODS, MarketValueHistory, get_market_value_history, history_store
+from app.players.store import get_player_table, get_points_table, points_store, store
+
+logger = logging.getLogger(__name__)
+
+# Appearances in the form window ("5-game moving average")
+FORM_WINDOW = 5
+
+MATCHDAY_KEYS = ("season_avg_points", "form", "form_trend", "points_std")
+
+# Fields of PlayerSummary (app/models/dashboard.py) and their column
+SUMMARY_FIELDS = (
+    "id",
+    "name",
+    "position",
+    "team_id",
+    "profile_image",
+    "market_value",
+    "total_points",
+    "avg_points",
+    "euros_per_point",
+    "points_per_million",
+    "market_value_change_pct",
+    "market_value_change_1d_pct",
+    "market_value_change_7d_pct",
+    "market_value_change_30d_pct",
+    "form",
+    "form_trend",
+    "points_std",
+)
+
+
+def value_metrics(
+    market_value: np.ndarray,
+    total_points: np.ndarray,
+    avg_points: np.ndarray,
+    market_value_change_24h: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Value-for-money metrics (NaN where undefined, e.g., the % change without a 24h change)."""
+    market_value = np.asarray(market_value, dtype=np.float64)
+    total_points = np.asarray(total_points, dtype=np.float64)
+    avg_points = np.asarray(avg_points, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics = {
+            "euros_per_point": np.where(avg_points > 0, market_value / avg_points, np.nan),
+            "points_per_million": np.where(market_value > 0, total_points / (market_value / 1e6), np.nan),
+        }
+        if market_value_change_24h is None:
+            metrics["market_value_change_pct"] = np.full(len(market_value), np.nan)
+        else:
+            change = np.asarray(market_value_change_24h, dtype=np.float64)
+            before = market_value - change
+            metrics["market_value_change_pct"] = np.where(before > 0, change / before * 100, np.nan)
+
+    return metrics
+
+
+def points_matrix(points: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Points per player and matchday as a dense matrix.
+
+    Returns:
+        (player ids, matrix of shape players x matchdays - NaN = didn't play)
+    """
+    player_ids, rows = np.unique(points["player_id"].to_numpy(), return_inverse=True)
+    matchdays = points["matchday"].to_numpy()
+
+    matrix = np.full((len(player_ids), int(matchdays.max(initial=0))), np.nan)
+    matrix[rows, matchdays - 1] = points["points"].to_numpy()
+    return player_ids, matrix
+
+
+def matchday_metrics(matrix: np.ndarray, window: int = FORM_WINDOW) -> dict[str, np.ndarray]:
+    """Season average, form and stability of every row of a points matrix."""
+    played = ~np.isnan(matrix)
+    values = np.where(played, matrix, 0.0)
+    appearances = played.sum(axis=1)
+
+    # Appearances counted from the latest matchday backwards (1 = most recent one)
+    from_end = np.cumsum(played[:, ::-1], axis=1)[:, ::-1]
+    in_window = played & (from_end <= window)
+    window_count = in_window.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        season_avg = np.where(appearances > 0, values.sum(axis=1) / appearances, np.nan)
+        form = np.where(window_count > 0, np.where(in_window, matrix, 0.0).sum(axis=1) / window_count, np.nan)
+        squared = np.where(played, (matrix - season_avg[:, None]) ** 2, 0.0)
+        points_std = np.where(appearances > 1, np.sqrt(squared.sum(axis=1) / appearances), np.nan)
+
+    return {
+        "season_avg_points": season_avg,
+        "form": form,
+        "form_trend": form - season_avg,
+        "points_std": points_std,
+    }
+
+
+@dataclass
+class PlayerStats:
+    """Player table columns + all metrics, as arrays in table order."""
+
+    matchday: int  # latest matchday with points (0 = none yet)
+    columns: dict[str, np.ndarray]
+    ids: pd.Index  # player id -> row
+
+    def take(self, ids: Iterable[str], keys: Iterable[str]) -> dict[str, np.ndarray]:
+        """Float columns for the given player ids (NaN for unknown players)."""
+        rows = self.ids.get_indexer(list(ids))
+        known = rows >= 0
+        result = {}
+        for key in keys:
+            values = np.full(len(rows), np.nan)
+            values[known] = self.columns[key][rows[known]]
+            result[key] = values
+        return result
+
+
+def _optional(value: Any) -> Any:
+    """NaN (undefined metric) -> None, NumPy scalars -> Python."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def summary_fields(columns: dict[str, np.ndarray], row: int) -> dict[str, Any]:
+    """One row of metric columns as PlayerSummary keyword arguments."""
+    return {name: _optional(columns[name][row]) for name in SUMMARY_FIELDS if name in columns}
+
+
+def latest_matchday(points: pd.DataFrame | None) -> int:
+    """Latest matchday with points (0 = none yet)."""
+    if points is None or points.empty:
+        return 0
+    return int(points["matchday"].max())
+
+
+def player_matchday_metrics(points: pd.DataFrame | None) -> dict[str, np.ndarray]:
+    """Matchday metrics by player ("player_id" array + one array per metric)."""
+    if points is None or points.empty:
+        return {"player_id": np.empty(0, dtype=object), **{key: np.empty(0) for key in MATCHDAY_KEYS}}
+
+    player_ids, matrix = points_matrix(points)
+    return {"player_id": player_ids, **matchday_metrics(matrix)}
+
+
+def _build_stats(
+    table: pd.DataFrame,
+    by_player: dict[str, np.ndarray],
+    matchday: int,
+    history: MarketValueHistory | None,
+) -> PlayerStats:
+    """Combine the table, its value metrics, the matchday metrics (aligned by player id) and trends."""
+    columns = {column: table[column].to_numpy() for column in table.columns}
+    columns.update(
+        value_metrics(
+            columns["market_value"],
+            columns["total_points"],
+            columns["avg_points"],
+            columns.get("market_value_change_24h"),
+        )
+    )
+
+    ids = pd.Index(columns["id"])
+    rows = pd.Index(by_player["player_id"]).get_indexer(ids)
+    known = rows >= 0
+    for key in MATCHDAY_KEYS:
+        values = np.full(len(ids), np.nan)
+        values[known] = by_player[key][rows[known]]
+        columns[key] = values
+
+    if history is not None:
+        columns.update(history.changes(ids))
+    else:
+        columns.update({key: np.full(len(ids), np.nan) for key in TREND_PERIODS})
+
+    return PlayerStats(matchday=matchday, columns=columns, ids=ids)
+
+
+def compute_player_stats(
+    table: pd.DataFrame,
+    points: pd.DataFrame | None,
+    history: MarketValueHistory | None = None,
+) -> PlayerStats:
+    """
+    All metrics of a player table (uncached, see get_player_stats).
+
+    Args:
+        points: Points per player and matchday (None = no matchday metrics)
+        history: Market value history (None = no trends)
+    """
+    return _build_stats(table, player_matchday_metrics(points), latest_matchday(points), history)
+
+
+# Caches: matchday metrics per (points table, matchday), stats per loaded tables
+_matchday_key: tuple[int, int] | None = None
+_matchday_metrics: dict[str, np.ndarray] = {}
+_stats_key: tuple[int, int, int] | None = None
+_stats: PlayerStats | None = None
+
+
+def player_stats_version() -> tuple[int, int, int] | None:
+    """Version of the tables behind get_player_stats() (same on all workers, None = no stats)."""
+    return _stats_key
+
+
+def get_player_stats() -> PlayerStats | None:
+    """Metrics of the current player table (None until the first ingestion)."""
+    global _matchday_key, _matchday_metrics, _stats_key, _stats
+
+    table = get_player_table()
+    if table is None:
+        return None
+    points = get_points_table()
+    history = get_market_value_history()
+
+    stats_key = (store.version, points_store.version, history_store.version)
+    if stats_key == _stats_key:
+        return _stats
+
+    matchday = latest_matchday(points)
+    matchday_key = (points_store.version, matchday)
+    if matchday_key != _matchday_key:
+        _matchday_metrics = player_matchday_metrics(points)
+        _matchday_key = matchday_key
+        logger.info(f"Computed matchday metrics of {len(_matchday_metrics['player_id'])} players (matchday {matchday})")
+
+    _stats = _build_stats(table, _matchday_metrics, matchday, history)
+    _stats_key = stats_key
+    return _stats
@@ -0,0 +1,156 @@
+"""
+Columnar store for the competition player tables.
+
+Two Parquet files per competition, written by the ingestion job, read by
+every worker:
+- players.parquet: every player of the competition (one row per player)
+- points.parquet: points per player and matchday of the current season
+  (one row per appearance - the input of the form metrics in stats.py)
+
+- Writes go to a temp file + os.replace, so readers never see half a file
+- Reads memory-map the file (pyarrow) and are cached until its mtime changes,
+  so a new ingestion is picked up by all workers without any messaging
+
+| Column | Type | Source |
+|--------|------|--------|
+| `id`, `name`, `team_id`, `profile_image` | string | player list |
+| `position`, `status`, `market_value_trend` | int8 | player list |
+| `market_value`, `total_points`, `avg_points` | int64 | player list |
+| `first_name`, `last_name`, `team_name`, `status_text` | string | details |
+| `shirt_number`, `goals`, `assists`, `yellow_cards`, `red_cards` | int64 | details |
+| `seconds_played`, `starts`, `appearances`, `market_value_change_24h` | int64 | details |
+| `details_updated_at` | float64 | Unix time of the last details fetch (0 = never) |
+
+points.parquet: `player_id` (string), `matchday` (int16), `points` (int32).
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.players.config import settings
+
+logger = logging.getLogger(__name__)
+
+PLAYERS_FILE = "players.parquet"
+POINTS_FILE = "points.parquet"
+
+# Column -> pandas dtype (strings are plain object columns)
+LIST_COLUMNS = {
+    "id": "object",
+    "name": "object",
+    "team_id": "object",
+    "profile_image": "object",
+    "position": "int8",
+    "status": "int8",
+    "market_value": "int64",
+    "market_value_trend": "int8",
+    "total_points": "int64",
+    "avg_points": "int64",
+}
+DETAIL_COLUMNS = {
+    "first_name": "object",
+    "last_name": "object",
+    "team_name": "object",
+    "status_text": "object",
+    "shirt_number": "int64",
+    "goals": "int64",
+    "assists": "int64",
+    "yellow_cards": "int64",
+    "red_cards": "int64",
+    "seconds_played": "int64",
+    "starts": "int64",
+    "appearances": "int64",
+    "market_value_change_24h": "int64",
+    "details_updated_at": "float64",
+}
+COLUMNS = {**LIST_COLUMNS, **DETAIL_COLUMNS}
+
+# Players without details yet get empty strings / zeros
+DETAIL_DEFAULTS = {column: "" if dtype == "object" else 0 for column, dtype in DETAIL_COLUMNS.items()}
+
+POINTS_COLUMNS = {
+    "player_id": "object",
+    "matchday": "int16",
+    "points": "int32",
+}
+
+
+class PlayerStore:
+    """Reads and writes one table of a competition (one Parquet file)."""
+
+    def __init__(
+        self,
+        path: Path,
+        columns: dict[str, str],
+        index: str | None = None,
+        defaults: dict | None = None,
+    ):
+        """
+        Args:
+            columns: Column -> pandas dtype (written in this order)
+            index: Column to index the loaded DataFrame by (kept as a column too)
+            defaults: Fill values for missing columns/values on write
+        """
+        self.path = path
+        self.columns = columns
+        self.index = index
+        self.defaults = defaults or {}
+        self._table: pd.DataFrame | None = None
+        self._mtime_ns = 0
+
+    @property
+    def version(self) -> int:
+        """Changes whenever a new table is loaded (0 = nothing loaded)."""
+        return self._mtime_ns
+
+    def load(self) -> pd.DataFrame | None:
+        """
+        Current table.
+
+        Returns:
+            The DataFrame, or None if nothing was ingested yet
+        """
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        if self._table is None or mtime_ns != self._mtime_ns:
+            table = pq.read_table(self.path, memory_map=True).to_pandas()
+            if self.index is not None:
+                table = table.set_index(self.index, drop=False)
+            self._table = table
+            self._mtime_ns = mtime_ns
+            logger.info(f"Loaded {self.path.name}: {len(table)} rows")
+
+        return self._table
+
+    def write(self, table: pd.DataFrame) -> None:
+        """Replace the table (atomically)."""
+        table = table.reindex(columns=list(self.columns)).fillna(self.defaults).astype(self.columns)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(pa.Table.from_pandas(table, preserve_index=False), tmp_path)
+        os.replace(tmp_path, self.path)
+
+
+# Global stores of the configured competition
+DATA_DIR = Path(settings.data_dir) / f"competition-{settings.competition_id}"
+store = PlayerStore(DATA_DIR / PLAYERS_FILE, COLUMNS, index="id", defaults=DETAIL_DEFAULTS)
+points_store = PlayerStore(DATA_DIR / POINTS_FILE, POINTS_COLUMNS)
+
+
+def get_player_table() -> pd.DataFrame | None:
+    """Player table of the configured competition (None until the first ingestion)."""
+    return store.load()
+
+
+def get_points_table() -> pd.DataFrame | None:
+    """Points per player and matchday (None until the first ingestion)."""
+    return points_store.load()
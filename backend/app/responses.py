@@ -0,0 +1,49 @@
+"""
+Fast JSON responses.
+
+When a route returns a Pydantic model, FastAPI makes a second full pass over
+it: model_dump() -> validate against response_model -> dump to Python ->
+stdlib json.dumps(). For a model the handler just built with exactly the
+response_model type, that is all redundant work.
+
+Returning a FastJSONResponse instead skips it: FastAPI passes Response
+objects through untouched, and the model is serialized by pydantic-core
+straight to bytes - one pass, in Rust, same JSON as model_dump_json().
+
+Usage:
+    @router.get("/players", response_model=PlayerListResponse)  # still used for the docs
+    async def list_players(...) -> Response:
+        return FastJSONResponse(PlayerListResponse(...))
+
+| Content | Rendered with |
+|---------|---------------|
+| bytes (e.g., a snapshot, see snapshots.py) | as is |
+| Pydantic models, dicts, lists, ... | pydantic_core.to_json |
+
+It's also the app's default_response_class (main.py), so routes returning
+plain dicts (health, metrics) are rendered by pydantic-core instead of json.dumps.
+
+Compare the cost per route with `python -m benchmarks.bench_response_serialization`.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def render_json(content: Any) -> bytes:
+    """Models, dicts, lists (...) -> JSON bytes (NaN/inf become null, like model_dump_json)."""
+    # to_json() writes bare NaN/Infinity by default - not valid JSON, browsers reject it
+    return to_json(content, inf_nan_mode="null")
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized by pydantic-core, without response_model revalidation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return render_json(content)
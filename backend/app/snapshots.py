@@ -0,0 +1,120 @@
+"""
+Materialized responses of aggregate endpoints.
+
+Even when all its inputs come from the cache, an aggregate endpoint (like the
+dashboard) rebuilds the same response on every request: models, metrics,
+sorting, JSON serialization. A snapshot keeps the finished response as JSON
+bytes - already compressed in every encoding worth sending (see
+http_compression.py) - tagged with a hash of everything it was built from:
+
+    inputs = inputs_hash(*fingerprints_of_the_inputs, ...)
+    variants = await get_snapshot(key, inputs)
+    if variants is None:
+        variants = await set_snapshot(key, inputs, render_json(build_response(...)))
+    body, content_encoding = pick_variant(variants, negotiate(accept_encoding))
+
+A snapshot is only served while the inputs hash matches - when an input
+actually changes (different content fingerprint, see cache/entry.py), the
+response is rebuilt (and compressed) once. Re-fetched but identical inputs
+keep the snapshot.
+
+| Tier | Stored as | Expires |
+|------|-----------|---------|
+| L1 (local_cache) | (inputs hash, {encoding: body}) | CACHE_L1_TTL |
+| Redis | hash: `inputs`, `identity`, `gzip`, `br` | CACHE_SNAPSHOT_TTL |
+
+No L1 invalidation messages needed: an outdated snapshot has an outdated
+inputs hash, so it's never served.
+"""
+
+import hashlib
+import logging
+from typing import Any
+
+from app import metrics
+from app.cache.backend import RedisUnavailable, redis_call
+from app.cache.config import settings
+from app.cache.local import local_cache
+from app.http_compression import IDENTITY, compress_variants
+
+logger = logging.getLogger(__name__)
+
+# Field of the Redis hash holding the inputs hash (the others are encodings)
+_INPUTS_FIELD = "inputs"
+
+
+def inputs_hash(*parts: Any) -> str:
+    """Hash of everything a snapshot depends on (fingerprints, versions, schema hashes)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def snapshot_key(namespace: str, name: str) -> str:
+    """Key of a snapshot, e.g. league:123:user:9f2c...:snapshot:dashboard"""
+    return f"{namespace}:snapshot:{name}"
+
+
+def _keep_local(key: str, inputs: str, variants: dict[str, bytes]) -> None:
+    local_cache.set(key, (inputs, variants), size=sum(len(body) for body in variants.values()))
+
+
+async def get_snapshot(key: str, inputs: str) -> dict[str, bytes] | None:
+    """The snapshot's bodies by encoding if it was built from these inputs (None otherwise)."""
+    local = local_cache.get(key)
+    if local is not None and local[0] == inputs:
+        metrics.incr("snapshot.hit")
+        return local[1]
+
+    try:
+        async with redis_call(binary=True) as redis_client:
+            stored = await redis_client.hgetall(key)
+
+    except RedisUnavailable:
+        stored = {}
+
+    except Exception as e:
+        # Redis error - just rebuild the response
+        logger.warning(f"Redis read error (rebuilding snapshot): {e}")
+        stored = {}
+
+    fields = {name.decode(): value for name, value in stored.items()}
+    stored_inputs = fields.pop(_INPUTS_FIELD, b"").decode()
+    if stored_inputs == inputs and IDENTITY in fields:
+        _keep_local(key, inputs, fields)
+        metrics.incr("snapshot.hit")
+        return fields
+
+    metrics.incr("snapshot.miss")
+    return None
+
+
+async def set_snapshot(key: str, inputs: str, body: bytes) -> dict[str, bytes]:
+    """
+    Compress and store a snapshot (errors are logged, never raised).
+
+    Returns:
+        The stored bodies by encoding (always including "identity")
+    """
+    variants = compress_variants(body)
+    _keep_local(key, inputs, variants)
+
+    try:
+        async with redis_call(binary=True) as redis_client:
+            # Replace all variants at once - no reader sees old and new mixed
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping={_INPUTS_FIELD: inputs, **variants})
+                pipe.expire(key, settings.snapshot_ttl)
+                await pipe.execute()
+
+    except RedisUnavailable:
+        pass
+
+    except Exception as e:
+        # Redis error - the next request (on another worker) just rebuilds it
+        logger.warning(f"Redis write error (snapshot not stored): {e}")
+
+    return variants
@@ -0,0 +1,127 @@
+"""
+Streaming JSON parsing for large upstream payloads.
+
+`response.json()` + `Model.model_validate(data)` holds the raw bytes, the
+whole dict tree and the models in memory at the same time, and nothing can
+be validated before the last byte arrived. StreamParser instead feeds the
+response bytes into an incremental parser (ijson) and validates each element
+of one array as soon as it's complete - the dict of one item is all that
+exists besides the finished models.
+
+Usage:
+    parser = StreamParser("us.item", KickbaseRankingUser.model_validate)
+    async for chunk in response.aiter_bytes():
+        for user in parser.feed(chunk):
+            ...
+    users = parser.close()           # items from the last chunk
+    matchday = parser.fields["day"]  # top-level scalar fields
+
+Prefixes use ijson's syntax: "us.item" = every element of the top-level "us"
+array, "item" = every element of a top-level array.
+"""
+
+from typing import Any, Callable, Generic, TypeVar
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+T = TypeVar("T")
+
+_SCALAR_EVENTS = {"string", "number", "boolean", "null"}
+_START_EVENTS = {"start_map", "start_array"}
+_END_EVENTS = {"end_map", "end_array"}
+
+
+class StreamParseError(ValueError):
+    """The streamed body is not valid JSON."""
+
+    pass
+
+
+def streaming_available() -> bool:
+    """Check if the optional ijson package is installed."""
+    return ijson is not None
+
+
+class StreamParser(Generic[T]):
+    """
+    Incremental JSON parser that yields validated items of one array.
+
+    Besides the items, top-level scalar fields (e.g., "day" or "il" next to the
+    "us" array) are collected in `fields`. Nested objects outside the item
+    array are not kept.
+    """
+
+    def __init__(self, item_prefix: str, parse_item: Callable[[Any], T]):
+        if ijson is None:
+            raise RuntimeError("Streaming JSON parsing needs the 'ijson' package")
+
+        self.item_prefix = item_prefix
+        self.parse_item = parse_item
+        self.fields: dict[str, Any] = {}
+        self.item_count = 0
+
+        self._events = ijson.sendable_list()
+        # use_float: numbers as float/int instead of Decimal (what json.loads gives)
+        self._coro = ijson.parse_coro(self._events, use_float=True)
+        self._builder: Any = None   # ijson ObjectBuilder of the current item
+        self._depth = 0             # nesting depth inside the current item
+
+    def feed(self, chunk: bytes) -> list[T]:
+        """
+        Parse a chunk of bytes. Returns the items completed by it.
+
+        Raises:
+            StreamParseError: Invalid JSON
+        """
+        try:
+            self._coro.send(chunk)
+        except ijson.JSONError as e:
+            raise StreamParseError(str(e)) from e
+        return self._drain()
+
+    def close(self) -> list[T]:
+        """
+        Finish parsing. Returns the items completed by the last bytes.
+
+        Raises:
+            StreamParseError: Body ended in the middle of the JSON (or is invalid)
+        """
+        try:
+            self._coro.close()
+        except ijson.JSONError as e:
+            raise StreamParseError(str(e)) from e
+        return self._drain()
+
+    def _drain(self) -> list[T]:
+        """Process the parser events collected so far."""
+        items = []
+
+        for prefix, event, value in self._events:
+            if self._builder is not None:
+                # Inside an item - build it until its closing bracket
+                self._builder.event(event, value)
+                if event in _START_EVENTS:
+                    self._depth += 1
+                elif event in _END_EVENTS:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        items.append(self.parse_item(self._builder.value))
+                        self._builder = None
+
+            elif prefix == self.item_prefix:
+                if event in _START_EVENTS:
+                    self._builder = ijson.ObjectBuilder()
+                    self._builder.event(event, value)
+                    self._depth = 1
+                elif event in _SCALAR_EVENTS:
+                    items.append(self.parse_item(value))
+
+            elif event in _SCALAR_EVENTS and prefix and "." not in prefix:
+                self.fields[prefix] = value
+
+        del self._events[:]
+        self.item_count += len(items)
+        return items
@@ -0,0 +1,28 @@
+"""
+Background cache warmer.
+
+Keeps the data of recently active leagues fresh, so the first visitor after
+a TTL expiry doesn't pay the full Kickbase latency.
+
+Usage:
+    from app.warmer import record_league_activity
+
+    record_league_activity(league_id, token)  # in an endpoint
+"""
+
+from app.warmer.config import WarmerSettings, settings
+from app.warmer.scheduler import (
+    record_league_activity,
+    record_table_activity,
+    start_warmer,
+    stop_warmer,
+)
+
+__all__ = [
+    "record_league_activity",
+    "record_table_activity",
+    "start_warmer",
+    "stop_warmer",
+    "WarmerSettings",
+    "settings",
+]
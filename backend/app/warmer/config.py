@@ -0,0 +1,47 @@
+"""
+Configuration for the cache warmer.
+
+Uses pydantic-settings to load from environment variables.
+"""
+
+from pydantic_settings import BaseSettings
+
+
+class WarmerSettings(BaseSettings):
+    """
+    Cache warmer settings.
+
+    Override via environment variables prefixed with WARMER_:
+        WARMER_ENABLED=false
+        WARMER_BUDGET_PER_MINUTE=30
+    """
+
+    enabled: bool = True
+
+    # Seconds between scheduler passes
+    tick_interval: float = 15.0
+
+    # How often a league is warmed - often while a matchday is live
+    # (points and lineups change by the minute), rarely otherwise
+    live_interval: float = 60.0
+    idle_interval: float = 240.0
+
+    # Leagues/users are warmed for this long after their last dashboard visit
+    active_window: float = 30 * 60.0
+
+    # Max leagues/users tracked (least recently active ones are dropped)
+    max_tracked_users: int = 500
+
+    # Bundesliga tables of the latest N seasons are warmed (current + previous:
+    # both are requested around the summer break) - older ones never change
+    table_seasons: int = 2
+
+    # Max upstream calls the warmers of all workers may make per minute together
+    # (shared via Redis) - they must never eat into the rate limit user requests need
+    budget_per_minute: int = 60
+
+    model_config = {"env_prefix": "WARMER_"}
+
+
+# Singleton instance
+settings = WarmerSettings()
@@ -0,0 +1,311 @@
+"""
+Cache warmer scheduler.
+
+Endpoints record which leagues (and users) are active. A background task
+then refreshes their cached data shortly before it goes stale:
+
+| Data | Warmed | Shared by |
+|------|--------|-----------|
+| `get_ranking` | once per league | the league |
+| `get_lineup` | once per active user | one user |
+| `get_bundesliga_table` | once per requested recent season | everyone |
+
+- Matchday-aware: while a league's matchday is live (ranking `is_live`),
+  it is warmed every live_interval seconds, otherwise every idle_interval
+- Only entries that would go stale before the next pass are refreshed
+- A token budget caps upstream calls per minute - shared by all workers via
+  Redis (the Kickbase rate limiter's bucket script), so warming never pushes
+  the app into Kickbase's rate limit
+- Tokens are kept in memory only (needed to call Kickbase on the user's
+  behalf) and forgotten after active_window or on 401
+- Failures are isolated: an error warming one user, league or season is
+  logged and the pass goes on (the league is still rescheduled)
+- Only the latest table_seasons seasons are warmed - the season comes from
+  an unauthenticated query parameter, and finished seasons never change
+
+Each worker warms the leagues it has seen itself. Workers don't warm the
+same key twice: the refresh lock in the cache lets only one of them through,
+and entries another worker just refreshed are fresh and get skipped.
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app import metrics
+from app.cache import RedisUnavailable, redis_call, user_identity
+from app.kickbase.exceptions import AuthenticationError, AuthorizationError
+from app.kickbase.ratelimit import _TAKE_TOKEN_SCRIPT, _LocalBucket
+from app.kickbase.services import get_lineup, get_ranking
+from app.openliga.services import get_bundesliga_table
+from app.warmer.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ActiveUser:
+    """A user whose dashboard was recently opened."""
+
+    league_id: str
+    token: str
+    last_seen: float  # time.monotonic()
+
+
+@dataclass
+class _LeagueSchedule:
+    """When a league is warmed next."""
+
+    next_due: float = 0.0  # time.monotonic()
+    live: bool = False
+
+
+class _Budget:
+    """
+    Token bucket: `per_minute` upstream calls per minute, bursts up to the same amount.
+
+    Shared by the warmers of all workers (one bucket in Redis, same script as
+    the Kickbase rate limiter). While Redis is unavailable, each worker falls
+    back to its own bucket.
+    """
+
+    key = "ratelimit:warmer"
+
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60.0
+        self.burst = per_minute
+        self._local = _LocalBucket(self.rate, per_minute)
+
+    async def try_take(self) -> bool:
+        """Take one token if available."""
+        try:
+            async with redis_call() as redis_client:
+                wait_ms = await redis_client.eval(_TAKE_TOKEN_SCRIPT, 1, self.key, self.rate, self.burst)
+            return wait_ms == 0
+        except RedisUnavailable:
+            pass
+        except Exception as e:
+            logger.warning(f"Warmer budget Redis error (using per-worker budget): {e}")
+        return self._local.take() == 0
+
+
+class _BudgetExhausted(Exception):
+    """No upstream calls left for now - stop this pass."""
+
+    pass
+
+
+# (league_id, user identity) -> user, least recently active first
+_users: OrderedDict[tuple[str, str], _ActiveUser] = OrderedDict()
+_leagues: dict[str, _LeagueSchedule] = {}
+# season -> last requested (time.monotonic()), least recently requested first
+_table_seasons: OrderedDict[str, float] = OrderedDict()
+
+_budget = _Budget(settings.budget_per_minute)
+_warmer_task: asyncio.Task | None = None
+
+
+def record_league_activity(league_id: str, token: str) -> None:
+    """Remember that a user opened a league (called by endpoints)."""
+    if not settings.enabled:
+        return
+
+    key = (league_id, user_identity(token))
+    _users[key] = _ActiveUser(league_id=league_id, token=token, last_seen=time.monotonic())
+    _users.move_to_end(key)
+    _leagues.setdefault(league_id, _LeagueSchedule())
+
+    while len(_users) > settings.max_tracked_users:
+        _users.popitem(last=False)
+
+
+def _is_recent_season(season: str) -> bool:
+    """True for one of the latest table_seasons seasons ("2026" = 2026/27)."""
+    if len(season) != 4 or not (season.isascii() and season.isdigit()):
+        return False
+    year = datetime.date.today().year
+    return year - settings.table_seasons < int(season) <= year
+
+
+def record_table_activity(season: str) -> None:
+    """Remember that the Bundesliga table of a season was requested (recent seasons only)."""
+    if not settings.enabled or not _is_recent_season(season):
+        return
+
+    _table_seasons[season] = time.monotonic()
+    _table_seasons.move_to_end(season)
+
+    while len(_table_seasons) > settings.table_seasons:
+        _table_seasons.popitem(last=False)
+
+
+def _forget_inactive(now: float) -> None:
+    """Drop users, leagues and seasons nobody looked at within active_window."""
+    for key, user in list(_users.items()):
+        if now - user.last_seen > settings.active_window:
+            del _users[key]
+
+    active_leagues = {user.league_id for user in _users.values()}
+    for league_id in list(_leagues):
+        if league_id not in active_leagues:
+            del _leagues[league_id]
+
+    for season, last_seen in list(_table_seasons.items()):
+        if now - last_seen > settings.active_window:
+            del _table_seasons[season]
+
+
+async def _warm(func: Callable, *args: Any, ahead: float) -> Any:
+    """
+    Refresh a cached call if it would go stale within `ahead` seconds.
+
+    Returns:
+        The (cached or refreshed) value, None if unknown
+    """
+    entry = await func.cached_entry(*args)
+    if entry is not None and func.cache_policy.ttl - entry.age() > ahead:
+        metrics.incr("warmer.skipped_fresh")
+        return entry.value
+
+    if not await _budget.try_take():
+        metrics.incr("warmer.budget_exhausted")
+        raise _BudgetExhausted()
+
+    metrics.incr("warmer.refresh")
+    refreshed = await func.refresh(*args)
+    if refreshed is not None:
+        return refreshed.value
+    return entry.value if entry is not None else None
+
+
+async def _warm_user_call(func: Callable, key: tuple[str, str], user: _ActiveUser, ahead: float) -> Any:
+    """
+    Warm one call with a user's token.
+
+    Returns:
+        The value, None if unknown or the call failed (failures are logged)
+    """
+    try:
+        return await _warm(func, user.league_id, user.token, ahead=ahead)
+    except (AuthenticationError, AuthorizationError):
+        # Token expired (or user left the league) - stop using it
+        _users.pop(key, None)
+    except _BudgetExhausted:
+        raise
+    except Exception as e:
+        # Upstream or cache trouble - the other users and leagues still get warmed
+        metrics.incr("warmer.errors")
+        logger.warning(f"Warmer: {func.__name__} failed for league {user.league_id}: {e}")
+    return None
+
+
+async def _warm_league(league_id: str, schedule: _LeagueSchedule, now: float) -> None:
+    """Warm ranking + lineups of one league and schedule its next pass."""
+    users = [(key, user) for key, user in _users.items() if user.league_id == league_id]
+    if not users:
+        return
+
+    interval = settings.live_interval if schedule.live else settings.idle_interval
+    ahead = interval + settings.tick_interval
+
+    # Ranking is league-wide - any active member's token will do
+    ranking = None
+    for key, user in reversed(users):
+        ranking = await _warm_user_call(get_ranking, key, user, ahead)
+        if key in _users:
+            # Worked, or failed for a reason another token wouldn't fix
+            break
+
+    if ranking is not None and ranking.is_live != schedule.live:
+        schedule.live = ranking.is_live
+        logger.info(f"Warmer: league {league_id} matchday {'live' if schedule.live else 'over'}")
+        interval = settings.live_interval if schedule.live else settings.idle_interval
+        ahead = interval + settings.tick_interval
+
+    for key, user in users:
+        if key in _users:
+            await _warm_user_call(get_lineup, key, user, ahead)
+
+    schedule.next_due = now + interval
+
+
+async def _warm_once() -> None:
+    """One scheduler pass over all due leagues and seasons."""
+    now = time.monotonic()
+    _forget_inactive(now)
+
+    try:
+        for season in list(_table_seasons):
+            try:
+                await _warm(get_bundesliga_table, season, ahead=settings.idle_interval + settings.tick_interval)
+            except _BudgetExhausted:
+                raise
+            except Exception as e:
+                metrics.incr("warmer.errors")
+                logger.warning(f"Warmer: table of season {season} failed: {e}")
+
+        # Most overdue first, so a small budget still reaches every league eventually
+        due = sorted(
+            (schedule.next_due, league_id)
+            for league_id, schedule in _leagues.items()
+            if schedule.next_due <= now
+        )
+        for _, league_id in due:
+            schedule = _leagues[league_id]
+            try:
+                await _warm_league(league_id, schedule, now)
+            except _BudgetExhausted:
+                # Stays due - continued first once the budget refills
+                raise
+            except Exception as e:
+                # Anything _warm_league didn't handle - retry at the league's normal pace
+                metrics.incr("warmer.errors")
+                logger.warning(f"Warmer: league {league_id} failed: {e}")
+                schedule.next_due = now + (settings.live_interval if schedule.live else settings.idle_interval)
+
+    except _BudgetExhausted:
+        logger.debug("Warmer: upstream budget exhausted, continuing next pass")
+
+
+async def _run() -> None:
+    """Scheduler loop (runs until cancelled)."""
+    while True:
+        try:
+            await _warm_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Upstream or cache trouble - the warmer is best-effort, try again next pass
+            logger.warning(f"Cache warmer pass failed: {e}")
+
+        await asyncio.sleep(settings.tick_interval)
+
+
+async def start_warmer() -> None:
+    """Start the background warmer (called on startup)."""
+    global _warmer_task
+
+    if not settings.enabled or _warmer_task is not None:
+        return
+
+    _warmer_task = asyncio.create_task(_run())
+    logger.info(f"Cache warmer started (budget {settings.budget_per_minute} calls/min)")
+
+
+async def stop_warmer() -> None:
+    """Stop the background warmer (called on shutdown)."""
+    global _warmer_task
+
+    if _warmer_task is None:
+        return
+
+    _warmer_task.cancel()
+    try:
+        await _warmer_task
+    except asyncio.CancelledError:
+        pass
+    _warmer_task = None
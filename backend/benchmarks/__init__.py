@@ -0,0 +1,12 @@
+"""
+Micro-benchmarks for performance-sensitive code paths.
+
+Run from the backend/ folder (with the venv activated):
+    python -m benchmarks.bench_cache_codecs
+    python -m benchmarks.bench_model_validation
+    python -m benchmarks.bench_player_query
+    python -m benchmarks.bench_response_serialization
+
+Payloads are generated in payloads.py to look like real Kickbase responses
+(same field aliases, realistic sizes), so no network or API token is needed.
+"""
@@ -0,0 +1,56 @@
+"""
+Benchmark: cache codecs on realistic squad and ranking payloads.
+
+Measures per codec (see app/cache/codecs.py):
+- encoded size in bytes
+- encode time (model -> bytes, what a cache write costs)
+- decode time (bytes -> model, what every cache hit costs)
+
+Usage (from backend/):
+    python -m benchmarks.bench_cache_codecs
+    python -m benchmarks.bench_cache_codecs --players 60 --number 5000
+"""
+
+import argparse
+import timeit
+
+from app.cache.codecs import CODECS, ValueType
+from app.cache.entry import decode_entry, encode_entry
+from app.kickbase.models import KickbaseRankingResponse, KickbaseSquadResponse
+from benchmarks.payloads import ranking_payload, squad_payload
+
+
+def bench(label: str, model, number: int) -> None:
+    """Print one results table for a model instance."""
+    value_type = ValueType(type(model))
+
+    print(f"\n{label} (trusted rehydration: {value_type.trusted})")
+    print(f"{'codec':<10} {'bytes':>8} {'encode µs':>11} {'decode µs':>11}")
+
+    for name, codec in CODECS.items():
+        raw = encode_entry(model, value_type, codec, delta=0.1)
+
+        # Sanity check: round trip gives an equal model
+        assert decode_entry(raw, value_type).value == model, name
+
+        encode = timeit.timeit(lambda: encode_entry(model, value_type, codec, 0.1), number=number)
+        decode = timeit.timeit(lambda: decode_entry(raw, value_type), number=number)
+        print(f"{name:<10} {len(raw):>8} {encode / number * 1e6:>11.1f} {decode / number * 1e6:>11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=30, help="players in the squad payload")
+    parser.add_argument("--users", type=int, default=18, help="managers in the ranking payload")
+    parser.add_argument("--number", type=int, default=2000, help="iterations per measurement")
+    args = parser.parse_args()
+
+    squad = KickbaseSquadResponse.model_validate(squad_payload(args.players))
+    ranking = KickbaseRankingResponse.model_validate(ranking_payload(args.users))
+
+    bench(f"KickbaseSquadResponse ({args.players} players)", squad, args.number)
+    bench(f"KickbaseRankingResponse ({args.users} managers)", ranking, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: validating Kickbase responses from raw bytes vs. via a dict.
+
+Compares per response model:
+- dict:  json.loads(body) + Model.model_validate(data)   (the old client.get() path)
+- bytes: Model.model_validate_json(body)                  (client.get_model())
+
+Measures:
+- CPU time per validation (time.process_time, so other processes don't skew it)
+- peak traced allocations during one validation (tracemalloc)
+
+Usage (from backend/):
+    python -m benchmarks.bench_model_validation
+    python -m benchmarks.bench_model_validation --players 200 --number 5000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from app.kickbase.models import KickbaseRankingResponse, KickbaseSquadResponse
+from benchmarks.payloads import ranking_payload, squad_payload
+
+
+def cpu_time(func: Callable[[], object], number: int) -> float:
+    """CPU seconds per call."""
+    started = time.process_time()
+    for _ in range(number):
+        func()
+    return (time.process_time() - started) / number
+
+
+def peak_allocations(func: Callable[[], object]) -> int:
+    """Peak bytes allocated while the call runs (incl. its result)."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def bench(label: str, model, payload: dict, number: int) -> None:
+    """Print one results table for a response model."""
+    body = json.dumps(payload).encode()
+
+    paths = {
+        "dict": lambda: model.model_validate(json.loads(body)),
+        "bytes": lambda: model.model_validate_json(body),
+    }
+
+    # Sanity check: both paths give an equal model
+    assert paths["dict"]() == paths["bytes"](), label
+
+    print(f"\n{label} ({len(body)} bytes of JSON)")
+    print(f"{'path':<8} {'cpu µs':>10} {'peak KiB':>10}")
+
+    for name, func in paths.items():
+        func()  # warm up (pydantic builds some things lazily)
+        cpu = cpu_time(func, number)
+        peak = peak_allocations(func)
+        print(f"{name:<8} {cpu * 1e6:>10.1f} {peak / 1024:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=30, help="players in the squad payload")
+    parser.add_argument("--users", type=int, default=18, help="managers in the ranking payload")
+    parser.add_argument("--number", type=int, default=2000, help="iterations per CPU measurement")
+    args = parser.parse_args()
+
+    bench(
+        f"KickbaseSquadResponse ({args.players} players)",
+        KickbaseSquadResponse,
+        squad_payload(args.players),
+        args.number,
+    )
+    bench(
+        f"KickbaseRankingResponse ({args.users} managers)",
+        KickbaseRankingResponse,
+        ranking_payload(args.users),
+        args.number,
+    )
+
+
+if __name__ == "__main__":
+    main()
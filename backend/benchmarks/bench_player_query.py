@@ -0,0 +1,114 @@
+"""
+Benchmark: player queries with PlayerIndex vs. filter + sort per query.
+
+Runs the same random Players-page queries (position/team/status filters,
+value and points ranges, any sort key, pages 1-4) through:
+- scan:  pandas boolean filter + sort_values + slice   (what a naive endpoint does)
+- index: PlayerIndex.query (precomputed masks + sort orders, see app/players/query.py)
+
+Usage (from backend/):
+    python -m benchmarks.bench_player_query
+    python -m benchmarks.bench_player_query --players 2000 --queries 20000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.kickbase.models import KickbaseCompetitionPlayersResponse
+from app.players.query import SORT_KEYS, PlayerIndex, PlayerQuery
+from app.players.stats import compute_player_stats
+from benchmarks.payloads import TEAM_IDS, competition_players_payload
+
+
+def random_queries(count: int, seed: int = 7) -> list[PlayerQuery]:
+    """Queries like the Players page sends them."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        ranges = {}
+        if rng.random() < 0.5:
+            ranges["market_value"] = (rng.choice([None, 1_000_000, 5_000_000]), rng.choice([None, 20_000_000]))
+        if rng.random() < 0.3:
+            ranges["total_points"] = (rng.randint(0, 1000), None)
+        queries.append(
+            PlayerQuery(
+                positions=rng.sample([1, 2, 3, 4], rng.randint(0, 2)),
+                team_ids=rng.sample(TEAM_IDS, 1) if rng.random() < 0.3 else [],
+                statuses=[0] if rng.random() < 0.5 else [],
+                ranges=ranges,
+                sort=rng.choice(SORT_KEYS),
+                descending=rng.random() < 0.7,
+                offset=rng.randint(0, 3) * 25,
+                limit=25,
+            )
+        )
+    return queries
+
+
+def scan_query(table: pd.DataFrame, query: PlayerQuery) -> np.ndarray:
+    """Reference implementation: filter and sort the whole table."""
+    mask = np.ones(len(table), dtype=bool)
+    if query.positions:
+        mask &= table["position"].isin(query.positions).to_numpy()
+    if query.team_ids:
+        mask &= table["team_id"].isin(query.team_ids).to_numpy()
+    if query.statuses:
+        mask &= table["status"].isin(query.statuses).to_numpy()
+    for key, (low, high) in query.ranges.items():
+        if low is not None:
+            mask &= (table[key] >= low).to_numpy()
+        if high is not None:
+            mask &= (table[key] <= high).to_numpy()
+
+    matches = table[mask].sort_values(
+        query.sort, ascending=not query.descending, kind="stable", na_position="last"
+    )
+    return matches["row"].to_numpy()[query.offset:query.offset + query.limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=600, help="players in the table")
+    parser.add_argument("--queries", type=int, default=5000, help="queries per run")
+    args = parser.parse_args()
+
+    response = KickbaseCompetitionPlayersResponse.model_validate(competition_players_payload(args.players))
+    players = pd.DataFrame([player.model_dump() for player in response.players])
+    queries = random_queries(args.queries)
+
+    # No points history here - form sorts just put everyone in the "no value" tail
+    started = time.perf_counter()
+    stats = compute_player_stats(players, points=None)
+    index = PlayerIndex(stats.columns)
+    build = time.perf_counter() - started
+
+    table = pd.DataFrame(stats.columns).assign(row=np.arange(len(players)))
+
+    # Sanity check: same totals and the same rows (up to ties in descending order)
+    for query in queries[:200]:
+        page = index.query(query)
+        expected = scan_query(table, query)
+        assert len(page.rows) == len(expected), query
+        sort_values = index.columns[query.sort]
+        assert np.array_equal(sort_values[page.rows], sort_values[expected], equal_nan=True), query
+
+    print(f"\n{args.players} players, {args.queries} queries (stats + index built in {build * 1e3:.1f} ms)")
+    print(f"{'path':<8} {'µs/query':>10} {'queries/s':>11}")
+
+    for name, run in (
+        ("scan", lambda query: scan_query(table, query)),
+        ("index", index.query),
+    ):
+        started = time.perf_counter()
+        for query in queries:
+            run(query)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<8} {elapsed / len(queries) * 1e6:>10.1f} {len(queries) / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
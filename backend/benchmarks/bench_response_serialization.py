@@ -0,0 +1,135 @@
+"""
+Benchmark: rendering route responses to JSON bytes.
+
+Compares per route (realistic response sizes):
+- fastapi: what FastAPI does with a returned model - model_dump(by_alias) ->
+           validate against response_model -> dump to JSON-compatible data ->
+           json.dumps (JSONResponse.render)
+- fast:    FastJSONResponse - pydantic-core straight to bytes (app/responses.py)
+
+Routes served from a snapshot (dashboard, table - see app/snapshots.py)
+don't serialize at all on a hit; this is the cost of every snapshot miss.
+
+Usage (from backend/):
+    python -m benchmarks.bench_response_serialization
+    python -m benchmarks.bench_response_serialization --number 5000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.kickbase.models import KickbaseSquadResponse
+from app.models.dashboard import DashboardLineup, DashboardOverview, DashboardResponse, PlayerSummary
+from app.models.players import PlayerListResponse
+from app.models.public import BundesligaTableResponse, TeamStanding
+from app.responses import render_json
+from benchmarks.payloads import TEAM_IDS, squad_payload
+
+
+def player_summaries(count: int) -> list[PlayerSummary]:
+    """PlayerSummary objects like the dashboard and the player search build them."""
+    squad = KickbaseSquadResponse.model_validate(squad_payload(count))
+    return [
+        PlayerSummary(
+            id=player.id,
+            name=player.name,
+            position=player.position,
+            team_id=player.team_id,
+            profile_image=player.profile_image,
+            market_value=player.market_value,
+            total_points=player.total_points,
+            avg_points=player.avg_points,
+            euros_per_point=player.market_value / player.avg_points if player.avg_points else None,
+            points_per_million=player.total_points / (player.market_value / 1e6),
+            form=player.avg_points * 0.9,
+            form_trend=-0.1 * player.avg_points,
+        )
+        for player in squad.players
+    ]
+
+
+def dashboard_response() -> DashboardResponse:
+    players = player_summaries(30)
+    return DashboardResponse(
+        overview=DashboardOverview(
+            rank=3, total_managers=18, avg_points_per_matchday=812.4, team_value=182_000_000, budget=4_500_000
+        ),
+        best_value_players=players[:3],
+        worst_value_players=players[-3:],
+        lineup=DashboardLineup(formation="4-4-2", starting=players[:11], bench=players[11:]),
+    )
+
+
+def table_response() -> BundesligaTableResponse:
+    return BundesligaTableResponse(
+        season="2024",
+        standings=[
+            TeamStanding(
+                position=i + 1,
+                team_name=f"Team {team_id}",
+                short_name=f"T{team_id}",
+                team_icon_url=f"https://example.com/icons/{team_id}.png",
+                points=60 - i * 3,
+                matches=30,
+                won=18 - i,
+                draw=6,
+                lost=6 + i,
+                goals=60 - i,
+                opponent_goals=30 + i,
+                goal_diff=30 - 2 * i,
+            )
+            for i, team_id in enumerate(TEAM_IDS)
+        ],
+    )
+
+
+def players_response() -> PlayerListResponse:
+    return PlayerListResponse(total=600, offset=0, limit=100, players=player_summaries(100))
+
+
+def fastapi_render(model: BaseModel, adapter: TypeAdapter) -> bytes:
+    """FastAPI's response path for a returned model with response_model set."""
+    data = model.model_dump(by_alias=True)
+    value = adapter.validate_python(data)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def cpu_time(func: Callable[[], Any], number: int) -> float:
+    """CPU seconds per call."""
+    started = time.process_time()
+    for _ in range(number):
+        func()
+    return (time.process_time() - started) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="renders per route and path")
+    args = parser.parse_args()
+
+    routes = {
+        "GET /api/leagues/{id}/dashboard": dashboard_response(),
+        "GET /api/table": table_response(),
+        "GET /api/players (limit=100)": players_response(),
+    }
+
+    print(f"\n{'route':<34} {'bytes':>7} {'fastapi µs':>11} {'fast µs':>9} {'speedup':>8}")
+    for route, model in routes.items():
+        adapter = TypeAdapter(type(model))
+
+        # Same JSON either way (key order and values)
+        body = render_json(model)
+        assert json.loads(body) == json.loads(fastapi_render(model, adapter)), route
+
+        slow = cpu_time(lambda: fastapi_render(model, adapter), args.number)
+        fast = cpu_time(lambda: render_json(model), args.number)
+        print(f"{route:<34} {len(body):>7} {slow * 1e6:>11.1f} {fast * 1e6:>9.1f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
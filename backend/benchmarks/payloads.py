@@ -0,0 +1,92 @@
+"""
+Realistic fake Kickbase payloads for benchmarks.
+
+Shapes and field aliases match what Kickbase sends (see app/kickbase/models/).
+A fixed random seed keeps results comparable between runs.
+"""
+
+import random
+
+TEAM_IDS = [str(team_id) for team_id in range(2, 20)]
+
+
+def squad_payload(players: int = 30, seed: int = 42) -> dict:
+    """Raw JSON of GET /leagues/{id}/squad (big squad by default)."""
+    rng = random.Random(seed)
+    return {
+        "it": [
+            {
+                "i": str(1000 + i),
+                "n": f"Player {i}",
+                "pos": rng.randint(1, 4),
+                "mv": rng.randint(500_000, 60_000_000),
+                "mvt": rng.randint(0, 2),
+                "mvgl": rng.randint(-5_000_000, 5_000_000),
+                "p": rng.randint(0, 3000),
+                "ap": rng.randint(0, 150),
+                "tid": rng.choice(TEAM_IDS),
+                "pim": f"content/file/player-{i}.png",
+                "st": rng.choice([0, 0, 0, 1, 2]),
+                "lst": 0,
+                "mdst": 0,
+                "stl": [rng.randint(0, 4) for _ in range(5)],
+                "lo": rng.randint(0, 11),
+                "iotm": rng.random() < 0.1,
+                "ofc": rng.randint(0, 3),
+                "prob": rng.randint(1, 5),
+            }
+            for i in range(players)
+        ]
+    }
+
+
+def ranking_payload(users: int = 18, seed: int = 42) -> dict:
+    """Raw JSON of GET /leagues/{id}/ranking (full 18-manager league by default)."""
+    rng = random.Random(seed)
+    return {
+        "us": [
+            {
+                "i": str(5000 + i),
+                "n": f"Manager {i}",
+                "adm": i == 0,
+                "sp": rng.randint(500, 40_000),
+                "mdp": rng.randint(0, 1500),
+                "tv": float(rng.randint(50_000_000, 250_000_000)),
+                "spl": i + 1,
+                "mdpl": rng.randint(1, users),
+                "pa": True,
+                "lp": [rng.randint(1000, 9999) for _ in range(11)],
+                "iapl": False,
+            }
+            for i in range(users)
+        ],
+        "day": 17,
+        "cpi": "1",
+        "ti": "Benchmark League",
+        "sn": "25/26",
+        "il": False,
+    }
+
+
+def competition_players_payload(players: int = 600, seed: int = 42) -> dict:
+    """Raw JSON of GET /competitions/{id}/players (a full Bundesliga season by default)."""
+    rng = random.Random(seed)
+    return {
+        "it": [
+            {
+                "i": str(1000 + i),
+                "n": f"Player {i}",
+                "pos": rng.choice([1, 2, 2, 2, 3, 3, 3, 4, 4]),
+                "tid": rng.choice(TEAM_IDS),
+                "mv": rng.randint(500_000, 60_000_000),
+                "mvt": rng.randint(0, 2),
+                "p": points,
+                "ap": points // rng.randint(10, 30),
+                "st": rng.choice([0, 0, 0, 0, 1, 2, 4]),
+                "pim": f"content/file/player-{i}.png",
+            }
+            for i in range(players)
+            # Bench players and new signings have no points yet
+            for points in [0 if rng.random() < 0.15 else rng.randint(1, 3000)]
+        ]
+    }
@@ -0,0 +1,42 @@
+"""
+Shared test setup.
+
+Tests run without Redis, Kickbase or OpenLigaDB: upstream HTTP goes through
+httpx.MockTransport, Redis through fakeredis (the `redis` fixture).
+"""
+
+import os
+
+# Settings are read on import - set the required ones before any app module loads
+os.environ.setdefault("CACHE_KEY_SECRET", "test-secret")
+
+import fakeredis  # noqa: E402
+import pytest  # noqa: E402
+
+from app.cache import backend, namespaces  # noqa: E402
+from app.cache.local import local_cache  # noqa: E402
+
+
+@pytest.fixture
+async def redis(monkeypatch):
+    """
+    In-memory Redis behind the app's text and binary clients.
+
+    Also resets what workers keep between calls (L1, generations, breaker).
+    """
+    server = fakeredis.FakeServer()
+    text = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    binary = fakeredis.FakeAsyncRedis(server=server)
+
+    monkeypatch.setattr(backend, "_redis_client", text)
+    monkeypatch.setattr(backend, "_redis_binary_client", binary)
+    monkeypatch.setattr(backend, "breaker", backend.CircuitBreaker("redis", failure_threshold=5, cooldown=10))
+    local_cache.clear()
+    namespaces._local_generations.clear()
+
+    yield text
+
+    local_cache.clear()
+    namespaces._local_generations.clear()
+    await text.aclose()
+    await binary.aclose()
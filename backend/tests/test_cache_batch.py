@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.cache import cached, fetch_many
+from app.cache.decorator import _inflight
+from app.fanout import DeadlineExceeded
+
+# slow_value() waits for this (a new event per test - events bind to a loop)
+gate = {"release": asyncio.Event()}
+calls = {"fast": 0, "slow": 0}
+
+
+@cached(ttl=60)
+async def fast_value(name: str) -> dict:
+    calls["fast"] += 1
+    return {"name": name}
+
+
+@cached(ttl=60)
+async def slow_value(name: str) -> dict:
+    calls["slow"] += 1
+    await gate["release"].wait()
+    return {"name": name, "slow": True}
+
+
+@cached(ttl=60)
+async def failing_value(name: str) -> dict:
+    await asyncio.sleep(0.01)
+    raise RuntimeError("upstream down")
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    gate["release"] = asyncio.Event()
+    calls.update(fast=0, slow=0)
+
+
+async def stored_keys(redis) -> list[str]:
+    return sorted(await redis.keys("*"))
+
+
+async def finish_slow_load() -> None:
+    """Let the shielded load outliving the batch finish."""
+    tasks = list(_inflight.values())
+    gate["release"].set()
+    await asyncio.gather(*tasks)
+
+
+async def test_batch_stores_all_values_and_releases_locks(redis):
+    gate["release"].set()
+
+    fast, slow = await fetch_many(fast_value.defer("a"), slow_value.defer("b"))
+
+    assert fast == {"name": "a"} and slow == {"name": "b", "slow": True}
+    keys = await stored_keys(redis)
+    assert not [key for key in keys if key.startswith("lock:")]
+    assert len([key for key in keys if ":fast_value:" in key or ":slow_value:" in key]) == 2
+
+    # Second batch: all hits
+    await fetch_many(fast_value.defer("a"), slow_value.defer("b"))
+    assert calls == {"fast": 1, "slow": 1}
+
+
+async def test_load_outliving_the_deadline_stores_and_unlocks_itself(redis):
+    with pytest.raises(DeadlineExceeded):
+        await fetch_many(fast_value.defer("a"), slow_value.defer("b"), deadline=0.05)
+
+    # The batch stored what finished; the slow load still holds its lock
+    keys = await stored_keys(redis)
+    assert any(":fast_value:" in key for key in keys)
+    assert any(key.startswith("lock:") and ":slow_value:" in key for key in keys)
+
+    await finish_slow_load()
+
+    keys = await stored_keys(redis)
+    assert any(key.startswith("cache:slow_value:") for key in keys)
+    assert not [key for key in keys if key.startswith("lock:")]
+
+    # Served from the cache now - no second upstream call
+    assert await slow_value("b") == {"name": "b", "slow": True}
+    assert calls["slow"] == 1
+
+
+async def test_load_outliving_a_failed_sibling_stores_and_unlocks_itself(redis):
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await fetch_many(failing_value.defer("a"), slow_value.defer("b"))
+    assert calls["slow"] == 1
+
+    await finish_slow_load()
+
+    keys = await stored_keys(redis)
+    assert any(key.startswith("cache:slow_value:") for key in keys)
+    assert not [key for key in keys if key.startswith("lock:")]
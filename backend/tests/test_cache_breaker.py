@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from app.cache import RedisUnavailable, backend, cached, redis_call
+from app.cache.breaker import CircuitBreaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, cooldown=10)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the count
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_lets_one_trial_call_through_after_the_cooldown(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=10)
+    breaker.record_failure()
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+
+    # Trial failed - another full cooldown
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 22)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_cancelled_trial_does_not_block_the_next_one(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=10)
+    breaker.record_failure()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+
+
+@pytest.fixture
+def redis_down(redis):
+    """Make the fake Redis refuse connections."""
+    server = redis.connection_pool.connection_kwargs["server"]
+    server.connected = False
+    yield
+    server.connected = True
+
+
+calls = []
+
+
+@cached(ttl=60)
+async def get_fixtures(matchday: int) -> list[int]:
+    calls.append(matchday)
+    return [matchday]
+
+
+async def test_redis_call_fails_fast_once_the_breaker_is_open(redis, redis_down):
+    for _ in range(backend.breaker.failure_threshold):
+        with pytest.raises(Exception) as error:
+            async with redis_call() as redis_client:
+                await redis_client.get("key")
+        assert not isinstance(error.value, RedisUnavailable)
+
+    assert backend.breaker.state == "open"
+    with pytest.raises(RedisUnavailable):
+        async with redis_call():
+            pass
+
+
+async def test_cached_functions_keep_working_without_redis(redis, redis_down):
+    calls.clear()
+
+    for _ in range(10):
+        assert await get_fixtures(5) == [5]
+
+    # Every call computes (nothing can be cached), none of them fails
+    assert calls == [5] * 10
+    assert backend.breaker.state == "open"
+
+
+async def test_script_errors_do_not_open_the_breaker(redis):
+    for _ in range(backend.breaker.failure_threshold + 1):
+        with pytest.raises(Exception):
+            async with redis_call() as redis_client:
+                await redis_client.eval("return redis.call('NOSUCHCOMMAND')", 0)
+
+    assert backend.breaker.state == "closed"
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from app.cache import settings
+from app.cache.codecs import CODECS, ValueType
+from app.cache.compression import FLAG_LZ4, FLAG_ZSTD, compress, decompress
+from app.cache.entry import decode_entry, encode_entry
+
+LARGE = b'{"players": [' + b'{"id": "1", "points": 120}, ' * 200 + b"]}"
+
+
+@pytest.mark.parametrize(("algorithm", "flag"), [("zstd", FLAG_ZSTD), ("lz4", FLAG_LZ4)])
+def test_large_payloads_are_compressed(monkeypatch, algorithm, flag):
+    monkeypatch.setattr(settings, "compression", algorithm)
+
+    stored, flags = compress(LARGE)
+
+    assert flags == flag
+    assert len(stored) < len(LARGE)
+    assert decompress(stored, flags) == LARGE
+
+
+def test_small_payloads_are_stored_raw(monkeypatch):
+    monkeypatch.setattr(settings, "compression", "zstd")
+    small = LARGE[: settings.compression_threshold - 1]
+
+    assert compress(small) == (small, 0)
+
+
+def test_incompressible_payloads_are_stored_raw(monkeypatch):
+    monkeypatch.setattr(settings, "compression", "zstd")
+    noise = os.urandom(4096)
+
+    assert compress(noise) == (noise, 0)
+
+
+def test_entries_decode_whatever_compression_wrote_them(monkeypatch):
+    value_type = ValueType(list[dict[str, int]])
+    value = [{"points": points} for points in range(500)]
+
+    entries = []
+    for algorithm in ("zstd", "lz4", "none"):
+        monkeypatch.setattr(settings, "compression", algorithm)
+        entries.append(encode_entry(value, value_type, CODECS["orjson"], delta=0.0))
+
+    # Switching the setting never makes old entries unreadable
+    assert len({len(raw) for raw in entries}) == 3
+    for raw in entries:
+        assert decode_entry(raw, value_type).value == value
@@ -0,0 +1,144 @@
+import json
+from datetime import datetime
+
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from app.cache.codecs import CODECS, ValueType
+from app.cache.entry import FORMAT_VERSION, SchemaMismatch, decode_entry, encode_entry
+
+
+class Player(BaseModel):
+    id: str
+    points: int
+    injured: bool | None = None
+
+
+class Squad(BaseModel):
+    league: str
+    players: list[Player]
+    prices: dict[str, int]
+
+
+class SquadV2(BaseModel):
+    league: str
+    players: list[Player]
+    prices: dict[str, int]
+    budget: int = 0
+
+
+class Transfer(BaseModel):
+    player: str
+    at: datetime
+
+
+SQUAD = Squad(
+    league="7",
+    players=[Player(id="1", points=120, injured=False), Player(id="2", points=-4)],
+    prices={"1": 5_000_000, "2": 750_000},
+)
+
+
+@pytest.mark.parametrize("codec_name", sorted(CODECS))
+def test_round_trip_with_every_codec(codec_name):
+    codec = CODECS[codec_name]
+    value_type = ValueType(Squad)
+
+    raw = encode_entry(SQUAD, value_type, codec, delta=0.25)
+    entry = decode_entry(raw, value_type)
+
+    assert raw[0] == FORMAT_VERSION
+    assert entry.value == SQUAD
+    assert isinstance(entry.value.players[0], Player)
+    assert entry.delta == 0.25
+    assert entry.age() < 1
+
+
+@pytest.mark.parametrize("codec_name", sorted(CODECS))
+def test_round_trip_of_plain_values(codec_name):
+    value_type = ValueType(dict[str, list[int]])
+    value = {"a": [1, 2], "b": []}
+
+    raw = encode_entry(value, value_type, CODECS[codec_name], delta=0.0)
+
+    assert decode_entry(raw, value_type).value == value
+
+
+def test_trusted_codecs_skip_validation():
+    value_type = ValueType(Squad)
+    assert value_type.trusted
+
+    # Data we wrote ourselves is constructed as-is - a broken field isn't noticed
+    data = {"league": "7", "players": [{"id": "1", "points": "not a number"}], "prices": {}}
+    squad = value_type.rehydrate(data)
+    assert isinstance(squad, Squad)
+    assert isinstance(squad.players[0], Player)
+    assert squad.players[0].points == "not a number"
+
+    # ...while the validating codecs reject it
+    raw = CODECS["json"].encode(SQUAD, value_type)
+    with pytest.raises(ValueError):
+        CODECS["json"].decode(raw.replace(b"120", b'"x"'), value_type)
+
+
+def test_types_that_need_validation_are_not_trusted():
+    value_type = ValueType(Transfer)
+    transfer = Transfer(player="1", at=datetime(2026, 8, 1, 12, 30))
+
+    assert not value_type.trusted
+
+    raw = encode_entry(transfer, value_type, CODECS["orjson"], delta=0.0)
+    assert decode_entry(raw, value_type).value.at == datetime(2026, 8, 1, 12, 30)
+
+
+def test_entry_written_for_another_model_shape_is_a_mismatch():
+    raw = encode_entry(SQUAD, ValueType(Squad), CODECS["orjson"], delta=0.0)
+
+    with pytest.raises(SchemaMismatch):
+        decode_entry(raw, ValueType(SquadV2))
+
+
+def test_fingerprint_ignores_the_header():
+    value_type = ValueType(Squad)
+    first = decode_entry(encode_entry(SQUAD, value_type, CODECS["orjson"], delta=0.1), value_type)
+    second = decode_entry(encode_entry(SQUAD, value_type, CODECS["orjson"], delta=2.0), value_type)
+    changed = SQUAD.model_copy(update={"league": "8"})
+    third = decode_entry(encode_entry(changed, value_type, CODECS["orjson"], delta=0.1), value_type)
+
+    assert first.fingerprint == second.fingerprint
+    assert first.fingerprint != third.fingerprint
+
+
+def test_legacy_plain_json_entry_still_decodes():
+    raw = json.dumps(SQUAD.model_dump()).encode()
+
+    entry = decode_entry(raw, ValueType(Squad))
+
+    assert entry.value == SQUAD
+    assert entry.created_at is None
+    assert entry.age() == 0
+
+
+def test_legacy_envelope_entry_still_decodes():
+    raw = orjson.dumps({"_c": 1, "v": SQUAD.model_dump(), "t": 1_700_000_000.0, "d": 0.4})
+
+    entry = decode_entry(raw, ValueType(Squad))
+
+    assert entry.value == SQUAD
+    assert entry.created_at == 1_700_000_000.0
+    assert entry.delta == 0.4
+
+
+def test_legacy_list_entry_still_decodes():
+    raw = json.dumps([{"id": "1", "points": 3}]).encode()
+
+    assert decode_entry(raw, ValueType(list[Player])).value == [Player(id="1", points=3)]
+
+
+def test_unknown_format_version_is_rejected():
+    raw = bytearray(encode_entry(SQUAD, ValueType(Squad), CODECS["orjson"], delta=0.0))
+    raw[0] = 9
+
+    with pytest.raises(ValueError, match="format"):
+        decode_entry(bytes(raw), ValueType(Squad))
@@ -0,0 +1,80 @@
+import pytest
+from jose import jwt
+
+from app.cache import bump_generation
+from app.cache.config import settings
+from app.cache.keys import KeyBuilder, check_key_secret, user_identity, user_namespace
+
+
+def kickbase_token(user_id: str, signing_key: str = "kickbase") -> str:
+    return jwt.encode({"kb.uid": user_id, "sub": user_id}, signing_key, algorithm="HS256")
+
+
+def test_identity_is_keyed_on_the_whole_token():
+    token = kickbase_token("1001")
+
+    assert user_identity(token) == user_identity(token)
+    assert user_identity(token) != user_identity(kickbase_token("1002"))
+    assert token not in user_identity(token)
+
+
+def test_forged_claims_do_not_share_another_users_identity():
+    genuine = kickbase_token("1001")
+    forged = kickbase_token("1001", signing_key="attacker")
+
+    assert user_identity(forged) != user_identity(genuine)
+    assert user_namespace("42", forged) != user_namespace("42", genuine)
+
+
+def test_identity_depends_on_the_secret(monkeypatch):
+    token = kickbase_token("1001")
+    before = user_identity(token)
+
+    monkeypatch.setattr(settings, "key_secret", "other-secret")
+    assert user_identity(token) != before
+
+
+@pytest.mark.parametrize("secret", ["", "   "])
+def test_startup_refuses_an_empty_secret(monkeypatch, secret):
+    monkeypatch.setattr(settings, "key_secret", secret)
+    with pytest.raises(RuntimeError, match="CACHE_KEY_SECRET"):
+        check_key_secret()
+
+
+def test_startup_accepts_a_secret():
+    check_key_secret()
+
+
+async def get_squad(league_id: str, token: str, detailed: bool = False): ...
+
+
+async def get_table(season: str): ...
+
+
+async def test_user_scoped_key_never_contains_the_token(redis):
+    builder = KeyBuilder(get_squad, scope="user")
+    token = kickbase_token("1001")
+
+    positional = await builder.build(("42", token), {})
+    by_keyword = await builder.build((), {"token": token, "league_id": "42"})
+
+    assert positional.key == by_keyword.key
+    assert token not in positional.key
+    assert positional.key.startswith(f"league:42:user:{user_identity(token)}:get_squad:False@")
+    assert positional.namespaces == ("all", "fn:get_squad", "league:42", user_namespace("42", token))
+
+
+async def test_generation_bump_changes_the_key(redis):
+    builder = KeyBuilder(get_table, scope="global")
+    before = await builder.build(("2024",), {})
+
+    await bump_generation("fn:get_table")
+    after = await builder.build(("2024",), {})
+
+    assert before.key == "cache:get_table:2024@0.0"
+    assert after.key == "cache:get_table:2024@0.1"
+
+
+def test_user_scope_requires_token_argument():
+    with pytest.raises(TypeError, match="token"):
+        KeyBuilder(get_table, scope="user")
@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+from app.cache import cached, local_cache
+from app.cache.backend import WORKER_ID
+from app.cache.local import LocalCache, _handle_invalidation
+from app.cache.namespaces import _local_generations
+
+
+def make_cache(max_entries: int = 3, max_bytes: int = 1000, ttl: float = 60) -> LocalCache:
+    cache = LocalCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+    cache.active = True
+    return cache
+
+
+def test_evicts_least_recently_used_entry():
+    cache = make_cache(max_entries=2)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=10)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3, size=10)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_evicts_until_within_byte_budget():
+    cache = make_cache(max_entries=10, max_bytes=100)
+    cache.set("a", 1, size=40)
+    cache.set("b", 2, size=40)
+    cache.set("c", 3, size=40)
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 80
+
+    # Bigger than the whole budget - not stored at all
+    cache.set("huge", 4, size=101)
+    assert cache.get("huge") is None
+    assert cache.size_bytes == 80
+
+
+def test_entries_expire(monkeypatch):
+    cache = make_cache(ttl=60)
+    cache.set("short", 1, size=1, ttl=5)
+    cache.set("capped", 2, size=1, ttl=600)  # capped at the cache's ttl
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("short") is None
+    assert cache.get("capped") == 2
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert cache.get("capped") is None
+    assert cache.size_bytes == 0
+
+
+def test_inactive_cache_stores_and_serves_nothing():
+    cache = make_cache()
+    cache.active = False
+    cache.set("a", 1, size=1)
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_invalidate_key_or_pattern():
+    cache = make_cache(max_entries=10)
+    cache.set("cache:get_squad:1", 1, size=1)
+    cache.set("cache:get_squad:2", 2, size=1)
+    cache.set("cache:get_ranking:1", 3, size=1)
+
+    assert cache.invalidate("cache:get_ranking:1") == 1
+    assert cache.invalidate("cache:get_ranking:1") == 0
+    assert cache.invalidate("cache:get_squad:*") == 2
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+@pytest.fixture
+def active_l1():
+    local_cache.clear()
+    local_cache.active = True
+    yield local_cache
+    local_cache.active = False
+    local_cache.clear()
+
+
+def test_invalidation_messages_from_other_workers(active_l1):
+    active_l1.set("cache:get_squad:1", 1, size=1)
+    active_l1.set("cache:get_squad:2", 2, size=1)
+
+    _handle_invalidation(f"{WORKER_ID} key cache:get_squad:*")  # our own message - already applied
+    assert len(active_l1) == 2
+
+    _handle_invalidation("other-worker key cache:get_squad:1")
+    assert active_l1.get("cache:get_squad:1") is None
+    assert active_l1.get("cache:get_squad:2") == 2
+
+
+def test_generation_messages_from_other_workers(redis):
+    _handle_invalidation("other-worker gen league:7 3")
+    assert _local_generations["league:7"][0] == 3
+
+    # Out of order - never go back to an older generation
+    _handle_invalidation("other-worker gen league:7 2")
+    assert _local_generations["league:7"][0] == 3
+
+
+calls = []
+
+
+@cached(ttl=60)
+async def get_matchday(league_id: str) -> dict:
+    calls.append(league_id)
+    return {"league": league_id}
+
+
+async def test_hits_are_served_from_l1_without_redis(redis, active_l1):
+    calls.clear()
+    await get_matchday("1")
+    # First read after the write comes from Redis and fills L1
+    await get_matchday("1")
+    await redis.flushall()
+
+    assert await get_matchday("1") == {"league": "1"}
+    assert calls == ["1"]
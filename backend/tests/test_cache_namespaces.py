@@ -0,0 +1,123 @@
+import pytest
+
+from app.cache import (
+    cached,
+    clear_cache,
+    estimate_live_keys,
+    invalidate_league,
+    invalidate_namespace,
+    invalidate_user,
+    namespace_type,
+)
+from app.cache.namespaces import _local_generations
+
+calls = []
+
+
+@cached(ttl=60, scope="user")
+async def get_lineup(league_id: str, token: str) -> dict:
+    calls.append(("lineup", league_id, token))
+    return {"league": league_id, "load": len(calls)}
+
+
+@cached(ttl=60, scope="league")
+async def get_standings(league_id: str) -> dict:
+    calls.append(("standings", league_id))
+    return {"league": league_id, "load": len(calls)}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+async def load_all():
+    return [
+        await get_lineup("1", "token-a"),
+        await get_lineup("1", "token-b"),
+        await get_lineup("2", "token-a"),
+        await get_standings("1"),
+        await get_standings("2"),
+    ]
+
+
+async def reloaded_after(invalidate) -> list[tuple]:
+    """Which calls hit upstream again after `invalidate` ran."""
+    await load_all()
+    calls.clear()
+    await invalidate()
+    await load_all()
+    return calls
+
+
+async def no_bump():
+    pass
+
+
+async def test_nothing_reloads_without_a_bump(redis):
+    assert await reloaded_after(no_bump) == []
+
+
+async def test_user_bump_misses_only_that_users_keys(redis):
+    reloaded = await reloaded_after(lambda: invalidate_user("1", "token-a"))
+
+    assert reloaded == [("lineup", "1", "token-a")]
+
+
+async def test_league_bump_misses_the_league_and_its_users(redis):
+    reloaded = await reloaded_after(lambda: invalidate_league("1"))
+
+    assert reloaded == [("lineup", "1", "token-a"), ("lineup", "1", "token-b"), ("standings", "1")]
+
+
+async def test_function_bump_misses_only_that_function(redis):
+    reloaded = await reloaded_after(lambda: clear_cache("get_standings"))
+
+    assert reloaded == [("standings", "1"), ("standings", "2")]
+
+
+async def test_global_bump_misses_everything(redis):
+    reloaded = await reloaded_after(clear_cache)
+
+    assert len(reloaded) == 5
+
+
+async def test_bump_keeps_old_entries_until_they_expire(redis):
+    await get_standings("1")
+    old_keys = set(await redis.keys("league:1:*"))
+
+    assert await invalidate_namespace("league:1") == 1
+    await get_standings("1")
+
+    assert old_keys < set(await redis.keys("league:1:*"))
+    assert await redis.get("gen:league:1") == "1"
+
+
+async def test_bump_by_another_worker_is_picked_up(redis):
+    await get_standings("1")
+    calls.clear()
+
+    # Another worker bumped the league; our in-process copy of the generation is outdated
+    await redis.incr("gen:league:1")
+    _local_generations.clear()
+
+    await get_standings("1")
+    assert calls == [("standings", "1")]
+
+
+async def test_estimate_counts_only_the_current_generation(redis):
+    for league in ("1", "2", "3"):
+        await get_standings(league)
+    await invalidate_namespace("fn:get_standings")
+    await get_standings("1")
+
+    estimate = await estimate_live_keys("fn:get_standings", sample_size=100)
+
+    assert estimate["total_keys"] == 5  # 4 entries + the generation counter
+    assert 0 < estimate["matched"] < estimate["sampled"]
+
+
+@pytest.mark.parametrize("namespace", ["", "fn:", "league:", "league:1:user:", "user:1", "team:1"])
+def test_invalid_namespaces_are_rejected(namespace):
+    with pytest.raises(ValueError):
+        namespace_type(namespace)
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.cache import cached
+from app.cache.decorator import _inflight
+from app.cache.entry import encode_entry
+
+calls = []
+
+
+@cached(ttl=60)
+async def get_team(team_id: str) -> dict:
+    calls.append(team_id)
+    await asyncio.sleep(0.05)
+    if team_id == "broken":
+        raise RuntimeError("upstream down")
+    return {"id": team_id, "load": len(calls)}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+async def cache_key(*args) -> str:
+    return (await get_team.cache_policy.keys.build(args, {})).key
+
+
+async def test_concurrent_callers_share_one_load(redis):
+    results = await asyncio.gather(*(get_team("7") for _ in range(20)))
+
+    assert calls == ["7"]
+    assert all(result == {"id": "7", "load": 1} for result in results)
+    assert not _inflight
+
+
+async def test_different_keys_load_separately(redis):
+    await asyncio.gather(get_team("7"), get_team("8"), get_team("7"))
+
+    assert sorted(calls) == ["7", "8"]
+
+
+async def test_refresh_lock_is_released_after_the_load(redis):
+    await get_team("7")
+
+    assert await redis.keys("lock:*") == []
+    assert await redis.exists(await cache_key("7"))
+
+
+async def test_failed_load_reaches_every_caller_and_is_not_cached(redis):
+    results = await asyncio.gather(*(get_team("broken") for _ in range(5)), return_exceptions=True)
+
+    assert calls == ["broken"]
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await redis.keys("*") == []
+
+    # Nothing cached - the next call tries again
+    with pytest.raises(RuntimeError):
+        await get_team("broken")
+    assert len(calls) == 2
+
+
+async def test_waits_for_the_worker_holding_the_lock(redis):
+    key = await cache_key("7")
+    await redis.set(f"lock:{key}", "other-worker", px=10_000)
+
+    async def other_worker_finishes():
+        await asyncio.sleep(0.1)
+        policy = get_team.cache_policy
+        await redis.set(key, encode_entry({"id": "7", "load": "other"}, policy.value_type, policy.codec, 0.0))
+        await redis.delete(f"lock:{key}")
+
+    finisher = asyncio.create_task(other_worker_finishes())
+    result = await get_team("7")
+    await finisher
+
+    assert result == {"id": "7", "load": "other"}
+    assert calls == []
+
+
+async def test_loads_itself_when_the_lock_holder_gives_up(redis):
+    key = await cache_key("7")
+    await redis.set(f"lock:{key}", "other-worker", px=10_000)
+
+    async def other_worker_fails():
+        await asyncio.sleep(0.1)
+        await redis.delete(f"lock:{key}")
+
+    failer = asyncio.create_task(other_worker_fails())
+    result = await get_team("7")
+    await failer
+
+    assert result == {"id": "7", "load": 1}
+    assert calls == ["7"]
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from app.cache import cached
+from app.cache.decorator import _inflight, _needs_refresh
+from app.cache.entry import CacheEntry, encode_entry
+
+gate = {}
+calls = []
+
+
+@cached(ttl=10, stale_ttl=60)
+async def get_table(league_id: str) -> dict:
+    calls.append(league_id)
+    await gate["release"].wait()
+    return {"league": league_id, "version": "new"}
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    calls.clear()
+    gate["release"] = asyncio.Event()
+
+
+async def store_entry(redis, value: dict, age: float) -> str:
+    """Write an entry for get_table("1") that was computed `age` seconds ago."""
+    policy = get_table.cache_policy
+    key = (await policy.keys.build(("1",), {})).key
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(time, "time", lambda now=time.time(): now - age)
+        raw = encode_entry(value, policy.value_type, policy.codec, 0.5)
+    await redis.set(key, raw)
+    return key
+
+
+async def test_stale_value_is_served_while_the_refresh_runs(redis):
+    key = await store_entry(redis, {"league": "1", "version": "old"}, age=30)
+
+    # Returns right away even though the upstream call is still blocked
+    result = await asyncio.wait_for(get_table("1"), timeout=1)
+    assert result == {"league": "1", "version": "old"}
+
+    refresh = _inflight[key]
+    await asyncio.sleep(0.05)  # let the refresh reach the upstream call
+    assert calls == ["1"]
+
+    # Other callers keep getting the stale value and don't start another refresh
+    assert await get_table("1") == {"league": "1", "version": "old"}
+    assert calls == ["1"]
+
+    gate["release"].set()
+    await refresh
+
+    entry = await get_table.cached_entry("1")
+    assert entry.value == {"league": "1", "version": "new"}
+    assert entry.age() < 1
+    assert key not in _inflight
+
+
+async def test_fresh_value_is_served_without_refresh(redis):
+    key = await store_entry(redis, {"league": "1", "version": "old"}, age=2)
+
+    assert await get_table("1") == {"league": "1", "version": "old"}
+    assert calls == []
+    assert key not in _inflight
+
+
+async def test_entries_are_kept_for_ttl_plus_stale_ttl(redis):
+    gate["release"].set()
+    await get_table("1")
+
+    key = (await get_table.cache_policy.keys.build(("1",), {})).key
+    assert 60 < await redis.ttl(key) <= 70
+
+
+def test_xfetch_refreshes_early_on_a_low_draw(monkeypatch):
+    entry = CacheEntry(value=None, created_at=time.time() - 8, delta=1.0)
+
+    # -log(0.5) * 1.0 * 1.0 = 0.69s - not enough to reach the TTL of 10s
+    monkeypatch.setattr("app.cache.decorator.random.random", lambda: 0.5)
+    assert not _needs_refresh(entry, ttl=10, early_refresh=1.0)
+
+    # -log(0.01) = 4.6s - age 8 + 4.6 >= 10
+    monkeypatch.setattr("app.cache.decorator.random.random", lambda: 0.01)
+    assert _needs_refresh(entry, ttl=10, early_refresh=1.0)
+
+
+def test_no_early_refresh_when_disabled(monkeypatch):
+    monkeypatch.setattr("app.cache.decorator.random.random", lambda: 1e-12)
+    entry = CacheEntry(value=None, created_at=time.time() - 9, delta=5.0)
+
+    assert not _needs_refresh(entry, ttl=10, early_refresh=0.0)
+    assert not _needs_refresh(CacheEntry(value=None, created_at=None), ttl=10, early_refresh=1.0)
+    assert _needs_refresh(CacheEntry(value=None, created_at=time.time() - 11), ttl=10, early_refresh=0.0)
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.kickbase import client as kickbase_client
+from app.kickbase import retry
+from app.kickbase.client import KickbaseClient
+from app.kickbase.config import config
+from app.kickbase.exceptions import NotFoundError, RateLimitError, ServerError
+from app.kickbase.retry import RetryBudget, parse_retry_after
+
+
+def http_date(seconds_from_now: float) -> str:
+    return format_datetime(datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now), usegmt=True)
+
+
+@pytest.mark.parametrize("value, expected", [("120", 120.0), (" 5 ", 5.0), ("0", 0.0)])
+def test_retry_after_delta_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_retry_after_http_date():
+    assert parse_retry_after(http_date(60)) == pytest.approx(60, abs=2)
+
+
+def test_retry_after_past_date_means_now():
+    assert parse_retry_after(http_date(-3600)) == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "-5", "1.5", "Wed, 99 Foo 2015"])
+def test_retry_after_garbage_is_ignored(value):
+    assert parse_retry_after(value) is None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_budget_allows_minimum_plus_ratio_of_requests(clock):
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=10.0)
+    for _ in range(4):
+        budget.record_request()
+
+    # 1 always + 0.5 * 4 requests
+    assert [budget.try_spend() for _ in range(4)] == [True, True, True, False]
+
+
+def test_budget_refills_when_the_window_passes(clock):
+    budget = RetryBudget(ratio=0.0, min_retries=2, window=10.0)
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+    clock.now += 5
+    assert not budget.try_spend()
+
+    clock.now += 5.1
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+
+# --- _request_with_retry through a mocked Kickbase ---
+
+
+@pytest.fixture
+def kickbase(monkeypatch):
+    """
+    Mocked Kickbase: answers each request with the next response of `responses`.
+    Retries don't sleep (recorded in `delays`), the rate limiter is off.
+    """
+    state = {"responses": [], "requests": 0, "delays": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        return state["responses"].pop(0)
+
+    async def no_sleep(delay):
+        state["delays"].append(delay)
+
+    monkeypatch.setattr(kickbase_client, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(kickbase_client.asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(kickbase_client, "retry_budget", RetryBudget(ratio=0.0, min_retries=10, window=10.0))
+    monkeypatch.setattr(config, "rate_limit_enabled", False)
+    monkeypatch.setattr(config, "retry_jitter", "none")
+    return state
+
+
+async def test_503_is_retried_until_success(kickbase):
+    kickbase["responses"] = [httpx.Response(503), httpx.Response(503), httpx.Response(200, json={"ok": True})]
+
+    assert await KickbaseClient("token").get("/v4/leagues/1/me") == {"ok": True}
+    assert kickbase["requests"] == 3
+    assert kickbase["delays"] == [config.retry_base_delay, config.retry_base_delay * 2]
+
+
+async def test_429_waits_for_retry_after(kickbase):
+    kickbase["responses"] = [httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, json={})]
+
+    await KickbaseClient("token").get("/v4/leagues/1/me")
+    assert kickbase["delays"] == [7.0]
+
+
+async def test_429_with_http_date_retry_after(kickbase):
+    kickbase["responses"] = [httpx.Response(429, headers={"Retry-After": http_date(3)}), httpx.Response(200, json={})]
+
+    await KickbaseClient("token").get("/v4/leagues/1/me")
+    assert kickbase["delays"][0] == pytest.approx(3, abs=1.5)
+
+
+async def test_status_outside_retry_codes_is_not_retried(kickbase):
+    kickbase["responses"] = [httpx.Response(404)]
+
+    with pytest.raises(NotFoundError):
+        await KickbaseClient("token").get("/v4/leagues/1/me")
+    assert kickbase["requests"] == 1
+
+
+async def test_retry_codes_setting_decides_what_is_retried(kickbase, monkeypatch):
+    monkeypatch.setattr(config, "retry_codes", [502])
+    kickbase["responses"] = [httpx.Response(503)]
+
+    with pytest.raises(ServerError):
+        await KickbaseClient("token").get("/v4/leagues/1/me")
+    assert kickbase["requests"] == 1
+
+
+async def test_exhausted_budget_stops_retrying(kickbase, monkeypatch):
+    monkeypatch.setattr(kickbase_client, "retry_budget", RetryBudget(ratio=0.0, min_retries=1, window=10.0))
+    kickbase["responses"] = [httpx.Response(429), httpx.Response(429), httpx.Response(200, json={})]
+
+    with pytest.raises(RateLimitError):
+        await KickbaseClient("token").get("/v4/leagues/1/me")
+    assert kickbase["requests"] == 2
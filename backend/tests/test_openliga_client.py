@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from app.openliga import client as openliga_client
+from app.openliga.client import OpenLigaClient
+from app.openliga.config import settings
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Answers every endpoint with an ETag; 304 when the client sends it back."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        etag = f'"{request.url.path}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"path": request.url.path}, headers={"ETag": etag})
+
+    monkeypatch.setattr(openliga_client, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(openliga_client, "_revalidation", openliga_client.OrderedDict())
+    return requests
+
+
+async def test_not_modified_reuses_parsed_value(upstream):
+    client = OpenLigaClient()
+    parsed = []
+
+    def parse(body):
+        parsed.append(body)
+        return body["path"]
+
+    assert await client.get_parsed("/getbltable/bl1/2024", parse) == "/getbltable/bl1/2024"
+    assert await client.get_parsed("/getbltable/bl1/2024", parse) == "/getbltable/bl1/2024"
+
+    assert len(parsed) == 1
+    assert upstream[1].headers["If-None-Match"] == '"/getbltable/bl1/2024"'
+
+
+async def test_validators_are_bounded_lru(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "max_revalidation_entries", 2)
+    client = OpenLigaClient()
+
+    await client.get_parsed("/a", dict)
+    await client.get_parsed("/b", dict)
+    await client.get_parsed("/a", dict)  # 304 - /a is now the most recently used
+    await client.get_parsed("/c", dict)
+
+    assert list(openliga_client._revalidation) == ["/a", "/c"]
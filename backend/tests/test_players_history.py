@@ -0,0 +1,147 @@
+from typing import get_args
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.api.players import SortKey
+from app.players.history import TREND_PERIODS, MarketValueHistory, MarketValueStore, to_day
+from app.players.query import CATEGORY_KEYS, SORT_KEYS, PlayerIndex, PlayerQuery
+
+MONDAY = to_day("2026-10-05")
+
+
+@pytest.fixture
+def history() -> MarketValueHistory:
+    """
+    p1: daily for two weeks (Mon 5 - Sun 18 Oct), value 1_000_000 + day * 10_000
+    p2: only on 12 and 15 Oct (from a later start than p1 - keys must not mix)
+    p0: one snapshot, long before everyone else
+    Given unsorted on purpose.
+    """
+    rows = [("p1", MONDAY + i, 1_000_000 + i * 10_000) for i in range(14)]
+    rows += [("p2", MONDAY + 10, 2_000_000), ("p2", MONDAY + 7, 2_500_000)]
+    rows += [("p0", MONDAY - 100, 500_000)]
+    rows.reverse()
+    player_ids, days, values = zip(*rows)
+    return MarketValueHistory(np.array(player_ids, dtype=object), np.array(days), np.array(values))
+
+
+def test_to_day():
+    assert pd.Timestamp("2026-10-05").day_name() == "Monday"
+    assert to_day("1970-01-02") == 1
+    assert to_day(86400 * 3 + 5.0) == 3
+
+
+def test_series_daily_range_is_inclusive(history):
+    series = history.series("p1", MONDAY + 2, MONDAY + 4)
+
+    assert series.days.tolist() == [MONDAY + 2, MONDAY + 3, MONDAY + 4]
+    assert series.values.tolist() == [1_020_000, 1_030_000, 1_040_000]
+    assert series.low.tolist() == series.values.tolist() == series.high.tolist()
+    assert str(series.dates()[0]) == "2026-10-07"
+
+
+def test_series_open_ends_and_empty_ranges(history):
+    assert len(history.series("p1").days) == 14
+    assert history.series("p1", start=MONDAY + 12).days.tolist() == [MONDAY + 12, MONDAY + 13]
+    assert history.series("p1", end=MONDAY).days.tolist() == [MONDAY]
+    assert len(history.series("p1", MONDAY + 20, MONDAY + 30).days) == 0
+    assert len(history.series("p2", MONDAY + 8, MONDAY + 9).days) == 0
+
+
+def test_series_of_unknown_player_is_none(history):
+    assert history.series("nobody") is None
+    assert history.series("p") is None  # between known IDs
+    assert history.series("zzz") is None  # after the last ID
+
+
+def test_series_weekly_rollup(history):
+    series = history.series("p1", resolution="weekly")
+
+    assert series.days.tolist() == [MONDAY, MONDAY + 7]
+    assert series.values.tolist() == [1_060_000, 1_130_000]  # last value of the week
+    assert series.low.tolist() == [1_000_000, 1_070_000]
+    assert series.high.tolist() == [1_060_000, 1_130_000]
+
+    # p2 dropped within the week: low/high differ from the last value
+    p2 = history.series("p2", resolution="weekly")
+    assert (p2.values.tolist(), p2.low.tolist(), p2.high.tolist()) == ([2_000_000], [2_000_000], [2_500_000])
+
+
+def test_series_weekly_includes_the_week_of_start(history):
+    series = history.series("p1", start=MONDAY + 9, resolution="weekly")
+
+    assert series.days.tolist() == [MONDAY + 7]
+
+
+def test_series_rejects_unknown_resolution(history):
+    with pytest.raises(ValueError, match="resolution"):
+        history.series("p1", resolution="monthly")
+
+
+def test_values_at_uses_latest_snapshot_up_to_the_day(history):
+    values = history.values_at(["p2", "p1", "p0"], MONDAY + 9)
+
+    assert values.tolist() == [2_500_000, 1_090_000, 500_000]
+
+
+def test_values_at_is_nan_before_the_first_snapshot_and_for_unknown_players(history):
+    # p2's slot in the sorted keys follows p1's snapshots - it must not pick up p1's value
+    values = history.values_at(["p2", "unknown", "p1"], MONDAY + 3)
+
+    assert np.isnan(values[0])
+    assert np.isnan(values[1])
+    assert values[2] == 1_030_000
+    assert np.isnan(history.values_at(["p0"], MONDAY - 101)[0])
+
+
+def test_values_at_matches_a_brute_force_lookup(history):
+    players = ["p0", "p1", "p2", "x"]
+    for day in range(MONDAY - 102, MONDAY + 16):
+        for player, value in zip(players, history.values_at(players, day)):
+            series = history.series(player, end=day)
+            expected = series.values[-1] if series is not None and len(series.days) else np.nan
+            assert value == expected or (np.isnan(value) and np.isnan(expected)), (player, day)
+
+
+def test_changes_over_trend_periods(history):
+    changes = history.changes(["p1", "p2", "p0"])
+
+    assert set(changes) == set(TREND_PERIODS)
+    assert changes["market_value_change_1d_pct"][0] == pytest.approx((1_130_000 / 1_120_000 - 1) * 100)
+    assert changes["market_value_change_7d_pct"][0] == pytest.approx((1_130_000 / 1_060_000 - 1) * 100)
+    assert np.isnan(changes["market_value_change_30d_pct"][0])  # not enough history
+    assert changes["market_value_change_1d_pct"][1] == 0.0  # p2's last snapshot carries over
+    assert np.isnan(changes["market_value_change_7d_pct"][1])  # p2 has no snapshot 7 days back
+    assert changes["market_value_change_30d_pct"][2] == 0.0
+
+
+def test_store_round_trip_and_same_day_replace(tmp_path):
+    store = MarketValueStore(tmp_path / "market_values")
+    assert store.load() is None
+
+    store.append(pd.DataFrame({"id": ["p1", "p2"], "market_value": [100, 200]}), MONDAY)
+    store.append(pd.DataFrame({"id": ["p1"], "market_value": [110]}), MONDAY + 1)
+    store.append(pd.DataFrame({"id": ["p1"], "market_value": [120]}), MONDAY + 1)  # later run, same day
+
+    history = store.load()
+    assert len(history) == 3
+    assert history.values_at(["p1", "p2"], MONDAY + 1).tolist() == [120, 200]
+    assert store.load() is history  # nothing changed - not reloaded
+
+
+def test_sort_keys_include_every_trend_period():
+    assert set(TREND_PERIODS) <= set(SORT_KEYS)
+    assert get_args(SortKey) == SORT_KEYS
+
+
+def test_player_index_sorts_by_1d_change():
+    columns = {key: np.array([1.0, 2.0, 3.0]) for key in SORT_KEYS}
+    columns.update({key: np.array([1, 1, 1]) for key in CATEGORY_KEYS})
+    columns["id"] = np.array(["a", "b", "c"], dtype=object)
+    columns["market_value_change_1d_pct"] = np.array([0.5, np.nan, 4.0])
+
+    page = PlayerIndex(columns).query(PlayerQuery(sort="market_value_change_1d_pct", descending=True))
+
+    assert columns["id"][page.rows].tolist() == ["c", "a", "b"]
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.kickbase import AuthenticationError, KickbaseError
+from app.players import ingest
+from app.players.config import settings
+
+
+class FakeClient:
+    """Details/performance of player "bad" fail as configured, the others take a while."""
+
+    def __init__(self, bad_error: Exception):
+        self.bad_error = bad_error
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+        self.finished: list[str] = []
+
+    async def get_model(self, path: str, model: type):
+        self.started.append(path)
+        if "/bad" in path:
+            raise self.bad_error
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            self.cancelled.append(path)
+            raise
+        self.finished.append(path)
+        return path
+
+
+@pytest.fixture(autouse=True)
+def concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "details_concurrency", 2)
+
+
+async def test_auth_error_cancels_the_other_fetches():
+    client = FakeClient(AuthenticationError("token expired"))
+
+    with pytest.raises(AuthenticationError):
+        await ingest._fetch_details(client, ["p1", "bad", "p2", "p3"])
+
+    assert client.cancelled  # p1 was in flight
+    assert not client.finished
+    # Queued players never reached Kickbase
+    assert not [path for path in client.started if "/p3" in path]
+
+
+async def test_other_errors_skip_only_that_player():
+    client = FakeClient(KickbaseError("broken player"))
+
+    results = await ingest._fetch_details(client, ["p1", "bad", "p2"])
+
+    assert [details for details, _ in results] == [
+        f"/competitions/{settings.competition_id}/players/p1",
+        f"/competitions/{settings.competition_id}/players/p2",
+    ]
+    assert not client.cancelled
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+from app.kickbase.config import config
+from app.kickbase.exceptions import ClientRateLimitError
+from app.kickbase.ratelimit import AdaptiveLimit, KickbaseRateLimiter
+
+PATH = "/v4/leagues/1/ranking"  # "league" class
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """Rate limiter with one concurrency slot per class and a 0.1 s deadline."""
+    monkeypatch.setattr(config, "rate_limit_enabled", True)
+    monkeypatch.setattr(config, "rate_limit_max_wait", 0.1)
+    limiter = KickbaseRateLimiter()
+    for concurrency in limiter.concurrency.values():
+        concurrency.limit = 1.0
+    return limiter
+
+
+def token_waits(limiter, monkeypatch, waits: list[float]) -> None:
+    """Make the bucket answer with these waits (then always a token)."""
+    answers = iter(waits)
+
+    async def take_token(name):
+        return next(answers, 0.0)
+
+    monkeypatch.setattr(limiter, "_take_token", take_token)
+
+
+async def test_slot_wait_fails_fast_after_max_wait(limiter, monkeypatch):
+    token_waits(limiter, monkeypatch, [])
+
+    async with limiter.limit(PATH):
+        started = time.monotonic()
+        with pytest.raises(ClientRateLimitError):
+            async with limiter.limit(PATH):
+                pass
+        assert time.monotonic() - started < 0.5
+
+    assert limiter.concurrency["league"].in_flight == 0
+
+
+async def test_token_and_slot_share_one_deadline(limiter, monkeypatch):
+    async with limiter.limit(PATH):
+        # 0.08 s for the token leaves ~0.02 s for the (busy) slot
+        token_waits(limiter, monkeypatch, [0.08])
+        started = time.monotonic()
+        with pytest.raises(ClientRateLimitError):
+            async with limiter.limit(PATH):
+                pass
+        assert time.monotonic() - started < 0.15
+
+
+async def test_no_slot_is_held_while_waiting_for_a_token(limiter, monkeypatch):
+    token_waits(limiter, monkeypatch, [0.05])
+    concurrency = limiter.concurrency["league"]
+
+    async def request():
+        async with limiter.limit(PATH) as permit:
+            permit.status = 200
+
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0.02)
+    assert concurrency.in_flight == 0  # still waiting for its token
+
+    await task
+    assert concurrency.in_flight == 0
+
+
+async def test_token_wait_beyond_deadline_is_rejected_without_sleeping(limiter, monkeypatch):
+    token_waits(limiter, monkeypatch, [5.0])
+
+    started = time.monotonic()
+    with pytest.raises(ClientRateLimitError) as error:
+        async with limiter.limit(PATH):
+            pass
+
+    assert time.monotonic() - started < 0.05
+    assert error.value.retry_after == 5
+
+
+async def test_free_slot_is_taken_even_with_no_time_left():
+    concurrency = AdaptiveLimit("league", minimum=1, maximum=4, initial=1)
+
+    assert await concurrency.acquire(timeout=0.0)
+    assert not await concurrency.acquire(timeout=0.0)
+
+    await concurrency.release()
+    assert await concurrency.acquire(timeout=0.0)
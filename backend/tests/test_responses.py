@@ -0,0 +1,32 @@
+import json
+import math
+
+from pydantic import BaseModel
+
+from app.responses import FastJSONResponse, render_json
+
+
+class Averages(BaseModel):
+    avg_points: float
+    euros_per_point: float | None = None
+
+
+def test_nan_and_inf_render_as_null():
+    body = render_json({"avg": float("nan"), "max": float("inf"), "min": -math.inf, "rows": [float("nan"), 1.5]})
+
+    assert body == b'{"avg":null,"max":null,"min":null,"rows":[null,1.5]}'
+    assert json.loads(body)["rows"] == [None, 1.5]
+
+
+def test_models_render_like_model_dump_json():
+    model = Averages(avg_points=float("nan"), euros_per_point=2.5)
+
+    assert render_json(model) == model.model_dump_json().encode()
+
+
+def test_response_passes_bytes_through_and_renders_the_rest():
+    assert FastJSONResponse(b'{"cached":true}').body == b'{"cached":true}'
+
+    response = FastJSONResponse({"value": float("nan")})
+    assert response.body == b'{"value":null}'
+    assert response.media_type == "application/json"
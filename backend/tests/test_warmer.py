@@ -0,0 +1,161 @@
+import datetime
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.cache import RedisUnavailable
+from app.fanout import DeadlineExceeded
+from app.kickbase.exceptions import AuthenticationError, ServerError
+from app.warmer import scheduler
+from app.warmer.config import settings
+
+
+@pytest.fixture
+def warmed(monkeypatch):
+    """
+    Replaces upstream refreshes: records each warmed call, raises what
+    `failures` maps it to - (function name, league/season, token) -> exception.
+    """
+    calls = []
+    failures = {}
+
+    async def fake_warm(func, *args, ahead):
+        call = (func.__name__, *args)
+        calls.append(call)
+        if call in failures:
+            raise failures[call]
+        if func.__name__ == "get_ranking":
+            return SimpleNamespace(is_live=False)
+        return None
+
+    monkeypatch.setattr(scheduler, "_warm", fake_warm)
+    monkeypatch.setattr(scheduler, "_users", OrderedDict())
+    monkeypatch.setattr(scheduler, "_leagues", {})
+    monkeypatch.setattr(scheduler, "_table_seasons", OrderedDict())
+    monkeypatch.setattr(settings, "enabled", True)
+    return SimpleNamespace(calls=calls, failures=failures)
+
+
+def lineups(calls, league_id):
+    """Tokens whose lineup was warmed in a league."""
+    return sorted(call[2] for call in calls if call[:2] == ("get_lineup", league_id))
+
+
+async def test_failing_lineup_does_not_stop_the_other_users(warmed):
+    scheduler.record_league_activity("1", "alice")
+    scheduler.record_league_activity("1", "bob")
+    warmed.failures[("get_lineup", "1", "alice")] = DeadlineExceeded(10.0, 1)
+
+    await scheduler._warm_once()
+
+    assert lineups(warmed.calls, "1") == ["alice", "bob"]
+    assert scheduler._leagues["1"].next_due > 0
+    # Not an auth problem - the token is kept
+    assert len(scheduler._users) == 2
+
+
+async def test_failing_ranking_still_warms_lineups_and_reschedules(warmed):
+    scheduler.record_league_activity("1", "alice")
+    warmed.failures[("get_ranking", "1", "alice")] = ServerError(503)
+
+    await scheduler._warm_once()
+
+    assert lineups(warmed.calls, "1") == ["alice"]
+    assert scheduler._leagues["1"].next_due > 0
+
+
+async def test_expired_token_falls_back_to_another_member_for_the_ranking(warmed):
+    scheduler.record_league_activity("1", "alice")
+    scheduler.record_league_activity("1", "bob")
+    warmed.failures[("get_ranking", "1", "bob")] = AuthenticationError("expired")
+
+    await scheduler._warm_once()
+
+    rankings = [call for call in warmed.calls if call[0] == "get_ranking"]
+    assert rankings == [("get_ranking", "1", "bob"), ("get_ranking", "1", "alice")]
+    assert [user.token for user in scheduler._users.values()] == ["alice"]
+    assert lineups(warmed.calls, "1") == ["alice"]
+
+
+async def test_failing_league_does_not_stop_the_pass(warmed, monkeypatch):
+    scheduler.record_league_activity("1", "alice")
+    scheduler.record_league_activity("2", "bob")
+    original = scheduler._warm_league
+
+    async def broken_first_league(league_id, schedule, now):
+        if league_id == "1":
+            raise RedisConnectionError("redis gone")
+        await original(league_id, schedule, now)
+
+    monkeypatch.setattr(scheduler, "_warm_league", broken_first_league)
+
+    await scheduler._warm_once()
+
+    assert lineups(warmed.calls, "2") == ["bob"]
+    # Both rescheduled - the broken one isn't retried on every tick
+    assert scheduler._leagues["1"].next_due > 0
+    assert scheduler._leagues["2"].next_due > 0
+
+
+async def test_failing_table_does_not_stop_league_warming(warmed):
+    season = str(datetime.date.today().year)
+    scheduler.record_table_activity(season)
+    scheduler.record_league_activity("1", "alice")
+    warmed.failures[("get_bundesliga_table", season)] = ServerError(502)
+
+    await scheduler._warm_once()
+
+    assert ("get_bundesliga_table", season) in warmed.calls
+    assert lineups(warmed.calls, "1") == ["alice"]
+
+
+@pytest.mark.parametrize("season", ["abc", "24", "20245", "２０２６", "1901", "2999", " 2026", ""])
+def test_junk_seasons_are_not_recorded(warmed, season):
+    scheduler.record_table_activity(season)
+
+    assert not scheduler._table_seasons
+
+
+def test_recent_seasons_are_recorded_least_recent_first(warmed):
+    year = datetime.date.today().year
+
+    for season in (year - 1, year, year - 1, year - 2):
+        scheduler.record_table_activity(str(season))
+
+    # year - 2 is too old; the others are kept, most recently requested last
+    assert list(scheduler._table_seasons) == [str(year), str(year - 1)]
+
+
+def test_tracked_seasons_are_capped(warmed, monkeypatch):
+    monkeypatch.setattr(settings, "table_seasons", 3)
+    year = datetime.date.today().year
+
+    for season in (year - 2, year - 1, year):
+        scheduler.record_table_activity(str(season))
+    monkeypatch.setattr(settings, "table_seasons", 2)
+    scheduler.record_table_activity(str(year))
+
+    assert list(scheduler._table_seasons) == [str(year - 1), str(year)]
+
+
+async def test_budget_is_shared_by_all_workers(redis):
+    worker_1, worker_2 = scheduler._Budget(3), scheduler._Budget(3)
+
+    taken = [await budget.try_take() for budget in (worker_1, worker_2, worker_1, worker_2)]
+
+    assert taken == [True, True, True, False]
+
+
+async def test_budget_falls_back_to_a_per_worker_bucket_without_redis(monkeypatch):
+    @asynccontextmanager
+    async def redis_down(binary=False):
+        raise RedisUnavailable("Redis circuit is open")
+        yield
+
+    monkeypatch.setattr(scheduler, "redis_call", redis_down)
+    budget = scheduler._Budget(2)
+
+    assert [await budget.try_take() for _ in range(3)] == [True, True, False]